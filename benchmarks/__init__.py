@@ -0,0 +1,5 @@
+"""Performance benchmarks for the Dolibarr MCP client and tool hot paths.
+
+Run ``python -m benchmarks run`` from the repository root; see
+docs/04_guides/development.md.
+"""
@@ -0,0 +1,68 @@
+"""Command line entry point: ``python -m benchmarks run|compare``."""
+
+import argparse
+import json
+import sys
+from typing import Any, Dict, List, Optional
+
+from . import bench_client, bench_http, bench_models, bench_startup, bench_transport  # noqa: F401  (register cases)
+from .compare import compare, format_comparison
+from .context import bench_context
+from .harness import REGISTRY, environment, measure, run_sync
+from .importtime import format_import_times, import_times
+
+
+async def _run(args: argparse.Namespace) -> Dict[str, Any]:
+    cases = [case for name, case in sorted(REGISTRY.items()) if not args.k or args.k in name]
+    results: Dict[str, Any] = {}
+    async with bench_context(scale=args.scale) as ctx:
+        for case in cases:
+            results[case.name] = await measure(case, ctx, rounds=args.rounds, min_round_time=args.min_time)
+            print(f"{case.name:<45} {results[case.name]['median_s'] * 1e6:>12.2f} us", file=sys.stderr)
+    return {"environment": environment(), "scale": args.scale, "benchmarks": results}
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks", description="Dolibarr MCP benchmarks")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    run = sub.add_parser("run", help="Run the benchmarks and write JSON results")
+    run.add_argument("-o", "--output", help="Results file (default: stdout)")
+    run.add_argument("-k", help="Only run benchmarks whose name contains this text")
+    run.add_argument("--rounds", type=int, default=5, help="Timed rounds per benchmark")
+    run.add_argument("--min-time", type=float, default=0.05, help="Minimum seconds per round")
+    run.add_argument("--scale", type=float, default=1.0, help="Seed data volume multiplier")
+
+    cmp = sub.add_parser("compare", help="Compare results against a baseline")
+    cmp.add_argument("baseline")
+    cmp.add_argument("current")
+    cmp.add_argument("--threshold", type=float, default=0.10, help="Allowed slowdown (0.10 = 10%%)")
+
+    imp = sub.add_parser("importtime", help="Show what an import spends its time on")
+    imp.add_argument("modules", nargs="*", default=["dolibarr_mcp.cli", "dolibarr_mcp.server"])
+    imp.add_argument("--top", type=int, default=15, help="Modules to list per import")
+
+    args = parser.parse_args(argv)
+    if args.command == "importtime":
+        print("\n\n".join(format_import_times(m, import_times(m), args.top) for m in args.modules))
+        return 0
+    if args.command == "run":
+        output = json.dumps(run_sync(_run(args)), indent=2)
+        if args.output:
+            with open(args.output, "w", encoding="utf-8") as fh:
+                fh.write(output + "\n")
+        else:
+            print(output)
+        return 0
+
+    with open(args.baseline, encoding="utf-8") as fh:
+        baseline = json.load(fh)
+    with open(args.current, encoding="utf-8") as fh:
+        current = json.load(fh)
+    result = compare(baseline, current, args.threshold)
+    print(format_comparison(result))
+    return 0 if result.ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,40 @@
+"""Client-side hot paths that do not touch the network."""
+
+import json
+
+from dolibarr_mcp.dolibarr_client import DolibarrClient
+from dolibarr_mcp.filters import DocumentFilter, compile_document_filter
+
+from .harness import benchmark
+
+
+@benchmark("client")
+def bench_build_url(ctx):
+    ctx.client._build_url("invoices/123/lines")
+
+
+@benchmark("client")
+def bench_merge_payload(ctx):
+    DolibarrClient._merge_payload({"socid": 1, "date": "2025-01-01", "type": 0}, statut=0, fk_project=7)
+
+
+@benchmark("client")
+def bench_list_params(ctx):
+    DolibarrClient._list_params(100, page=3, sqlfilters="(t.fk_soc:=:1)", sortfield="t.datef,t.rowid", sortorder="DESC,DESC")
+
+
+@benchmark("client")
+def bench_compile_document_filter(ctx):
+    compile_document_filter("invoices", DocumentFilter(
+        date_from="2025-01-01", date_to="2025-03-31", customer_id=4, min_total_ttc=100, sort_by="amount",
+    ))
+
+
+@benchmark("client")
+def bench_json_decode_100_invoices(ctx):
+    json.loads(ctx.payloads["invoices"])
+
+
+@benchmark("client")
+def bench_json_decode_100_thirdparties(ctx):
+    json.loads(ctx.payloads["thirdparties"])
@@ -0,0 +1,55 @@
+"""End-to-end paths against the local stand-in server."""
+
+from dolibarr_mcp.models import InvoiceLine
+
+from .harness import benchmark
+
+_LINES = {n: [InvoiceLine(desc=f"Line {i}", subprice=10, qty=1, tva_tx=20) for i in range(n)] for n in (1, 10)}
+
+
+@benchmark("http")
+async def bench_get_invoice_by_id(ctx):
+    await ctx.client.get_invoice_by_id(1)
+
+
+@benchmark("http")
+async def bench_list_products_100(ctx):
+    await ctx.client.get_products(limit=100)
+
+
+@benchmark("http")
+async def bench_scan_thirdparties(ctx):
+    await ctx.client.scan("thirdparties", page_size=500, max_rows=2000)
+
+
+@benchmark("http")
+async def bench_count_invoices(ctx):
+    await ctx.client.count("invoices", params={"status": "unpaid"})
+
+
+@benchmark("http")
+async def bench_search_products_by_ref(ctx):
+    await ctx.tools["search_products_by_ref"](ref_prefix="PRD-0001", limit=20)
+
+
+@benchmark("http")
+async def bench_resolve_product_ref(ctx):
+    await ctx.tools["resolve_product_ref"](ref="PRD-000042")
+
+
+@benchmark("http")
+async def bench_search_customers(ctx):
+    await ctx.tools["search_customers"](query="Company 0001", limit=20)
+
+
+def _register_create_invoice(lines):
+    async def bench(ctx):
+        await ctx.tools["create_invoice"](
+            customer_id=1, date="2025-01-01", lines=_LINES[lines], project_id=None, payment_mode_id=None,
+        )
+
+    benchmark("http", name=f"create_invoice_{lines}_lines")(bench)
+
+
+for _n in _LINES:
+    _register_create_invoice(_n)
@@ -0,0 +1,37 @@
+"""Pydantic validation of each result model for 100 rows."""
+
+from dolibarr_mcp.models import (
+    ContactResult,
+    CustomerResult,
+    InvoiceResult,
+    OrderResult,
+    ProductResult,
+    ProjectSearchResult,
+    ProposalResult,
+    UserResult,
+)
+
+from .harness import benchmark
+
+_MODELS = {
+    "thirdparties": CustomerResult,
+    "products": ProductResult,
+    "invoices": InvoiceResult,
+    "orders": OrderResult,
+    "proposals": ProposalResult,
+    "projects": ProjectSearchResult,
+    "contacts": ContactResult,
+    "users": UserResult,
+}
+
+
+def _register(resource, model):
+    def bench(ctx):
+        for row in ctx.rows[resource]:
+            model(**row)
+
+    benchmark("models", name=f"{model.__name__}_x100")(bench)
+
+
+for _resource, _model in _MODELS.items():
+    _register(_resource, _model)
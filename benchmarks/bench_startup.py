@@ -0,0 +1,37 @@
+"""Cold-start cost of the entry points, each in a fresh interpreter.
+
+Wall time includes interpreter startup; ``python -m benchmarks importtime``
+breaks an import down by module.
+"""
+
+import os
+import subprocess
+import sys
+
+from .harness import benchmark
+
+_ENV = {**os.environ, "PYTHONPATH": os.pathsep.join(filter(None, [os.path.abspath("src"), os.environ.get("PYTHONPATH")]))}
+
+
+def _python(*args: str) -> None:
+    subprocess.run([sys.executable, *args], env=_ENV, check=True, capture_output=True)
+
+
+@benchmark("startup")
+def bench_interpreter(ctx):
+    _python("-c", "pass")
+
+
+@benchmark("startup")
+def bench_import_cli(ctx):
+    _python("-c", "import dolibarr_mcp.cli")
+
+
+@benchmark("startup")
+def bench_cli_version(ctx):
+    _python("-m", "dolibarr_mcp", "version")
+
+
+@benchmark("startup")
+def bench_import_server(ctx):
+    _python("-W", "ignore", "-c", "import dolibarr_mcp.server")
@@ -0,0 +1,44 @@
+"""TCP versus unix domain socket to the same stand-in server.
+
+Each case runs once per transport (``transport.tcp_*`` / ``transport.unix_*``)
+so ``compare`` and the run output show the per-request saving of
+``DOLIBARR_UNIX_SOCKET``. The unix cases are only registered where the
+platform has unix sockets.
+"""
+
+import asyncio
+import socket
+
+from .harness import benchmark
+
+_TRANSPORTS = {"tcp": lambda ctx: ctx.client}
+if hasattr(socket, "AF_UNIX"):
+    _TRANSPORTS["unix"] = lambda ctx: ctx.unix_client
+
+
+async def _get_invoice_by_id(client):
+    await client.get_invoice_by_id(1)
+
+
+async def _list_products_100(client):
+    await client.get_products(limit=100)
+
+
+async def _concurrent_invoices_20(client):
+    await asyncio.gather(*(client.get_invoice_by_id(i) for i in range(1, 21)))
+
+
+def _register(transport, select, name, call):
+    async def bench(ctx):
+        await call(select(ctx))
+
+    benchmark("transport", name=f"{transport}_{name}")(bench)
+
+
+for _transport, _select in _TRANSPORTS.items():
+    for _name, _call in (
+        ("get_invoice_by_id", _get_invoice_by_id),
+        ("list_products_100", _list_products_100),
+        ("concurrent_invoices_20", _concurrent_invoices_20),
+    ):
+        _register(_transport, _select, _name, _call)
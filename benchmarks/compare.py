@@ -0,0 +1,63 @@
+"""Compare two benchmark result files and flag regressions."""
+
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Tuple
+
+
+@dataclass
+class Comparison:
+    threshold: float
+    rows: List[Tuple[str, float, float, float]] = field(default_factory=list)
+    regressions: List[str] = field(default_factory=list)
+    improvements: List[str] = field(default_factory=list)
+    missing: List[str] = field(default_factory=list)
+    new: List[str] = field(default_factory=list)
+
+    @property
+    def ok(self) -> bool:
+        return not self.regressions
+
+
+def compare(baseline: Dict[str, Any], current: Dict[str, Any], threshold: float = 0.10) -> Comparison:
+    """Compare median timings; a case regresses when it is ``threshold`` slower."""
+    base_cases = baseline.get("benchmarks", {})
+    cur_cases = current.get("benchmarks", {})
+    result = Comparison(threshold=threshold)
+    for name in sorted(base_cases):
+        if name not in cur_cases:
+            result.missing.append(name)
+            continue
+        before = base_cases[name]["median_s"]
+        after = cur_cases[name]["median_s"]
+        change = (after - before) / before if before else 0.0
+        result.rows.append((name, before, after, change))
+        if change > threshold:
+            result.regressions.append(name)
+        elif change < -threshold:
+            result.improvements.append(name)
+    result.new = sorted(set(cur_cases) - set(base_cases))
+    return result
+
+
+def _fmt(seconds: float) -> str:
+    if seconds >= 1:
+        return f"{seconds:.3f} s"
+    if seconds >= 1e-3:
+        return f"{seconds * 1e3:.3f} ms"
+    return f"{seconds * 1e6:.2f} us"
+
+
+def format_comparison(result: Comparison) -> str:
+    lines = [f"{'benchmark':<45} {'baseline':>12} {'current':>12} {'change':>8}"]
+    for name, before, after, change in result.rows:
+        flag = " REGRESSION" if name in result.regressions else ""
+        lines.append(f"{name:<45} {_fmt(before):>12} {_fmt(after):>12} {change:>+7.1%}{flag}")
+    for name in result.missing:
+        lines.append(f"{name:<45} missing from current results")
+    for name in result.new:
+        lines.append(f"{name:<45} new (no baseline)")
+    lines.append(
+        f"{len(result.regressions)} regression(s), {len(result.improvements)} improvement(s) "
+        f"at a {result.threshold:.0%} threshold"
+    )
+    return "\n".join(lines)
@@ -0,0 +1,75 @@
+"""Shared state handed to every benchmark: seeded stand-in server, client and tools."""
+
+import json
+import os
+import socket
+import tempfile
+from contextlib import AsyncExitStack, asynccontextmanager
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional
+
+from dolibarr_mcp import state
+from dolibarr_mcp.config import Config
+from dolibarr_mcp.dolibarr_client import DolibarrClient
+from dolibarr_mcp.fake_server import FakeDolibarr, SeedVolumes, serve_fake_dolibarr
+from dolibarr_mcp.tools.customers import register_customer_tools
+from dolibarr_mcp.tools.invoices import register_invoice_tools
+from dolibarr_mcp.tools.products import register_product_tools
+
+
+class _ToolCollector:
+    """Stands in for FastMCP and keeps the undecorated tool functions."""
+
+    def __init__(self) -> None:
+        self.tools: Dict[str, Callable[..., Any]] = {}
+
+    def tool(self):
+        def decorator(func):
+            self.tools[func.__name__] = func
+            return func
+        return decorator
+
+
+@dataclass
+class BenchContext:
+    data: FakeDolibarr
+    client: DolibarrClient
+    tools: Dict[str, Callable[..., Any]]
+    unix_client: Optional[DolibarrClient] = None  # same dataset over a unix socket
+    rows: Dict[str, List[Dict[str, Any]]] = field(default_factory=dict)
+    payloads: Dict[str, str] = field(default_factory=dict)
+
+
+def scaled_volumes(scale: float) -> SeedVolumes:
+    base = SeedVolumes(thirdparties=2000, products=2000, invoices=2000, lines_per_invoice=5,
+                       orders=500, proposals=500, projects=200, contacts=1000, users=20)
+    return SeedVolumes(**{name: max(1, int(value * scale)) if name != "lines_per_invoice" else value
+                          for name, value in vars(base).items()})
+
+
+@asynccontextmanager
+async def bench_context(scale: float = 1.0, seed: int = 42) -> AsyncIterator[BenchContext]:
+    data = FakeDolibarr(scaled_volumes(scale), seed=seed)
+    async with AsyncExitStack() as stack:
+        url = await stack.enter_async_context(serve_fake_dolibarr(data))
+        client = await stack.enter_async_context(DolibarrClient(Config(dolibarr_url=url, api_key="bench")))
+        unix_client = None
+        if hasattr(socket, "AF_UNIX"):
+            path = os.path.join(stack.enter_context(tempfile.TemporaryDirectory()), "dolibarr.sock")
+            unix_url = await stack.enter_async_context(serve_fake_dolibarr(data, unix_socket=path))
+            unix_client = await stack.enter_async_context(
+                DolibarrClient(Config(dolibarr_url=unix_url, api_key="bench"), unix_socket=path)
+            )
+        collector = _ToolCollector()
+        register_product_tools(collector)
+        register_customer_tools(collector)
+        register_invoice_tools(collector)
+        state.set_client(client)
+        try:
+            ctx = BenchContext(data=data, client=client, tools=collector.tools, unix_client=unix_client)
+            for resource in data.tables:
+                ctx.rows[resource] = [data.render(resource, row) for row in list(data.tables[resource].values())[:100]]
+                ctx.payloads[resource] = json.dumps(ctx.rows[resource])
+            yield ctx
+        finally:
+            state.set_client(None)
@@ -0,0 +1,97 @@
+"""Minimal benchmark harness: registration, calibrated timing and JSON results."""
+
+import asyncio
+import inspect
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Union
+
+BenchFunc = Callable[[Any], Union[Any, Awaitable[Any]]]
+
+
+@dataclass
+class BenchmarkCase:
+    name: str
+    group: str
+    func: BenchFunc
+
+    @property
+    def is_async(self) -> bool:
+        return inspect.iscoroutinefunction(self.func)
+
+
+REGISTRY: Dict[str, BenchmarkCase] = {}
+
+
+def benchmark(group: str, name: Optional[str] = None) -> Callable[[BenchFunc], BenchFunc]:
+    """Register a benchmark. The function receives the shared bench context."""
+
+    def decorator(func: BenchFunc) -> BenchFunc:
+        case_name = f"{group}.{name or func.__name__.removeprefix('bench_')}"
+        if case_name in REGISTRY:
+            raise ValueError(f"Duplicate benchmark {case_name}")
+        REGISTRY[case_name] = BenchmarkCase(case_name, group, func)
+        return func
+
+    return decorator
+
+
+async def _call(case: BenchmarkCase, ctx: Any, iterations: int) -> float:
+    started = time.perf_counter()
+    if case.is_async:
+        for _ in range(iterations):
+            await case.func(ctx)
+    else:
+        for _ in range(iterations):
+            case.func(ctx)
+    return time.perf_counter() - started
+
+
+async def measure(case: BenchmarkCase, ctx: Any, rounds: int = 5, min_round_time: float = 0.05) -> Dict[str, Any]:
+    """Time a case: calibrate iterations per round, then take ``rounds`` samples."""
+    await _call(case, ctx, 1)  # warm-up
+    iterations = 1
+    while True:
+        elapsed = await _call(case, ctx, iterations)
+        if elapsed >= min_round_time or iterations >= 1_000_000:
+            break
+        iterations *= 2 if elapsed == 0 else max(2, min(10, int(min_round_time / elapsed) + 1))
+    samples: List[float] = []
+    for _ in range(rounds):
+        samples.append(await _call(case, ctx, iterations) / iterations)
+    return {
+        "group": case.group,
+        "median_s": statistics.median(samples),
+        "mean_s": statistics.fmean(samples),
+        "min_s": min(samples),
+        "stdev_s": statistics.stdev(samples) if len(samples) > 1 else 0.0,
+        "rounds": rounds,
+        "iterations": iterations,
+    }
+
+
+def environment() -> Dict[str, Any]:
+    """Describe where the results were taken."""
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, timeout=5,
+        ).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        commit = None
+    return {
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": sys.version.split()[0],
+        "implementation": platform.python_implementation(),
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "commit": commit,
+    }
+
+
+def run_sync(coro: Awaitable[Any]) -> Any:
+    return asyncio.run(coro)
@@ -0,0 +1,30 @@
+"""Per-module import cost from ``python -X importtime``."""
+
+import os
+import subprocess
+import sys
+from typing import List, Tuple
+
+
+def import_times(module: str) -> List[Tuple[str, int, int]]:
+    """Import ``module`` in a fresh interpreter; return (name, self_us, cumulative_us) rows."""
+    env = {**os.environ, "PYTHONPATH": os.pathsep.join(filter(None, [os.path.abspath("src"), os.environ.get("PYTHONPATH")]))}
+    result = subprocess.run(
+        [sys.executable, "-W", "ignore", "-X", "importtime", "-c", f"import {module}"],
+        env=env, capture_output=True, text=True, check=True,
+    )
+    rows = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        rows.append((name.strip(), int(self_us), int(cumulative_us)))
+    return rows
+
+
+def format_import_times(module: str, rows: List[Tuple[str, int, int]], top: int = 15) -> str:
+    total = next((cumulative for name, _, cumulative in reversed(rows) if name == module), 0)
+    lines = [f"import {module}: {total / 1000:.1f} ms, {len(rows)} modules", f"{'cumulative ms':>14} {'self ms':>9}  module"]
+    for name, self_us, cumulative_us in sorted(rows, key=lambda row: row[2], reverse=True)[:top]:
+        lines.append(f"{cumulative_us / 1000:>14.1f} {self_us / 1000:>9.1f}  {name}")
+    return "\n".join(lines)
@@ -7,9 +7,6 @@ Professional Model Context Protocol server for complete Dolibarr ERP/CRM managem
 __version__ = "1.1.0"
 __author__ = "Dolibarr MCP Team"
 
-from .dolibarr_client import DolibarrClient
-from .config import Config
-
 # Note: dolibarr_mcp_server uses a functional pattern, not a class
 # The server is run via the main() function in dolibarr_mcp_server.py
 
@@ -17,3 +14,16 @@ __all__ = [
     "DolibarrClient",
     "Config",
 ]
+
+
+def __getattr__(name):
+    # Imported on first use so ``import dolibarr_mcp.cli`` stays cheap.
+    if name == "DolibarrClient":
+        from .dolibarr_client import DolibarrClient
+
+        return DolibarrClient
+    if name == "Config":
+        from .config import Config
+
+        return Config
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,222 @@
+"""Load balancing across several Dolibarr frontends.
+
+Deployments that run several PHP frontends on one database list them in
+``DOLIBARR_URLS`` (read-write, next to ``DOLIBARR_URL``) and optionally
+``DOLIBARR_REPLICA_URLS`` (read-only). :class:`BalancingTransport` sends each
+request to one of them, rewriting the client's logical API root to the
+chosen node:
+
+* ``least_outstanding`` picks the node with the fewest requests in flight,
+  ``ewma`` the lowest latency EWMA weighted by its requests in flight
+* passive health checks: connection errors, timeouts and 502/503/504
+  answers count as failures; ``eject_failures`` consecutive ones take a node
+  out of rotation for ``eject_seconds``, after which a single failure ejects
+  it again until a request succeeds
+* idempotent reads that fail to connect are retried once on another node
+* with replicas, reads go to the replicas and writes to the read-write
+  nodes; reads fall back to read-write nodes when every replica is ejected
+
+When every candidate is ejected the least recently ejected one is used
+anyway, so an outage of all nodes surfaces as the backend's own errors.
+"""
+
+import asyncio
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, List, Literal, Optional, Sequence
+
+import aiohttp
+from aiohttp import ClientSession
+
+from .transport import Transport, TransportResponse
+
+Strategy = Literal["least_outstanding", "ewma"]
+STRATEGIES = ("least_outstanding", "ewma")
+
+READ_METHODS = {"GET", "HEAD", "OPTIONS"}
+UNHEALTHY_STATUS = {502, 503, 504}
+CONNECT_ERRORS = (aiohttp.ClientConnectionError, asyncio.TimeoutError, OSError)
+
+
+def api_root(base_url: str) -> str:
+    """``https://erp/api/index.php`` -> ``https://erp/api`` (also the root of ``/api/status``)."""
+    base = base_url.rstrip("/")
+    return base[: -len("/index.php")] if base.endswith("/index.php") else base
+
+
+@dataclass
+class Node:
+    """One frontend and its health and load counters."""
+
+    base_url: str
+    writable: bool = True
+    outstanding: int = 0
+    ewma: float = 0.0
+    requests: int = 0
+    errors: int = 0
+    consecutive_failures: int = 0
+    ejections: int = 0
+    ejected_until: float = 0.0
+
+    @property
+    def root(self) -> str:
+        return api_root(self.base_url)
+
+    def healthy(self, now: float) -> bool:
+        return now >= self.ejected_until
+
+    def snapshot(self, now: float) -> Dict[str, Any]:
+        return {
+            "url": self.base_url,
+            "role": "read-write" if self.writable else "replica",
+            "healthy": self.healthy(now),
+            "outstanding": self.outstanding,
+            "ewma_ms": round(self.ewma * 1000, 3),
+            "requests": self.requests,
+            "errors": self.errors,
+            "ejections": self.ejections,
+        }
+
+
+@dataclass
+class BalancerSettings:
+    strategy: Strategy = "least_outstanding"
+    eject_failures: int = 3
+    eject_seconds: float = 30.0
+    ewma_alpha: float = 0.3
+
+    def __post_init__(self) -> None:
+        if self.strategy not in STRATEGIES:
+            raise ValueError(f"Unknown balancer strategy '{self.strategy}'")
+
+
+class BalancingTransport(Transport):
+    """Spread requests over several frontends of the same Dolibarr."""
+
+    def __init__(
+        self,
+        base_url: str,
+        nodes: Sequence[Node],
+        settings: Optional[BalancerSettings] = None,
+        inner: Optional[Transport] = None,
+    ) -> None:
+        if not nodes:
+            raise ValueError("BalancingTransport needs at least one node")
+        self.root = api_root(base_url)
+        self.nodes: List[Node] = list(nodes)
+        self.settings = settings or BalancerSettings()
+        self.inner = inner or Transport()
+        self.retries = 0
+
+    @classmethod
+    def from_config(cls, config: Any, inner: Optional[Transport] = None) -> "BalancingTransport":
+        from .config import Config
+
+        def urls(value: str) -> List[str]:
+            return [Config.validate_dolibarr_url(url.strip()) for url in value.split(",") if url.strip()]
+
+        writable = [config.dolibarr_url]
+        writable += [url for url in urls(config.dolibarr_urls) if url not in writable]
+        nodes = [Node(url) for url in writable]
+        nodes += [Node(url, writable=False) for url in urls(config.dolibarr_replica_urls)]
+        settings = BalancerSettings(
+            strategy=config.balancer_strategy,
+            eject_failures=config.balancer_eject_failures,
+            eject_seconds=config.balancer_eject_seconds,
+        )
+        return cls(config.dolibarr_url, nodes, settings=settings, inner=inner)
+
+    def _candidates(self, method: str) -> List[Node]:
+        if method.upper() in READ_METHODS:
+            replicas = [n for n in self.nodes if not n.writable]
+            now = time.monotonic()
+            if replicas and any(n.healthy(now) for n in replicas):
+                return replicas
+            return self.nodes
+        return [n for n in self.nodes if n.writable]
+
+    def _score(self, node: Node) -> tuple:
+        if self.settings.strategy == "ewma":
+            return (node.ewma * (node.outstanding + 1), node.outstanding, node.requests)
+        return (node.outstanding, node.requests)
+
+    def pick(self, method: str, exclude: Sequence[Node] = ()) -> Node:
+        """Choose the node for the next request."""
+        candidates = [n for n in self._candidates(method) if all(n is not e for e in exclude)]
+        if not candidates:
+            candidates = self._candidates(method)
+        now = time.monotonic()
+        healthy = [n for n in candidates if n.healthy(now)]
+        if not healthy:
+            return min(candidates, key=lambda n: n.ejected_until)
+        return min(healthy, key=self._score)
+
+    def _record(self, node: Node, elapsed: float, failed: bool) -> None:
+        alpha = self.settings.ewma_alpha
+        node.ewma = elapsed if node.requests == 0 else alpha * elapsed + (1 - alpha) * node.ewma
+        node.requests += 1
+        if not failed:
+            node.consecutive_failures = 0
+            return
+        node.errors += 1
+        node.consecutive_failures += 1
+        if node.consecutive_failures >= self.settings.eject_failures:
+            node.ejections += 1
+            node.ejected_until = time.monotonic() + self.settings.eject_seconds
+
+    async def _send_to(
+        self,
+        node: Node,
+        session: ClientSession,
+        method: str,
+        endpoint: str,
+        url: str,
+        kwargs: Dict[str, Any],
+    ) -> TransportResponse:
+        if url.startswith(self.root):
+            url = node.root + url[len(self.root):]
+        node.outstanding += 1
+        started = time.perf_counter()
+        try:
+            response = await self.inner.send(session, method, endpoint, url, kwargs)
+        except CONNECT_ERRORS:
+            self._record(node, time.perf_counter() - started, failed=True)
+            raise
+        finally:
+            # Cancellation (client gone, tool call aborted) says nothing about the node.
+            node.outstanding -= 1
+        self._record(node, time.perf_counter() - started, failed=response.status in UNHEALTHY_STATUS)
+        return response
+
+    async def send(
+        self,
+        session: ClientSession,
+        method: str,
+        endpoint: str,
+        url: str,
+        kwargs: Dict[str, Any],
+    ) -> TransportResponse:
+        node = self.pick(method)
+        try:
+            return await self._send_to(node, session, method, endpoint, url, kwargs)
+        except CONNECT_ERRORS:
+            if method.upper() not in READ_METHODS:
+                raise
+            retry = self.pick(method, exclude=[node])
+            if retry is node:
+                raise
+            self.retries += 1
+            if self.metrics is not None:
+                self.metrics.record_retry(method, endpoint)
+            return await self._send_to(retry, session, method, endpoint, url, kwargs)
+
+    def snapshot(self) -> Dict[str, Any]:
+        now = time.monotonic()
+        return {
+            "strategy": self.settings.strategy,
+            "retries": self.retries,
+            "nodes": [node.snapshot(now) for node in self.nodes],
+        }
+
+    async def close(self) -> None:
+        await self.inner.close()
@@ -0,0 +1,232 @@
+"""Round-trip budgets for tool calls.
+
+Each tool declares how many Dolibarr requests one call may make, e.g.
+``resolve_product_ref`` = 1 and ``create_invoice`` = 1 + one per line. The
+client counts requests of the active :func:`track_requests` block; the tool
+middleware (or the ``request_budget`` pytest fixture) compares the count with
+the budget and, depending on the mode, logs a warning or raises
+:class:`RequestBudgetExceeded`. A per-item loop that slips into a tool shows
+up as a budget violation instead of a slow production call.
+
+Tools that scan (``open_cursor``, the ``count_*`` fallbacks) are budgeted
+in pages: one request per ``page_size`` rows up to their row cap, plus the
+final short page. The caps come from the configuration, see
+:func:`configure_scan_budgets`. Every registered tool declares a budget.
+"""
+
+import logging
+import math
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterator, List, Literal, Mapping, Optional
+
+from .metrics import normalize_endpoint
+
+logger = logging.getLogger(__name__)
+
+BudgetMode = Literal["off", "warn", "fail"]
+
+
+class RequestBudgetExceeded(RuntimeError):
+    """A tool call made more Dolibarr requests than its declared budget."""
+
+    def __init__(self, tool: str, budget: int, requests: List[str]):
+        self.tool = tool
+        self.budget = budget
+        self.requests = requests
+        super().__init__(
+            f"Tool '{tool}' made {len(requests)} Dolibarr requests, budget is {budget}: "
+            + ", ".join(requests)
+        )
+
+
+@dataclass(frozen=True)
+class ToolBudget:
+    """Allowed requests: ``base`` plus ``per_item`` for each element of ``items``.
+
+    ``items`` names a tool argument, or a count the call reports with
+    :func:`note_items` when the items are only known while it runs.
+
+    Tools that scan also get ``scans`` times the pages of a scan of up to
+    ``max_rows`` rows (or the smaller ``rows_arg`` argument) at ``page_size``.
+    """
+
+    base: int
+    per_item: int = 0
+    items: Optional[str] = None
+    scans: int = 0
+    max_rows: int = 0
+    rows_arg: Optional[str] = None
+    page_size: int = 1
+
+    def limit(self, arguments: Mapping[str, Any], found: Optional[Mapping[str, int]] = None) -> int:
+        limit = self.base
+        if self.items:
+            if found and self.items in found:
+                count = found[self.items]
+            else:
+                count = len(arguments.get(self.items) or ())
+            limit += self.per_item * count
+        if self.scans:
+            rows = self.max_rows
+            if self.rows_arg and arguments.get(self.rows_arg):
+                rows = min(rows, int(arguments[self.rows_arg]))
+            limit += self.scans * (math.ceil(rows / self.page_size) + 1)
+        return limit
+
+
+_ONE = ToolBudget(1)
+
+# Page size of DolibarrClient.count's id-only scan.
+COUNT_PAGE_SIZE = 1000
+
+
+def scan_budgets(count_max_rows: int = 100_000, cursor_page_size: int = 500) -> Dict[str, ToolBudget]:
+    """Budgets of the scanning tools for the configured row caps and page sizes."""
+    # pagination_data request, then the id-only scan on servers without it
+    count = ToolBudget(1, scans=1, max_rows=count_max_rows, page_size=COUNT_PAGE_SIZE)
+    return {
+        "count_invoices": count,
+        "count_orders": count,
+        "count_proposals": count,
+        # One count per status
+        "get_invoice_summary": ToolBudget(3, scans=3, max_rows=count_max_rows, page_size=COUNT_PAGE_SIZE),
+        "open_cursor": ToolBudget(0, scans=1, max_rows=100_000, rows_arg="max_rows", page_size=cursor_page_size),
+    }
+
+
+TOOL_BUDGETS: Dict[str, ToolBudget] = {
+    # Lookups and lists: one request
+    **{name: _ONE for name in (
+        "resolve_product_ref", "search_products_by_ref", "search_products_by_label",
+        "search_projects",
+        "get_products", "get_customers", "get_orders", "get_proposals",
+        "get_projects", "get_users", "get_contacts", "get_top_documents", "get_changes",
+        "get_product_by_id", "get_customer_by_id", "get_invoice_by_id", "get_order_by_id",
+        "get_proposal_by_id", "get_project_by_id", "get_user_by_id",
+    )},
+    # Single writes: one request
+    **{name: _ONE for name in (
+        "create_customer", "update_customer", "create_product", "create_project",
+        "create_contact", "create_user", "update_user", "delete_user",
+        "update_invoice", "validate_invoice", "add_payment_to_invoice", "add_invoice_line",
+        "add_order_line", "update_proposal", "delete_proposal", "validate_proposal",
+        "convert_proposal_to_order", "add_proposal_line", "update_proposal_line",
+        "delete_proposal_line",
+    )},
+    # One request per Multicompany entity when fanned out
+    "search_customers": ToolBudget(1, per_item=1, items="entities"),
+    "get_invoices": ToolBudget(1, per_item=1, items="entities"),
+    # Header plus one request per line
+    "create_invoice": ToolBudget(1, per_item=1, items="lines"),
+    "create_order": ToolBudget(1, per_item=1, items="lines"),
+    "create_proposal": ToolBudget(1, per_item=1, items="lines"),
+    # Server-side conversion, or the order plus the invoice, and one request
+    # per order line where lines cannot be sent with the invoice
+    "create_invoice_from_order": ToolBudget(2, per_item=1, items="lines"),
+    **scan_budgets(),
+    # status plus two fallback endpoints
+    "get_status": ToolBudget(3),
+    # Served from memory
+    "next_page": ToolBudget(0),
+    "close_cursor": ToolBudget(0),
+    "get_server_metrics": ToolBudget(0),
+    "start_profiling": ToolBudget(0),
+    "stop_profiling": ToolBudget(0),
+    "dump_memory_diff": ToolBudget(0),
+}
+
+
+@dataclass
+class RequestCounter:
+    """Requests made inside one :func:`track_requests` block."""
+
+    tool: Optional[str] = None
+    requests: List[str] = field(default_factory=list)
+    request_time: float = 0.0
+    found: Dict[str, int] = field(default_factory=dict)
+
+    @property
+    def count(self) -> int:
+        return len(self.requests)
+
+
+_counter: ContextVar[Optional[RequestCounter]] = ContextVar("dolibarr_mcp_request_counter", default=None)
+
+_mode: BudgetMode = "warn"
+
+
+def configure_scan_budgets(config: Any) -> None:
+    """Size the scanning tools' budgets for ``DOLIBARR_COUNT_MAX_ROWS`` and the cursor page size."""
+    TOOL_BUDGETS.update(scan_budgets(config.count_max_rows, config.cursor_scan_page_size))
+
+
+def get_budget_mode() -> BudgetMode:
+    return _mode
+
+
+def set_budget_mode(mode: BudgetMode) -> None:
+    """Set how budget violations are reported (``off``, ``warn`` or ``fail``)."""
+    global _mode
+    if mode not in ("off", "warn", "fail"):
+        raise ValueError(f"Unknown request budget mode '{mode}'")
+    _mode = mode
+
+
+@contextmanager
+def track_requests(tool: Optional[str] = None) -> Iterator[RequestCounter]:
+    """Count Dolibarr requests made in this block, including spawned tasks.
+
+    Re-entering for the tool that is already tracked yields the active
+    counter, so several middlewares can share one count.
+    """
+    active = _counter.get()
+    if active is not None and tool is not None and active.tool == tool:
+        yield active
+        return
+    counter = RequestCounter(tool=tool)
+    token = _counter.set(counter)
+    try:
+        yield counter
+    finally:
+        _counter.reset(token)
+
+
+def note_request(method: str, endpoint: str, duration: float = 0.0) -> None:
+    """Called by the client for every request it made."""
+    counter = _counter.get()
+    if counter is not None:
+        counter.requests.append(f"{method.upper()} {normalize_endpoint(endpoint)}")
+        counter.request_time += duration
+
+
+def note_items(name: str, count: int) -> None:
+    """Report ``count`` items a call found while running (e.g. order lines it copies)."""
+    counter = _counter.get()
+    if counter is not None:
+        counter.found[name] = counter.found.get(name, 0) + count
+
+
+def check_budget(
+    tool: str,
+    arguments: Mapping[str, Any],
+    counter: RequestCounter,
+    mode: Optional[BudgetMode] = None,
+) -> Optional[int]:
+    """Compare a finished call with its budget.
+
+    Returns the budget (None if the tool declares none). Violations are
+    logged in ``warn`` mode and raised in ``fail`` mode.
+    """
+    mode = mode or _mode
+    budget = TOOL_BUDGETS.get(tool)
+    if mode == "off" or budget is None:
+        return None
+    limit = budget.limit(arguments, counter.found)
+    if counter.count > limit:
+        error = RequestBudgetExceeded(tool, limit, counter.requests)
+        if mode == "fail":
+            raise error
+        logger.warning("%s", error)
+    return limit
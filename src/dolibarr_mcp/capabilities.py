@@ -0,0 +1,169 @@
+"""Optional Dolibarr API features, probed once and cached.
+
+Dolibarr versions differ in what their REST API accepts. The client probes
+the backend once, caches the answer for ``DOLIBARR_CAPABILITIES_TTL_SECONDS``
+and picks the cheapest code path per operation:
+
+``pagination_data``
+    list totals in the response metadata (``count`` needs one request)
+``properties``
+    projection of list rows onto the requested fields
+``lines_in_post``
+    document lines sent with the header in one ``POST``
+``createfromorder``
+    server-side conversion of an order into an invoice
+
+The probe reads the version from ``status`` (walking the same fallback chain
+as ``get_status``) and asks ``thirdparties`` for one id-only row with
+``pagination_data``, which answers the first two directly. Features that
+cannot be probed without writing data are derived from the version; an
+unknown version turns everything off, so the fallbacks are always safe.
+
+The server loads the capabilities during its background warm-up. Probe
+requests run in their own request counter, so they do not count
+against the budget of the tool call that happened to trigger them.
+"""
+
+import asyncio
+import re
+import time
+from dataclasses import asdict, dataclass
+from typing import Any, Dict, Optional, Tuple
+
+from .budget import track_requests
+from .warmup import register_warmup_hook
+
+STATUS_ENDPOINTS = ("status", "setup/modules", "users?limit=1")
+
+# First Dolibarr version with each feature, used when the probe cannot tell.
+MIN_VERSIONS: Dict[str, Tuple[int, ...]] = {
+    "pagination_data": (20, 0),
+    "properties": (20, 0),
+    "lines_in_post": (7, 0),
+    "createfromorder": (7, 0),
+}
+
+
+def parse_version(value: Any) -> Optional[Tuple[int, ...]]:
+    """``"20.0.2"`` -> ``(20, 0, 2)``; None for placeholders such as ``"Connected"``."""
+    match = re.match(r"\s*(\d+)(?:\.(\d+))?(?:\.(\d+))?", str(value or ""))
+    if not match:
+        return None
+    return tuple(int(part) for part in match.groups() if part is not None)
+
+
+@dataclass
+class Capabilities:
+    """Features of one Dolibarr backend."""
+
+    dolibarr_version: Optional[str] = None
+    status_endpoint: Optional[str] = None
+    pagination_data: bool = False
+    properties: bool = False
+    lines_in_post: bool = False
+    createfromorder: bool = False
+    probed_at: float = 0.0
+
+    @property
+    def version(self) -> Optional[Tuple[int, ...]]:
+        return parse_version(self.dolibarr_version)
+
+    def snapshot(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+def _by_version(version: Optional[Tuple[int, ...]], feature: str) -> bool:
+    return version is not None and version >= MIN_VERSIONS[feature]
+
+
+async def probe_capabilities(client: Any) -> Capabilities:
+    """Ask the backend which optional features it supports."""
+    from .dolibarr_client import DolibarrAPIError
+
+    with track_requests():
+        status = await client.get_status()
+        success = status.get("success") if isinstance(status, dict) else None
+        source = success if isinstance(success, dict) else status
+        capabilities = Capabilities(
+            dolibarr_version=source.get("dolibarr_version") if isinstance(source, dict) else None,
+            status_endpoint=client.capability_cache.status_endpoint,
+            probed_at=time.time(),
+        )
+        version = capabilities.version
+
+        pagination_data: Optional[bool] = None
+        properties: Optional[bool] = None
+        try:
+            result = await client.request(
+                "GET", "thirdparties", params={"limit": 1, "page": 0, "pagination_data": "true", "properties": "id"}
+            )
+        except DolibarrAPIError:
+            result = None
+        if isinstance(result, dict) and isinstance(result.get("pagination"), dict):
+            pagination_data = True
+            result = result.get("data")
+        elif isinstance(result, list):
+            pagination_data = False
+        if isinstance(result, list) and result and isinstance(result[0], dict):
+            properties = set(result[0]) <= {"id"}
+
+        capabilities.pagination_data = pagination_data if pagination_data is not None else _by_version(version, "pagination_data")
+        capabilities.properties = properties if properties is not None else _by_version(version, "properties")
+        capabilities.lines_in_post = _by_version(version, "lines_in_post")
+        capabilities.createfromorder = _by_version(version, "createfromorder")
+    return capabilities
+
+
+class CapabilityCache:
+    """Capabilities of the client's backend, re-probed after ``ttl`` seconds.
+
+    Concurrent callers share one probe. ``status_endpoint`` remembers which
+    step of the ``get_status`` fallback chain answered last, independently of
+    the TTL.
+    """
+
+    def __init__(self, ttl: float = 3600.0) -> None:
+        self.ttl = ttl
+        self.status_endpoint: Optional[str] = None
+        self._capabilities: Optional[Capabilities] = None
+        self._expires = 0.0
+        self._lock = asyncio.Lock()
+
+    @classmethod
+    def from_config(cls, config: Any) -> "CapabilityCache":
+        return cls(ttl=config.capabilities_ttl_seconds)
+
+    @property
+    def cached(self) -> Optional[Capabilities]:
+        """The cached capabilities while they are fresh, without probing."""
+        if self._capabilities is not None and time.monotonic() < self._expires:
+            return self._capabilities
+        return None
+
+    def status_endpoints(self) -> Tuple[str, ...]:
+        """The ``get_status`` fallback chain, last successful endpoint first."""
+        if self.status_endpoint is None:
+            return STATUS_ENDPOINTS
+        return (self.status_endpoint,) + tuple(e for e in STATUS_ENDPOINTS if e != self.status_endpoint)
+
+    def store(self, capabilities: Capabilities) -> None:
+        self._capabilities = capabilities
+        self._expires = time.monotonic() + self.ttl
+
+    def invalidate(self) -> None:
+        self._capabilities = None
+
+    async def get(self, client: Any, refresh: bool = False) -> Capabilities:
+        cached = None if refresh else self.cached
+        client.metrics.record_cache("capabilities", cached is not None)
+        if cached is not None:
+            return cached
+        async with self._lock:
+            cached = None if refresh else self.cached
+            if cached is None:
+                cached = await probe_capabilities(client)
+                self.store(cached)
+            return cached
+
+
+register_warmup_hook("capabilities", lambda client: client.capabilities())
@@ -0,0 +1,205 @@
+"""Record and replay Dolibarr traffic for offline reproduction.
+
+A cassette is a JSON-lines file (gzip-compressed when the name ends in
+``.gz``): one header line, then one line per request with the method,
+endpoint, query parameters, request body, response status, reason, body text,
+the time the response took and its offset from the start of the recording.
+
+:class:`CassetteRecorder` sends requests to the real server and appends each
+exchange. :class:`ReplayTransport` answers from a cassette without any network
+access, sleeping for the recorded duration multiplied by ``latency_scale``
+(``0`` replays as fast as possible). A production agent session recorded with
+``DOLIBARR_RECORD_CASSETTE`` can thus be replayed with
+``DOLIBARR_REPLAY_CASSETTE`` to profile or benchmark a fix against the same
+traffic shape.
+
+Requests are matched on method, endpoint, parameters, body and the
+Multicompany entity (``DOLAPIENTITY`` header). Identical
+requests are answered in recorded order; once their recordings are used up,
+the last one is repeated. The API key travels in a session header and is
+never written.
+"""
+
+import asyncio
+import gzip
+import json
+import time
+from collections import deque
+from dataclasses import asdict, dataclass, field
+from typing import IO, Any, Deque, Dict, List, Optional, Tuple
+
+from aiohttp import ClientSession
+
+from .transport import Transport, TransportResponse, send_http
+
+CASSETTE_VERSION = 1
+
+RequestKey = Tuple[str, str, str, str, str]
+ENTITY_HEADER = "DOLAPIENTITY"
+
+
+class CassetteMiss(LookupError):
+    """The cassette holds no response for a replayed request."""
+
+
+@dataclass
+class Interaction:
+    """One recorded request/response exchange."""
+
+    method: str
+    endpoint: str
+    status: int
+    reason: str
+    response: str
+    duration: float
+    offset: float = 0.0
+    params: Dict[str, Any] = field(default_factory=dict)
+    body: Any = None
+    entity: Optional[str] = None
+
+    @property
+    def key(self) -> RequestKey:
+        return request_key(self.method, self.endpoint, self.params, self.body, self.entity)
+
+
+def request_key(
+    method: str,
+    endpoint: str,
+    params: Optional[Dict[str, Any]],
+    body: Any,
+    entity: Optional[str] = None,
+) -> RequestKey:
+    """Canonical form of a request used to look up recorded responses."""
+    canonical_params = json.dumps({k: str(v) for k, v in (params or {}).items()}, sort_keys=True)
+    canonical_body = json.dumps(body, sort_keys=True, default=str) if body is not None else ""
+    return method.upper(), endpoint.strip("/"), canonical_params, canonical_body, entity or ""
+
+
+def request_entity(kwargs: Dict[str, Any]) -> Optional[str]:
+    """The ``DOLAPIENTITY`` header of a request, if any."""
+    entity = (kwargs.get("headers") or {}).get(ENTITY_HEADER)
+    return str(entity) if entity is not None else None
+
+
+def _open(path: str, mode: str) -> IO[str]:
+    if path.endswith(".gz"):
+        return gzip.open(path, mode + "t", encoding="utf-8")
+    return open(path, mode, encoding="utf-8")
+
+
+def load_cassette(path: str) -> List[Interaction]:
+    """Read the interactions of a cassette file."""
+    interactions: List[Interaction] = []
+    with _open(path, "r") as fh:
+        for number, line in enumerate(fh, 1):
+            if not line.strip():
+                continue
+            entry = json.loads(line)
+            if "cassette" in entry:
+                if entry["cassette"] != CASSETTE_VERSION:
+                    raise ValueError(f"{path}: unsupported cassette version {entry['cassette']}")
+                continue
+            try:
+                interactions.append(Interaction(**entry))
+            except TypeError as e:
+                raise ValueError(f"{path}:{number}: invalid interaction: {e}") from e
+    return interactions
+
+
+class CassetteRecorder(Transport):
+    """Send requests to the server and append every exchange to a cassette."""
+
+    def __init__(self, path: str, inner: Optional[Transport] = None) -> None:
+        self.path = path
+        self.inner = inner
+        self.recorded = 0
+        self._file: Optional[IO[str]] = None
+        self._started = time.monotonic()
+
+    def _write(self, entry: Dict[str, Any]) -> None:
+        if self._file is None:
+            # Reopened after close(): keep what was recorded so far.
+            self._file = _open(self.path, "a" if self.recorded else "w")
+            if not self.recorded:
+                self._file.write(json.dumps({"cassette": CASSETTE_VERSION, "recorded_at": time.time()}) + "\n")
+        self._file.write(json.dumps(entry, separators=(",", ":"), default=str) + "\n")
+        self._file.flush()
+
+    async def send(
+        self,
+        session: ClientSession,
+        method: str,
+        endpoint: str,
+        url: str,
+        kwargs: Dict[str, Any],
+    ) -> TransportResponse:
+        offset = time.monotonic() - self._started
+        started = time.perf_counter()
+        if self.inner is not None:
+            response = await self.inner.send(session, method, endpoint, url, kwargs)
+        else:
+            response = await send_http(session, method, url, kwargs)
+        interaction = Interaction(
+            method=method.upper(),
+            endpoint=endpoint.strip("/"),
+            status=response.status,
+            reason=response.reason,
+            response=response.text,
+            duration=round(time.perf_counter() - started, 6),
+            offset=round(offset, 6),
+            params=dict(kwargs.get("params") or {}),
+            body=kwargs.get("json"),
+            entity=request_entity(kwargs),
+        )
+        self._write(asdict(interaction))
+        self.recorded += 1
+        return response
+
+    async def close(self) -> None:
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+        if self.inner is not None:
+            await self.inner.close()
+
+
+class ReplayTransport(Transport):
+    """Serve responses from a cassette instead of the network."""
+
+    def __init__(self, path: str, latency_scale: float = 1.0) -> None:
+        self.path = path
+        self.latency_scale = latency_scale
+        self.replayed = 0
+        self.misses = 0
+        self._queues: Dict[RequestKey, Deque[Interaction]] = {}
+        for interaction in load_cassette(path):
+            self._queues.setdefault(interaction.key, deque()).append(interaction)
+
+    def _next(self, key: RequestKey) -> Interaction:
+        queue = self._queues.get(key)
+        if not queue:
+            self.misses += 1
+            method, endpoint, params, body, entity = key
+            raise CassetteMiss(
+                f"No recorded response for {method} {endpoint} params={params} body={body or '-'} entity={entity or '-'}"
+            )
+        return queue.popleft() if len(queue) > 1 else queue[0]
+
+    async def send(
+        self,
+        session: ClientSession,
+        method: str,
+        endpoint: str,
+        url: str,
+        kwargs: Dict[str, Any],
+    ) -> TransportResponse:
+        interaction = self._next(
+            request_key(method, endpoint, kwargs.get("params"), kwargs.get("json"), request_entity(kwargs))
+        )
+        if self.latency_scale > 0 and interaction.duration > 0:
+            await asyncio.sleep(interaction.duration * self.latency_scale)
+        trace = kwargs.get("trace_request_ctx")
+        if trace is not None:
+            trace.bytes_in = len(interaction.response.encode())
+        self.replayed += 1
+        return TransportResponse(interaction.status, interaction.reason, interaction.response)
@@ -1,14 +1,17 @@
-"""Command line interface for Dolibarr MCP Server."""
+"""Command line interface for Dolibarr MCP Server.
+
+Only ``serve`` needs the FastMCP server, so it is imported there: building it
+imports fastmcp and registers every tool, which would otherwise slow down
+short-lived commands such as ``version`` and ``test``.
+"""
 
 import asyncio
+import os
 import sys
 from typing import Optional
 
 import click
 
-from .server import mcp
-from .testing import test_connection as run_test_connection
-
 
 @click.group()
 @click.version_option(version="1.1.0", prog_name="dolibarr-mcp")
@@ -22,6 +25,8 @@ def cli():
 @click.option("--api-key", help="Dolibarr API key")
 def test(url: Optional[str], api_key: Optional[str]):
     """Test the connection to Dolibarr API."""
+    from .testing import test_connection as run_test_connection
+
     exit_code = run_test_connection(url=url, api_key=api_key)
     if exit_code != 0:
         sys.exit(exit_code)
@@ -31,8 +36,24 @@ def test(url: Optional[str], api_key: Optional[str]):
 @click.option("--transport", default="stdio", type=click.Choice(["stdio", "http"]), help="Transport protocol")
 @click.option("--host", default="0.0.0.0", help="Host to bind to (HTTP only)")
 @click.option("--port", default=8000, help="Port to bind to (HTTP only)")
-def serve(transport: str, host: str, port: int):
+@click.option("--profile", is_flag=True, help="Profile tool calls with cProfile from startup")
+@click.option("--profile-dir", default=None, help="Directory for per-tool .pstats files (default: DOLIBARR_PROFILE_DIR or ./profiles)")
+@click.option("--profile-calls", type=int, default=None, help="Stop profiling after N tool calls")
+@click.option("--profile-seconds", type=float, default=None, help="Stop profiling after T seconds")
+def serve(
+    transport: str,
+    host: str,
+    port: int,
+    profile: bool,
+    profile_dir: Optional[str],
+    profile_calls: Optional[int],
+    profile_seconds: Optional[float],
+):
     """Start the Dolibarr MCP server."""
+    from .config import Config
+    from .profiling import get_profiler
+    from .server import mcp, save_tool_manifest
+
     if transport == "http":
         click.echo(f"🚀 Starting Dolibarr MCP server (Transport: {transport})")
         click.echo(f"📡 Listening on http://{host}:{port}")
@@ -40,12 +61,140 @@ def serve(transport: str, host: str, port: int):
     else:
         click.echo(f"🚀 Starting Dolibarr MCP server (Transport: {transport})")
     
+    profiler = get_profiler()
+    # The start_profiling tool writes into the same directory.
+    profiler.default_dir = profile_dir
+    if profile:
+        # Same setting (environment, .env, aliases) the start_profiling tool reads
+        directory = profile_dir or Config().profile_dir
+        profiler.start(directory, calls=profile_calls, seconds=profile_seconds)
+        click.echo(f"⏱️  Profiling tool calls into {directory}/", err=True)
+
+    save_tool_manifest()
+
     # Run the FastMCP server
     # Only pass host/port for HTTP transport
-    if transport == "http":
-        mcp.run(transport=transport, host=host, port=port)
-    else:
-        mcp.run(transport=transport)
+    try:
+        if transport == "http":
+            mcp.run(transport=transport, host=host, port=port)
+        else:
+            mcp.run(transport=transport)
+    finally:
+        if profiler.armed:
+            profiler.stop()
+
+
+@cli.command("fake-server")
+@click.option("--host", default="127.0.0.1", help="Host to bind to")
+@click.option("--port", default=8080, help="Port to bind to")
+@click.option("--unix-socket", default=None, help="Also listen on this unix domain socket")
+@click.option("--api-key", default="", help="Require this DOLAPIKEY (default: accept any)")
+@click.option("--seed", default=42, help="Random seed of the generated dataset")
+@click.option("--thirdparties", default=1000, help="Seeded thirdparties")
+@click.option("--products", default=500, help="Seeded products")
+@click.option("--invoices", default=2000, help="Seeded invoices")
+@click.option("--lines-per-invoice", default=5, help="Lines per seeded invoice, order and proposal")
+@click.option("--orders", default=500, help="Seeded orders")
+@click.option("--proposals", default=500, help="Seeded proposals")
+@click.option("--projects", default=100, help="Seeded projects")
+@click.option("--contacts", default=1000, help="Seeded contacts")
+@click.option("--users", default=10, help="Seeded users")
+@click.option("--latency-ms", default=0.0, help="Fixed latency added to every request")
+@click.option("--jitter-ms", default=0.0, help="Uniform random latency added on top")
+@click.option("--empty-list-404", is_flag=True, help="Answer empty lists with 404 like older Dolibarr versions")
+def fake_server(
+    host: str,
+    port: int,
+    unix_socket: Optional[str],
+    api_key: str,
+    seed: int,
+    latency_ms: float,
+    jitter_ms: float,
+    empty_list_404: bool,
+    **volumes: int,
+):
+    """Run a local Dolibarr stand-in with a seeded dataset (for benchmarks)."""
+    from aiohttp import web
+
+    from .fake_server import FakeDolibarr, FakeServerSettings, SeedVolumes, create_app
+
+    click.echo("🌱 Seeding dataset...", err=True)
+    data = FakeDolibarr(SeedVolumes(**volumes), seed=seed)
+    settings = FakeServerSettings(
+        api_key=api_key,
+        latency_ms=latency_ms,
+        jitter_ms=jitter_ms,
+        empty_list_404=empty_list_404,
+    )
+    click.echo(f"🧪 Fake Dolibarr API on http://{host}:{port}/api/index.php", err=True)
+    if unix_socket:
+        click.echo(f"🧪 ... and on unix socket {unix_socket}", err=True)
+    web.run_app(create_app(data, settings), host=host, port=port, path=unix_socket, access_log=None, print=None)
+
+
+@cli.command()
+@click.argument("scenario_file", type=click.Path(exists=True, dir_okay=False))
+@click.option("--transport", default="stdio", type=click.Choice(["stdio", "http"]), help="Transport of the launched server")
+@click.option("--server-url", default=None, help="Drive an already running HTTP server (e.g. http://host:8000/mcp) instead of launching one")
+@click.option("--agents", type=int, default=None, help="Concurrent simulated agents (overrides the scenario)")
+@click.option("--duration", type=float, default=None, help="Run length in seconds (overrides the scenario)")
+@click.option("--backend", default="fake", type=click.Choice(["fake", "env"]), help="Local stand-in server, or DOLIBARR_URL/DOLIBARR_API_KEY from the environment")
+@click.option("--fake-latency-ms", default=0.0, help="Latency added by the stand-in server")
+@click.option("--faults", type=click.Path(exists=True, dir_okay=False), default=None, help="Fault plan JSON applied by the launched server")
+@click.option("--seed", type=int, default=None, help="Random seed of the call mix")
+@click.option("--json-output", "-o", default=None, help="Also write the report as JSON")
+def bench(
+    scenario_file: str,
+    transport: str,
+    server_url: Optional[str],
+    agents: Optional[int],
+    duration: Optional[float],
+    backend: str,
+    fake_latency_ms: float,
+    faults: Optional[str],
+    seed: Optional[int],
+    json_output: Optional[str],
+):
+    """Load-test the MCP server with a scenario of concurrent agents."""
+    import json
+
+    from .loadgen import Scenario, format_report, launch_server, run_load
+
+    scenario = Scenario.load(scenario_file)
+    if agents:
+        scenario.agents = agents
+    if duration:
+        scenario.duration_seconds = duration
+        scenario.calls_per_agent = None
+
+    fault_env = {"DOLIBARR_FAULT_PLAN": os.path.abspath(faults)} if faults else {}
+
+    async def run() -> dict:
+        if server_url:
+            from fastmcp import Client
+            from fastmcp.client.transports import StreamableHttpTransport
+
+            return await run_load(lambda: Client(StreamableHttpTransport(server_url)), scenario, seed=seed)
+        if backend == "env":
+            async with launch_server(transport, fault_env) as factory:
+                return await run_load(factory, scenario, seed=seed, shared_session=transport == "stdio")
+
+        from .fake_server import FakeDolibarr, FakeServerSettings, serve_fake_dolibarr
+
+        click.echo("🌱 Seeding stand-in Dolibarr...", err=True)
+        data = FakeDolibarr()
+        async with serve_fake_dolibarr(data, FakeServerSettings(latency_ms=fake_latency_ms)) as url:
+            env = {"DOLIBARR_URL": url, "DOLIBARR_API_KEY": "bench", **fault_env}
+            async with launch_server(transport, env) as factory:
+                return await run_load(factory, scenario, seed=seed, shared_session=transport == "stdio")
+
+    click.echo(f"🏋️  Running scenario {scenario.name} with {scenario.agents} agents", err=True)
+    report = asyncio.run(run())
+    click.echo(format_report(report))
+    if json_output:
+        with open(json_output, "w", encoding="utf-8") as fh:
+            json.dump(report, fh, indent=2)
+            fh.write("\n")
 
 
 @cli.command()
@@ -2,8 +2,10 @@
 
 import os
 import sys
+from typing import Literal, Optional
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
 
-from pydantic import AliasChoices, Field, field_validator
+from pydantic import AliasChoices, Field, field_validator, model_validator
 from pydantic_settings import BaseSettings, SettingsConfigDict
 from dotenv import load_dotenv
 
@@ -33,11 +35,234 @@ class Config(BaseSettings):
         validation_alias=AliasChoices("dolibarr_api_key", "api_key"),
     )
 
+    unix_socket: str = Field(
+        description="Unix domain socket of a co-located Dolibarr web server; DOLIBARR_URL stays the logical API URL (empty uses TCP)",
+        default="",
+        validation_alias=AliasChoices("dolibarr_unix_socket", "unix_socket"),
+    )
+
+    dolibarr_urls: str = Field(
+        description="Comma-separated additional read-write frontends of the same Dolibarr to balance requests over",
+        default="",
+    )
+
+    dolibarr_replica_urls: str = Field(
+        description="Comma-separated read-only frontends; reads go to them, writes to the read-write ones",
+        default="",
+    )
+
+    balancer_strategy: Literal["least_outstanding", "ewma"] = Field(
+        description="How requests are spread over several frontends",
+        default="least_outstanding",
+        validation_alias=AliasChoices("dolibarr_balancer_strategy", "balancer_strategy"),
+    )
+
+    balancer_eject_failures: int = Field(
+        description="Consecutive failures that take a frontend out of rotation",
+        default=3,
+        ge=1,
+        validation_alias=AliasChoices("dolibarr_balancer_eject_failures", "balancer_eject_failures"),
+    )
+
+    balancer_eject_seconds: float = Field(
+        description="Seconds an ejected frontend stays out of rotation",
+        default=30.0,
+        gt=0,
+        validation_alias=AliasChoices("dolibarr_balancer_eject_seconds", "balancer_eject_seconds"),
+    )
+
     log_level: str = Field(
         description="Logging level",
         default="INFO",
     )
 
+    cursor_ttl_seconds: float = Field(
+        description="Seconds an idle result cursor snapshot is kept",
+        default=600.0,
+        gt=0,
+        validation_alias=AliasChoices("dolibarr_cursor_ttl_seconds", "cursor_ttl_seconds"),
+    )
+
+    cursor_max_rows: int = Field(
+        description="Maximum rows held across all cursor snapshots",
+        default=100_000,
+        ge=1,
+        validation_alias=AliasChoices("dolibarr_cursor_max_rows", "cursor_max_rows"),
+    )
+
+    count_max_rows: int = Field(
+        description="Rows an id-only counting scan reads before it reports a truncated total",
+        default=100_000,
+        ge=1,
+        validation_alias=AliasChoices("dolibarr_count_max_rows", "count_max_rows"),
+    )
+
+    cursor_scan_page_size: int = Field(
+        description="Rows requested per backend call while filling a cursor snapshot",
+        default=500,
+        ge=1,
+        validation_alias=AliasChoices("dolibarr_cursor_scan_page_size", "cursor_scan_page_size"),
+    )
+
+    server_timezone: str = Field(
+        description="Timezone of the Dolibarr database, used to render modification watermarks",
+        default="UTC",
+        validation_alias=AliasChoices("dolibarr_server_timezone", "server_timezone"),
+    )
+
+    trace_file: str = Field(
+        description="Append OTLP/JSON traces of tool calls to this file (empty disables)",
+        default="",
+        validation_alias=AliasChoices("dolibarr_trace_file", "trace_file"),
+    )
+
+    trace_otlp_endpoint: str = Field(
+        description="OTLP/HTTP collector URL receiving traces, e.g. http://localhost:4318 (empty disables)",
+        default="",
+        validation_alias=AliasChoices("dolibarr_trace_otlp_endpoint", "trace_otlp_endpoint"),
+    )
+
+    request_budget_mode: Literal["off", "warn", "fail"] = Field(
+        description="What to do when a tool call exceeds its Dolibarr request budget",
+        default="warn",
+        validation_alias=AliasChoices("dolibarr_request_budget_mode", "request_budget_mode"),
+    )
+
+    slow_request_ms: float = Field(
+        description="Dolibarr requests slower than this are written to the slow log",
+        default=2000.0,
+        gt=0,
+        validation_alias=AliasChoices("dolibarr_slow_request_ms", "slow_request_ms"),
+    )
+
+    slow_tool_ms: float = Field(
+        description="Tool calls slower than this are written to the slow log",
+        default=5000.0,
+        gt=0,
+        validation_alias=AliasChoices("dolibarr_slow_tool_ms", "slow_tool_ms"),
+    )
+
+    slow_log_payload_bytes: int = Field(
+        description="Maximum characters of each payload sample in slow and debug logs",
+        default=1024,
+        ge=0,
+        validation_alias=AliasChoices("dolibarr_slow_log_payload_bytes", "slow_log_payload_bytes"),
+    )
+
+    log_sample_rate: float = Field(
+        description="Fraction of requests that get DEBUG request/response logging",
+        default=1.0,
+        ge=0,
+        le=1,
+        validation_alias=AliasChoices("dolibarr_log_sample_rate", "log_sample_rate"),
+    )
+
+    profile_dir: str = Field(
+        description="Directory receiving per-tool .pstats files from profiling sessions",
+        default="profiles",
+        validation_alias=AliasChoices("dolibarr_profile_dir", "profile_dir"),
+    )
+
+    capabilities_ttl_seconds: float = Field(
+        description="How long probed Dolibarr API capabilities stay cached",
+        default=3600.0,
+        gt=0,
+        validation_alias=AliasChoices("dolibarr_capabilities_ttl_seconds", "capabilities_ttl_seconds"),
+    )
+
+    entity: Optional[int] = Field(
+        description="Multicompany entity sent as DOLAPIENTITY (empty: the API user's entity)",
+        default=None,
+        ge=1,
+        validation_alias=AliasChoices("dolibarr_entity", "entity"),
+    )
+
+    tenant_headers: bool = Field(
+        description="Serve requests with X-Dolibarr-Api-Key/X-Dolibarr-Url headers with per-tenant clients (HTTP transport)",
+        default=False,
+        validation_alias=AliasChoices("dolibarr_tenant_headers", "tenant_headers"),
+    )
+
+    tenant_allowed_hosts: str = Field(
+        description="Comma-separated origins (https://host[:port]; a bare host means https) X-Dolibarr-Url may name besides the configured one",
+        default="",
+        validation_alias=AliasChoices("dolibarr_tenant_allowed_hosts", "tenant_allowed_hosts"),
+    )
+
+    tenant_max_clients: int = Field(
+        description="Tenant clients kept open; the least recently used beyond this are closed",
+        default=32,
+        ge=1,
+        validation_alias=AliasChoices("dolibarr_tenant_max_clients", "tenant_max_clients"),
+    )
+
+    tenant_idle_seconds: float = Field(
+        description="Seconds after which an unused tenant client is closed",
+        default=600.0,
+        gt=0,
+        validation_alias=AliasChoices("dolibarr_tenant_idle_seconds", "tenant_idle_seconds"),
+    )
+
+    warmup_connections: int = Field(
+        description="Connections the background warm-up opens ahead of the first tool calls (0 disables it)",
+        default=4,
+        ge=0,
+        validation_alias=AliasChoices("dolibarr_warmup_connections", "warmup_connections"),
+    )
+
+    watchdog_interval_seconds: float = Field(
+        description="Sampling interval of the loop-lag and memory watchdog (0 disables it)",
+        default=1.0,
+        ge=0,
+        validation_alias=AliasChoices("dolibarr_watchdog_interval_seconds", "watchdog_interval_seconds"),
+    )
+
+    loop_lag_threshold_ms: float = Field(
+        description="Event-loop lag that triggers a watchdog alert",
+        default=250.0,
+        gt=0,
+        validation_alias=AliasChoices("dolibarr_loop_lag_threshold_ms", "loop_lag_threshold_ms"),
+    )
+
+    rss_threshold_mb: float = Field(
+        description="Resident memory that triggers a watchdog alert (0 disables the check)",
+        default=0.0,
+        ge=0,
+        validation_alias=AliasChoices("dolibarr_rss_threshold_mb", "rss_threshold_mb"),
+    )
+
+    tracemalloc_frames: int = Field(
+        description="Start tracemalloc with this many frames at startup (0 leaves it off)",
+        default=0,
+        ge=0,
+        validation_alias=AliasChoices("dolibarr_tracemalloc_frames", "tracemalloc_frames"),
+    )
+
+    record_cassette: str = Field(
+        description="Record every Dolibarr request and response to this cassette file (empty disables)",
+        default="",
+        validation_alias=AliasChoices("dolibarr_record_cassette", "record_cassette"),
+    )
+
+    replay_cassette: str = Field(
+        description="Answer Dolibarr requests from this cassette file instead of the network (empty disables)",
+        default="",
+        validation_alias=AliasChoices("dolibarr_replay_cassette", "replay_cassette"),
+    )
+
+    replay_latency_scale: float = Field(
+        description="Multiplier for recorded response times during replay (0 replays without delay)",
+        default=1.0,
+        ge=0,
+        validation_alias=AliasChoices("dolibarr_replay_latency_scale", "replay_latency_scale"),
+    )
+
+    fault_plan: str = Field(
+        description="JSON fault plan injecting latency, resets, 5xx bursts and truncated bodies (empty disables)",
+        default="",
+        validation_alias=AliasChoices("dolibarr_fault_plan", "fault_plan"),
+    )
+
     @field_validator("dolibarr_url")
     @classmethod
     def validate_dolibarr_url(cls, v: str) -> str:
@@ -101,6 +326,16 @@ class Config(BaseSettings):
 
         return v
 
+    @field_validator("server_timezone")
+    @classmethod
+    def validate_server_timezone(cls, v: str) -> str:
+        """Validate the Dolibarr database timezone."""
+        try:
+            ZoneInfo(v)
+        except (ZoneInfoNotFoundError, ValueError):
+            raise ValueError(f"Unknown timezone '{v}' for DOLIBARR_SERVER_TIMEZONE") from None
+        return v
+
     @field_validator("log_level")
     @classmethod
     def validate_log_level(cls, v: str) -> str:
@@ -114,6 +349,24 @@ class Config(BaseSettings):
             return "INFO"
         return v.upper()
 
+    @model_validator(mode="after")
+    def validate_unix_socket(self) -> "Config":
+        """Check that a unix socket is not combined with settings it would bypass."""
+        if not self.unix_socket:
+            return self
+        if self.dolibarr_urls or self.dolibarr_replica_urls:
+            raise ValueError(
+                "DOLIBARR_UNIX_SOCKET sends every request to one socket; "
+                "it cannot be combined with DOLIBARR_URLS or DOLIBARR_REPLICA_URLS"
+            )
+        if self.dolibarr_url.startswith("https://"):
+            print(
+                "⚠️ DOLIBARR_UNIX_SOCKET with an https:// DOLIBARR_URL speaks TLS over the socket; "
+                "use http:// unless the socket terminates TLS",
+                file=sys.stderr,
+            )
+        return self
+
     @classmethod
     def from_env(cls) -> "Config":
         """Create configuration from environment variables with validation."""
@@ -179,3 +432,36 @@ class Config(BaseSettings):
     def api_key(self, value: str) -> None:
         """Allow updating the API key via legacy attribute."""
         self.dolibarr_api_key = value
+
+
+class StartupSettings(BaseSettings):
+    """Settings needed while the server module is imported.
+
+    Tools are registered at import time, before :class:`Config` is loaded and
+    validated in the lifespan, so these few values are read on their own.
+    """
+
+    model_config = SettingsConfigDict(
+        env_file=".env",
+        env_file_encoding="utf-8",
+        case_sensitive=False,
+        extra="ignore",
+    )
+
+    toolsets: str = Field(
+        description="Comma-separated toolsets to register (see dolibarr_mcp.tools.TOOLSETS), or 'all'",
+        default="all",
+        validation_alias=AliasChoices("dolibarr_toolsets", "toolsets"),
+    )
+
+    manifest_cache: bool = Field(
+        description="Reuse tool schemas cached on disk instead of generating them at every start",
+        default=True,
+        validation_alias=AliasChoices("dolibarr_manifest_cache", "manifest_cache"),
+    )
+
+    manifest_cache_dir: str = Field(
+        description="Directory of the tool manifest cache (default: $XDG_CACHE_HOME/dolibarr-mcp)",
+        default="",
+        validation_alias=AliasChoices("dolibarr_manifest_cache_dir", "manifest_cache_dir"),
+    )
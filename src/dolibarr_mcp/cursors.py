@@ -0,0 +1,141 @@
+"""Server-side result snapshots backing the cursor tools.
+
+A cursor is an opaque token pointing at a snapshot of a full result set plus an
+offset into it. Snapshots are filled by one backend scan and then served page by
+page from memory, so deep pagination does not re-run the Dolibarr query with a
+growing OFFSET. Memory is bounded by a global row budget and snapshots expire
+after a TTL of inactivity.
+"""
+
+import base64
+import secrets
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Tuple
+
+from .models import CursorPage
+
+
+class CursorError(ValueError):
+    """Raised when a cursor token is malformed, unknown or expired."""
+
+
+@dataclass
+class _Snapshot:
+    resource: str
+    rows: List[Dict[str, Any]]
+    page_size: int
+    truncated: bool
+    last_access: float = field(default_factory=time.monotonic)
+
+
+class CursorStore:
+    """LRU store of result snapshots with TTL and row-budget eviction."""
+
+    def __init__(
+        self,
+        ttl_seconds: float = 600.0,
+        max_snapshots: int = 32,
+        max_total_rows: int = 100_000,
+    ):
+        self.ttl_seconds = ttl_seconds
+        self.max_snapshots = max_snapshots
+        self.max_total_rows = max_total_rows
+        self._snapshots: "OrderedDict[str, _Snapshot]" = OrderedDict()
+        self._total_rows = 0
+
+    def __len__(self) -> int:
+        return len(self._snapshots)
+
+    @property
+    def total_rows(self) -> int:
+        """Number of rows currently held across all snapshots."""
+        return self._total_rows
+
+    @staticmethod
+    def _encode(snapshot_id: str, offset: int) -> str:
+        raw = f"{snapshot_id}:{offset}".encode()
+        return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+    @staticmethod
+    def _decode(token: str) -> Tuple[str, int]:
+        try:
+            padded = token + "=" * (-len(token) % 4)
+            snapshot_id, offset = base64.urlsafe_b64decode(padded).decode().split(":", 1)
+            return snapshot_id, int(offset)
+        except (ValueError, UnicodeDecodeError) as exc:
+            raise CursorError("Malformed cursor") from exc
+
+    def _drop(self, snapshot_id: str) -> None:
+        snapshot = self._snapshots.pop(snapshot_id, None)
+        if snapshot is not None:
+            self._total_rows -= len(snapshot.rows)
+
+    def evict_expired(self) -> None:
+        """Drop snapshots that have not been accessed within the TTL."""
+        deadline = time.monotonic() - self.ttl_seconds
+        for snapshot_id in [k for k, s in self._snapshots.items() if s.last_access < deadline]:
+            self._drop(snapshot_id)
+
+    def open(
+        self,
+        resource: str,
+        rows: List[Dict[str, Any]],
+        page_size: int,
+        truncated: bool = False,
+    ) -> CursorPage:
+        """Store a snapshot and return its first page."""
+        self.evict_expired()
+        if len(rows) > self.max_total_rows:
+            rows = rows[: self.max_total_rows]
+            truncated = True
+
+        # Evict least recently used snapshots until the new one fits.
+        while self._snapshots and (
+            len(self._snapshots) >= self.max_snapshots
+            or self._total_rows + len(rows) > self.max_total_rows
+        ):
+            self._drop(next(iter(self._snapshots)))
+
+        snapshot_id = secrets.token_urlsafe(12)
+        self._snapshots[snapshot_id] = _Snapshot(resource, rows, page_size, truncated)
+        self._total_rows += len(rows)
+        return self._page(snapshot_id, 0)
+
+    def next_page(self, token: str) -> CursorPage:
+        """Return the page a cursor token points at."""
+        self.evict_expired()
+        snapshot_id, offset = self._decode(token)
+        if snapshot_id not in self._snapshots:
+            raise CursorError("Cursor expired or unknown - open a new cursor")
+        self._snapshots.move_to_end(snapshot_id)
+        return self._page(snapshot_id, offset)
+
+    def close(self, token: str) -> bool:
+        """Release the snapshot behind a cursor. Returns False if already gone."""
+        snapshot_id, _ = self._decode(token)
+        if snapshot_id not in self._snapshots:
+            return False
+        self._drop(snapshot_id)
+        return True
+
+    def clear(self) -> None:
+        """Drop every snapshot."""
+        self._snapshots.clear()
+        self._total_rows = 0
+
+    def _page(self, snapshot_id: str, offset: int) -> CursorPage:
+        snapshot = self._snapshots[snapshot_id]
+        snapshot.last_access = time.monotonic()
+        offset = max(0, offset)
+        end = offset + snapshot.page_size
+        next_cursor = self._encode(snapshot_id, end) if end < len(snapshot.rows) else None
+        return CursorPage(
+            resource=snapshot.resource,
+            items=snapshot.rows[offset:end],
+            offset=offset,
+            total=len(snapshot.rows),
+            truncated=snapshot.truncated,
+            next_cursor=next_cursor,
+        )
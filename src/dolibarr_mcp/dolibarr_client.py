@@ -2,12 +2,22 @@
 
 import json
 import logging
-from typing import Any, Dict, List, Optional
+import time
+from typing import Any, Dict, List, Optional, Tuple
 
 import aiohttp
 from aiohttp import ClientSession, ClientTimeout
 
+from .budget import COUNT_PAGE_SIZE, note_items, note_request
+from .capabilities import Capabilities, CapabilityCache
 from .config import Config
+from .metrics import RequestMetrics, RequestTrace, create_trace_config, normalize_endpoint
+from .slowlog import get_slow_log, payload_sample
+from .tracing import get_tracer
+from .transport import Transport, send_http
+
+# Line fields copied when an order is turned into an invoice client-side
+ORDER_LINE_FIELDS = ("fk_product", "product_type", "desc", "qty", "subprice", "tva_tx", "remise_percent")
 
 
 class DolibarrAPIError(Exception):
@@ -23,13 +33,46 @@ class DolibarrAPIError(Exception):
 class DolibarrClient:
     """Professional Dolibarr API client with comprehensive functionality."""
     
-    def __init__(self, config: Config):
-        """Initialize the Dolibarr client."""
+    def __init__(
+        self,
+        config: Config,
+        transport: Optional[Transport] = None,
+        capability_cache: Optional[CapabilityCache] = None,
+        connector: Optional[aiohttp.BaseConnector] = None,
+        entity: Optional[int] = None,
+        unix_socket: Optional[str] = None,
+        count_max_rows: int = 100_000,
+        owns_transport: bool = True,
+    ):
+        """Initialize the Dolibarr client.
+
+        Args:
+            config: Connection settings
+            transport: Optional transport replacing plain HTTP (recording, replay)
+            capability_cache: Cache of the backend's optional API features
+            connector: Connection pool shared with other clients (not closed by this one)
+            entity: Multicompany entity sent as ``DOLAPIENTITY`` with every request
+            unix_socket: Reach the web server through this unix socket instead of TCP
+            count_max_rows: Rows an id-only counting scan reads before giving up
+            owns_transport: False when ``transport`` belongs to another client,
+                which records its retries and closes it
+        """
         self.config = config
+        self.transport = transport
+        self.owns_transport = owns_transport
+        self.connector = connector
+        self.entity = entity
+        self.unix_socket = unix_socket
+        self.count_max_rows = count_max_rows
+        self._entity_clients: Dict[int, "EntityClient"] = {}
+        self.capability_cache = capability_cache or CapabilityCache()
         self.base_url = config.dolibarr_url.rstrip('/')
         self.api_key = config.api_key
         self.session: Optional[ClientSession] = None
         self.logger = logging.getLogger(__name__)
+        self.metrics = RequestMetrics()
+        if transport is not None and owns_transport:
+            transport.metrics = self.metrics
         
         # Configure timeout
         self.timeout = ClientTimeout(total=30, connect=10)
@@ -46,13 +89,20 @@ class DolibarrClient:
     async def start_session(self):
         """Start the HTTP session."""
         if not self.session:
+            connector = self.connector
+            if connector is None and self.unix_socket:
+                # Requests keep the logical URL (Host header, paths); only the socket changes.
+                connector = aiohttp.UnixConnector(path=self.unix_socket)
             self.session = aiohttp.ClientSession(
+                connector=connector,
+                connector_owner=self.connector is None,
                 timeout=self.timeout,
                 headers={
                     "DOLAPIKEY": self.api_key,
                     "Content-Type": "application/json",
                     "Accept": "application/json"
-                }
+                },
+                trace_configs=[create_trace_config()],
             )
     
     async def close_session(self):
@@ -60,6 +110,17 @@ class DolibarrClient:
         if self.session:
             await self.session.close()
             self.session = None
+        if self.transport and self.owns_transport:
+            await self.transport.close()
+
+    def for_entity(self, entity: Optional[int]) -> "DolibarrClient":
+        """Client for one Multicompany entity, sharing this client's session."""
+        if entity is None or entity == self.entity:
+            return self
+        client = self._entity_clients.get(entity)
+        if client is None:
+            client = self._entity_clients[entity] = EntityClient(self, entity)
+        return client
 
     @staticmethod
     def _extract_identifier(response: Any) -> Any:
@@ -82,6 +143,28 @@ class DolibarrClient:
             payload.update(kwargs)
         return payload
 
+    @staticmethod
+    def _list_params(
+        limit: int,
+        page: int = 0,
+        sqlfilters: Optional[str] = None,
+        thirdparty_ids: Optional[str] = None,
+        sortfield: Optional[str] = None,
+        sortorder: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """Build list query parameters, leaving out everything that is unset."""
+        params: Dict[str, Any] = {"limit": limit}
+        if page > 0:
+            params["page"] = page
+        if sqlfilters:
+            params["sqlfilters"] = sqlfilters
+        if thirdparty_ids:
+            params["thirdparty_ids"] = thirdparty_ids
+        if sortfield:
+            params["sortfield"] = sortfield
+            params["sortorder"] = sortorder or "ASC"
+        return params
+
     
     async def request(
         self,
@@ -116,60 +199,83 @@ class DolibarrClient:
             await self.start_session()
         
         url = self._build_url(endpoint)
+        trace = RequestTrace()
+        status = 0
+        response_text = None
+        slow_log = get_slow_log()
+        sampled = self.logger.isEnabledFor(logging.DEBUG) and slow_log.sample()
+        started = time.perf_counter()
+        tracer = get_tracer()
+        span = tracer.start_span(
+            f"{method.upper()} {normalize_endpoint(endpoint)}",
+            kind="client",
+            **{"http.request.method": method.upper(), "url.template": normalize_endpoint(endpoint)},
+        )
         
         try:
-            self.logger.debug(f"Making {method} request to {url}")
+            if sampled:
+                self.logger.debug("Making %s request to %s", method, url)
             
             kwargs = {
                 "params": params or {},
+                "trace_request_ctx": trace,
             }
             
             if data and method.upper() in ["POST", "PUT"]:
                 kwargs["json"] = data
+
+            if self.entity is not None:
+                kwargs["headers"] = {"DOLAPIENTITY": str(self.entity)}
             
-            async with self.session.request(method, url, **kwargs) as response:
-                response_text = await response.text()
-                
-                # Log response for debugging
-                self.logger.debug(f"Response status: {response.status}")
-                self.logger.debug(f"Response text: {response_text[:500]}...")
-                
-                # Try to parse JSON response
+            if self.transport is not None:
+                response = await self.transport.send(self.session, method, endpoint, url, kwargs)
+            else:
+                response = await send_http(self.session, method, url, kwargs)
+            status = response.status
+            response_text = response.text
+
+            # Log response for debugging
+            if sampled:
+                self.logger.debug("Response status: %s", response.status)
+                self.logger.debug("Response text: %s", payload_sample(response_text, slow_log.payload_bytes))
+
+            # Try to parse JSON response
+            with tracer.span("json.decode", bytes=len(response_text)):
                 try:
                     response_data = json.loads(response_text) if response_text else {}
                 except json.JSONDecodeError:
                     response_data = {"raw_response": response_text}
+
+            # Handle error responses
+            if response.status >= 400:
+                error_msg = f"HTTP {response.status}: {response.reason}"
+                if isinstance(response_data, dict):
+                    if "error" in response_data:
+                        error_details = response_data["error"]
+                        if isinstance(error_details, dict):
+                            error_msg = error_details.get("message", error_msg)
+                            if "code" in error_details:
+                                error_msg = f"{error_msg} (Code: {error_details['code']})"
+                        else:
+                            error_msg = str(error_details)
+                    elif "message" in response_data:
+                        error_msg = response_data["message"]
                 
-                # Handle error responses
-                if response.status >= 400:
-                    error_msg = f"HTTP {response.status}: {response.reason}"
-                    if isinstance(response_data, dict):
-                        if "error" in response_data:
-                            error_details = response_data["error"]
-                            if isinstance(error_details, dict):
-                                error_msg = error_details.get("message", error_msg)
-                                if "code" in error_details:
-                                    error_msg = f"{error_msg} (Code: {error_details['code']})"
-                            else:
-                                error_msg = str(error_details)
-                        elif "message" in response_data:
-                            error_msg = response_data["message"]
-                    
-                    raise DolibarrAPIError(
-                        message=error_msg,
-                        status_code=response.status,
-                        response_data=response_data
-                    )
-                
-                return response_data
-                
+                raise DolibarrAPIError(
+                    message=error_msg,
+                    status_code=response.status,
+                    response_data=response_data
+                )
+
+            return response_data
+
         except aiohttp.ClientError as e:
             # For status endpoint, try alternative URL if first attempt fails
             if endpoint == "status" and not url.endswith("/api/status"):
                 try:
                     # Try with /api/index.php/setup/modules as alternative
                     alt_url = f"{self.base_url}/setup/modules"
-                    self.logger.debug(f"Status failed, trying alternative: {alt_url}")
+                    self.logger.debug("Status failed, trying alternative: %s", alt_url)
                     
                     async with self.session.get(alt_url) as response:
                         if response.status == 200:
@@ -187,7 +293,105 @@ class DolibarrClient:
             if isinstance(e, DolibarrAPIError):
                 raise
             raise DolibarrAPIError(f"Unexpected error: {str(e)}")
+        finally:
+            duration = time.perf_counter() - started
+            self.metrics.observe_request(method, endpoint, status, duration, trace)
+            note_request(method, endpoint, duration)
+            slow_log.log_request(
+                method, endpoint, params, status, duration,
+                queue_wait=trace.queue_wait,
+                bytes_out=trace.bytes_out,
+                bytes_in=trace.bytes_in,
+                request_body=data,
+                response_text=response_text,
+            )
+            if span is not None:
+                if trace.queue_wait:
+                    wait_ns = int(trace.queue_wait * 1e9)
+                    tracer.record_span("connection.queue_wait", span.start_ns, span.start_ns + wait_ns)
+                span.set_attribute("http.response.status_code", status)
+                span.set_attribute("http.response.body.size", trace.bytes_in)
+                error = None
+                if status == 0:
+                    error = "no response"
+                elif status >= 400:
+                    error = f"HTTP {status}"
+                tracer.end_span(span, error=error)
     
+    # ============================================================================
+    # PAGINATED SCANS
+    # ============================================================================
+
+    async def scan(
+        self,
+        endpoint: str,
+        params: Optional[Dict[str, Any]] = None,
+        page_size: int = 500,
+        max_rows: int = 10000,
+    ) -> Tuple[List[Dict[str, Any]], bool]:
+        """Read a list endpoint page by page until it is exhausted.
+
+        Returns the collected rows and a flag telling whether the scan stopped
+        at ``max_rows`` before the endpoint ran out of rows. Older Dolibarr
+        versions answer an empty page with 404, which ends the scan.
+        """
+        rows: List[Dict[str, Any]] = []
+        page = 0
+        # Dolibarr pages by page * limit, so the page size must stay constant.
+        while len(rows) < max_rows:
+            batch_params = dict(params or {})
+            batch_params["limit"] = page_size
+            batch_params["page"] = page
+            try:
+                result = await self.request("GET", endpoint, params=batch_params)
+            except DolibarrAPIError as e:
+                if e.status_code != 404:
+                    raise
+                result = []
+            batch = result if isinstance(result, list) else []
+            rows.extend(batch)
+            if len(batch) < page_size:
+                return rows[:max_rows], len(rows) > max_rows
+            page += 1
+        return rows[:max_rows], True
+
+    async def count(
+        self,
+        endpoint: str,
+        params: Optional[Dict[str, Any]] = None,
+        page_size: int = COUNT_PAGE_SIZE,
+    ) -> Tuple[int, str, bool]:
+        """Count the rows of a list endpoint without transferring them.
+
+        Asks Dolibarr for ``pagination_data`` with ``limit=1`` so the total comes
+        back in the response metadata. Servers that ignore the flag are counted
+        with an id-only scan instead; when the cached capabilities already say
+        so, the scan starts right away. The scan stops at ``count_max_rows``.
+        Returns the total, the method used and whether the total was truncated.
+        """
+        known = self.capability_cache.cached
+        if known is None or known.pagination_data:
+            query = dict(params or {})
+            query.update({"limit": 1, "page": 0, "pagination_data": "true"})
+            try:
+                result = await self.request("GET", endpoint, params=query)
+            except DolibarrAPIError as e:
+                # Older Dolibarr versions answer an empty list with 404.
+                if e.status_code == 404:
+                    return 0, "pagination_data", False
+                raise
+
+            if isinstance(result, dict):
+                pagination = result.get("pagination")
+                if isinstance(pagination, dict) and "total" in pagination:
+                    return int(pagination["total"]), "pagination_data", False
+
+        query = dict(params or {})
+        if known is None or known.properties:
+            query["properties"] = "id"
+        rows, truncated = await self.scan(endpoint, params=query, page_size=page_size, max_rows=self.count_max_rows)
+        return len(rows), "scan", truncated
+
     # ============================================================================
     # SYSTEM ENDPOINTS
     # ============================================================================
@@ -197,35 +401,41 @@ class DolibarrClient:
         return await self.get_status()
 
     async def get_status(self) -> Dict[str, Any]:
-        """Get API status and version information."""
-        try:
-            # First try the standard status endpoint
-            return await self.request("GET", "status")
-        except DolibarrAPIError:
-            # If status fails, try to get module list as a connectivity test
-            try:
-                result = await self.request("GET", "setup/modules")
-                if result:
-                    return {
-                        "success": 1,
-                        "dolibarr_version": "Connected",
-                        "api_version": "1.0",
-                        "modules_available": isinstance(result, (list, dict))
-                    }
-            except:
-                pass
-            
-            # If all else fails, try a simple user list
+        """Get API status and version information.
+
+        Falls back to ``setup/modules`` and ``users?limit=1`` as connectivity
+        tests when ``status`` is unavailable. The endpoint that answered is
+        tried first on the next call.
+        """
+        for endpoint in self.capability_cache.status_endpoints():
             try:
-                result = await self.request("GET", "users?limit=1")
-                if result is not None:
-                    return {
-                        "success": 1,
-                        "dolibarr_version": "API Working",
-                        "api_version": "1.0"
-                    }
-            except:
-                raise DolibarrAPIError("Cannot connect to Dolibarr API. Please check your configuration.")
+                result = await self.request("GET", endpoint)
+            except DolibarrAPIError:
+                continue
+            if endpoint == "status":
+                status = result
+            elif endpoint == "setup/modules" and result:
+                status = {
+                    "success": 1,
+                    "dolibarr_version": "Connected",
+                    "api_version": "1.0",
+                    "modules_available": isinstance(result, (list, dict))
+                }
+            elif endpoint.startswith("users") and result is not None:
+                status = {
+                    "success": 1,
+                    "dolibarr_version": "API Working",
+                    "api_version": "1.0"
+                }
+            else:
+                continue
+            self.capability_cache.status_endpoint = endpoint
+            return status
+        raise DolibarrAPIError("Cannot connect to Dolibarr API. Please check your configuration.")
+
+    async def capabilities(self, refresh: bool = False) -> Capabilities:
+        """Optional API features of the backend, probed once per cache TTL."""
+        return await self.capability_cache.get(self, refresh=refresh)
     
     # ============================================================================
     # USER MANAGEMENT
@@ -342,11 +552,16 @@ class DolibarrClient:
         result = await self.request("GET", "products", params=params)
         return result if isinstance(result, list) else []
 
-    async def get_products(self, limit: int = 100, page: int = 0, category_id: Optional[int] = None) -> List[Dict[str, Any]]:
+    async def get_products(
+        self,
+        limit: int = 100,
+        page: int = 0,
+        category_id: Optional[int] = None,
+        sortfield: Optional[str] = None,
+        sortorder: Optional[str] = None,
+    ) -> List[Dict[str, Any]]:
         """Get list of products."""
-        params = {"limit": limit}
-        if page > 0:
-            params["page"] = page
+        params = self._list_params(limit, page, sortfield=sortfield, sortorder=sortorder)
         if category_id:
             params["category"] = category_id
             
@@ -385,9 +600,19 @@ class DolibarrClient:
     # INVOICE MANAGEMENT
     # ============================================================================
     
-    async def get_invoices(self, limit: int = 100, status: Optional[str] = None) -> List[Dict[str, Any]]:
+    async def get_invoices(
+        self,
+        limit: int = 100,
+        status: Optional[str] = None,
+        *,
+        page: int = 0,
+        sqlfilters: Optional[str] = None,
+        thirdparty_ids: Optional[str] = None,
+        sortfield: Optional[str] = None,
+        sortorder: Optional[str] = None,
+    ) -> List[Dict[str, Any]]:
         """Get list of invoices."""
-        params = {"limit": limit}
+        params = self._list_params(limit, page, sqlfilters, thirdparty_ids, sortfield, sortorder)
         if status:
             params["status"] = status
         
@@ -477,20 +702,63 @@ class DolibarrClient:
     async def add_payment_to_invoice(self, invoice_id: int, data: Dict[str, Any]) -> Dict[str, Any]:
         """Add a payment to an invoice."""
         return await self.request("POST", f"invoices/{invoice_id}/payments", data=data)
-    
+
+    async def create_invoice_from_order(self, order_id: int) -> Any:
+        """Create a draft invoice from an order and return its ID.
+
+        Uses ``invoices/createfromorder`` when the backend supports it and
+        otherwise copies the order header and lines client-side.
+        """
+        capabilities = await self.capabilities()
+        if capabilities.createfromorder:
+            result = await self.request("POST", f"invoices/createfromorder/{order_id}", data={})
+            return self._extract_identifier(result)
+
+        order = await self.get_order_by_id(order_id)
+        lines = [
+            {key: line[key] for key in ORDER_LINE_FIELDS if line.get(key) is not None}
+            for line in order.get("lines") or []
+        ]
+        payload = {
+            "socid": order["socid"],
+            "type": 0,
+            "origin": "commande",
+            "originid": order_id,
+        }
+        if order.get("fk_project"):
+            payload["fk_project"] = order["fk_project"]
+        if capabilities.lines_in_post:
+            return await self.create_invoice(payload, lines=lines)
+
+        note_items("lines", len(lines))
+        invoice_id = await self.create_invoice(payload)
+        try:
+            for line in lines:
+                await self.add_invoice_line(invoice_id, line)
+        except Exception:
+            await self.delete_invoice(invoice_id)
+            raise
+        return invoice_id
+
     # ============================================================================
     # PROPOSAL MANAGEMENT
     # ============================================================================
     
-    async def get_proposals(self, limit: int = 100, status: Optional[str] = None, sqlfilters: Optional[str] = None, thirdparty_ids: Optional[str] = None) -> List[Dict[str, Any]]:
+    async def get_proposals(
+        self,
+        limit: int = 100,
+        status: Optional[str] = None,
+        sqlfilters: Optional[str] = None,
+        thirdparty_ids: Optional[str] = None,
+        *,
+        page: int = 0,
+        sortfield: Optional[str] = None,
+        sortorder: Optional[str] = None,
+    ) -> List[Dict[str, Any]]:
         """Get list of proposals."""
-        params = {"limit": limit}
+        params = self._list_params(limit, page, sqlfilters, thirdparty_ids, sortfield, sortorder)
         if status:
             params["status"] = status
-        if sqlfilters:
-            params["sqlfilters"] = sqlfilters
-        if thirdparty_ids:
-            params["thirdparty_ids"] = thirdparty_ids
         
         result = await self.request("GET", "proposals", params=params)
         return result if isinstance(result, list) else []
@@ -572,9 +840,19 @@ class DolibarrClient:
     # ORDER MANAGEMENT
     # ============================================================================
     
-    async def get_orders(self, limit: int = 100, status: Optional[str] = None) -> List[Dict[str, Any]]:
+    async def get_orders(
+        self,
+        limit: int = 100,
+        status: Optional[str] = None,
+        *,
+        page: int = 0,
+        sqlfilters: Optional[str] = None,
+        thirdparty_ids: Optional[str] = None,
+        sortfield: Optional[str] = None,
+        sortorder: Optional[str] = None,
+    ) -> List[Dict[str, Any]]:
         """Get list of orders."""
-        params = {"limit": limit}
+        params = self._list_params(limit, page, sqlfilters, thirdparty_ids, sortfield, sortorder)
         if status:
             params["status"] = status
         
@@ -713,3 +991,39 @@ class DolibarrClient:
     ) -> Dict[str, Any]:
         """Make raw API call to any Dolibarr endpoint."""
         return await self.request(method, endpoint, params=params, data=data)
+
+
+class EntityClient(DolibarrClient):
+    """Client scoped to one Multicompany entity.
+
+    Shares the session (and so the connection pool), transport and metrics of
+    its parent: ``DOLAPIENTITY`` is a per-request header, so entities need no
+    connections of their own. Capabilities are cached per entity because
+    modules are enabled per entity.
+    """
+
+    def __init__(self, parent: DolibarrClient, entity: int):
+        self.parent = parent
+        super().__init__(
+            parent.config,
+            transport=parent.transport,
+            capability_cache=CapabilityCache(ttl=parent.capability_cache.ttl),
+            entity=entity,
+            count_max_rows=parent.count_max_rows,
+            owns_transport=False,
+        )
+        self.metrics = parent.metrics
+
+    @property
+    def session(self) -> Optional[ClientSession]:
+        return self.parent.session
+
+    @session.setter
+    def session(self, value: Optional[ClientSession]) -> None:
+        """The session belongs to the parent client."""
+
+    async def start_session(self):
+        await self.parent.start_session()
+
+    async def close_session(self):
+        """Nothing to close: the parent owns the session and transport."""
@@ -0,0 +1,745 @@
+"""Local stand-in for the Dolibarr REST API.
+
+An ``aiohttp.web`` application that implements the endpoints used by
+:class:`~dolibarr_mcp.dolibarr_client.DolibarrClient` against an in-memory,
+deterministically seeded dataset. It exists so performance work can measure
+real HTTP, JSON and validation cost on a laptop without a Dolibarr instance:
+
+* list endpoints with ``limit``/``page``, ``sortfield``/``sortorder`` (comma
+  separated), ``sqlfilters`` (USF), ``properties``, ``pagination_data``,
+  ``thirdparty_ids`` and the invoice ``status`` names
+* CRUD for thirdparties, products, invoices, orders, proposals, projects,
+  contacts and users, document line endpoints, ``validate``, invoice
+  ``payments``, proposal ``convert`` / ``orders/createfromproposal`` and
+  ``invoices/createfromorder``
+* Multicompany: a ``DOLAPIENTITY`` header limits lists to the rows of that
+  entity (rows without an ``entity`` belong to entity 1)
+* injected latency (fixed plus uniform jitter) per request
+
+Start it with ``dolibarr-mcp fake-server`` or, in tests and benchmarks, with
+:func:`serve_fake_dolibarr`. It is a test double: validation rules, numbering
+and permissions are simplified.
+"""
+
+import asyncio
+import random
+import re
+import time
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, fields
+from datetime import datetime, timezone
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional, Tuple
+
+from aiohttp import web
+
+API_PREFIX = "/api/index.php"
+DOLIBARR_VERSION = "20.0.0"
+
+Row = Dict[str, Any]
+Predicate = Callable[[Row], bool]
+
+
+# ============================================================================
+# USF (sqlfilters) PARSER
+# ============================================================================
+
+class USFSyntaxError(ValueError):
+    """Malformed ``sqlfilters`` expression."""
+
+
+# Columns whose USF values are dates, stored as unix timestamps in rows.
+DATE_COLUMNS = {"datef", "date_commande", "datep", "tms", "datec", "date_creation", "date_modification", "date"}
+
+# USF column -> row key, where they differ.
+COLUMN_ALIASES = {
+    "rowid": "id",
+    "fk_soc": "socid",
+    "fk_statut": "status",
+    "statut": "status",
+    "tms": "date_modification",
+    "datec": "date_creation",
+    "datef": "date",
+    "datep": "date",
+    "fk_projet": "fk_project",
+}
+
+_PREDICATE = re.compile(
+    r"\(\s*(?P<field>[A-Za-z_][\w.]*)\s*:\s*"
+    r"(?:(?P<op>!=|<>|<=|>=|=|<|>|notlike|like|notin|in|isnot|is)\s*:\s*)?"
+    r"(?P<value>'(?:[^'\\]|\\.)*'|\([^)]*\)|[^()]*?)\s*\)",
+    re.IGNORECASE,
+)
+_KEYWORD = re.compile(r"\s*(and|or)(?=[\s(])", re.IGNORECASE)
+
+
+def _parse_scalar(text: str) -> Any:
+    text = text.strip()
+    if text.startswith("'") and text.endswith("'") and len(text) >= 2:
+        return re.sub(r"\\(.)", r"\1", text[1:-1])
+    if text.upper() == "NULL":
+        return None
+    try:
+        return int(text)
+    except ValueError:
+        pass
+    try:
+        return float(text)
+    except ValueError:
+        return text
+
+
+def _to_timestamp(value: Any) -> Any:
+    if isinstance(value, str):
+        try:
+            parsed = datetime.fromisoformat(value.strip())
+        except ValueError:
+            return value
+        if parsed.tzinfo is None:
+            parsed = parsed.replace(tzinfo=timezone.utc)
+        return int(parsed.timestamp())
+    return value
+
+
+def _as_number(value: Any) -> Optional[float]:
+    if isinstance(value, bool) or value is None:
+        return None
+    if isinstance(value, (int, float)):
+        return float(value)
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _compare(left: Any, op: str, right: Any) -> bool:
+    if left is None or right is None:
+        return False
+    a, b = _as_number(left), _as_number(right)
+    if a is None or b is None:
+        a, b = str(left).casefold(), str(right).casefold()
+    if op == "=":
+        return a == b
+    if op in ("!=", "<>"):
+        return a != b
+    if op == "<":
+        return a < b
+    if op == "<=":
+        return a <= b
+    if op == ">":
+        return a > b
+    return a >= b
+
+
+def _like_pattern(value: str) -> "re.Pattern[str]":
+    parts = []
+    for char in str(value):
+        if char == "%":
+            parts.append(".*")
+        elif char == "_":
+            parts.append(".")
+        else:
+            parts.append(re.escape(char))
+    return re.compile("^" + "".join(parts) + "$", re.IGNORECASE | re.DOTALL)
+
+
+def _predicate(column: str, op: str, raw_value: str) -> Predicate:
+    column = column.split(".", 1)[-1].lower()
+    key = COLUMN_ALIASES.get(column, column)
+    is_date = column in DATE_COLUMNS
+    op = op.lower()
+
+    if op in ("is", "isnot"):
+        want_null = raw_value.strip().upper() == "NULL"
+        if op == "is":
+            return lambda row: (row.get(key) in (None, "")) == want_null
+        return lambda row: (row.get(key) in (None, "")) != want_null
+
+    if op in ("in", "notin"):
+        inner = raw_value.strip()
+        if inner.startswith("(") and inner.endswith(")"):
+            inner = inner[1:-1]
+        options = [_parse_scalar(part) for part in inner.split(",") if part.strip()]
+        if is_date:
+            options = [_to_timestamp(o) for o in options]
+        def member(row: Row) -> bool:
+            return any(_compare(row.get(key), "=", option) for option in options)
+        return member if op == "in" else (lambda row: not member(row))
+
+    value = _parse_scalar(raw_value)
+    if op in ("like", "notlike"):
+        pattern = _like_pattern(value)
+        def like(row: Row) -> bool:
+            current = row.get(key)
+            return current is not None and pattern.match(str(current)) is not None
+        return like if op == "like" else (lambda row: not like(row))
+
+    if is_date:
+        value = _to_timestamp(value)
+    return lambda row: _compare(row.get(key), op, value)
+
+
+class _USFParser:
+    def __init__(self, text: str):
+        self.text = text
+        self.pos = 0
+
+    def parse(self) -> Predicate:
+        predicate = self._or()
+        if self.text[self.pos:].strip():
+            raise USFSyntaxError(f"Unexpected input at {self.pos}: {self.text[self.pos:self.pos + 20]!r}")
+        return predicate
+
+    def _keyword(self, word: str) -> bool:
+        match = _KEYWORD.match(self.text, self.pos)
+        if match and match.group(1).lower() == word:
+            self.pos = match.end()
+            return True
+        return False
+
+    def _or(self) -> Predicate:
+        terms = [self._and()]
+        while self._keyword("or"):
+            terms.append(self._and())
+        if len(terms) == 1:
+            return terms[0]
+        return lambda row: any(term(row) for term in terms)
+
+    def _and(self) -> Predicate:
+        terms = [self._primary()]
+        while self._keyword("and"):
+            terms.append(self._primary())
+        if len(terms) == 1:
+            return terms[0]
+        return lambda row: all(term(row) for term in terms)
+
+    def _primary(self) -> Predicate:
+        while self.pos < len(self.text) and self.text[self.pos].isspace():
+            self.pos += 1
+        match = _PREDICATE.match(self.text, self.pos)
+        if match:
+            self.pos = match.end()
+            # Dolibarr also accepts the short form (field:value) as equality.
+            return _predicate(match.group("field"), match.group("op") or "=", match.group("value"))
+        if self.pos < len(self.text) and self.text[self.pos] == "(":
+            self.pos += 1
+            inner = self._or()
+            while self.pos < len(self.text) and self.text[self.pos].isspace():
+                self.pos += 1
+            if self.pos >= len(self.text) or self.text[self.pos] != ")":
+                raise USFSyntaxError(f"Missing ')' at {self.pos}")
+            self.pos += 1
+            return inner
+        raise USFSyntaxError(f"Expected a filter term at {self.pos}: {self.text[self.pos:self.pos + 20]!r}")
+
+
+def parse_sqlfilters(text: str) -> Predicate:
+    """Compile a USF ``sqlfilters`` expression into a row predicate."""
+    if not text or not text.strip():
+        return lambda row: True
+    return _USFParser(text).parse()
+
+
+# ============================================================================
+# DATASET
+# ============================================================================
+
+@dataclass
+class SeedVolumes:
+    """Number of seeded rows per resource."""
+
+    thirdparties: int = 1000
+    products: int = 500
+    invoices: int = 2000
+    lines_per_invoice: int = 5
+    orders: int = 500
+    proposals: int = 500
+    projects: int = 100
+    contacts: int = 1000
+    users: int = 10
+
+
+# Document line tuple: (line_id, fk_product, qty, subprice, tva_tx)
+Line = Tuple[int, int, float, float, float]
+
+DOCUMENT_RESOURCES = ("invoices", "orders", "proposals")
+RESOURCES = ("thirdparties", "products", "invoices", "orders", "proposals", "projects", "contacts", "users")
+
+_REF_PREFIX = {"invoices": "FA", "orders": "CO", "proposals": "PR"}
+
+
+def _money(value: float) -> str:
+    return f"{value:.8f}"
+
+
+class FakeDolibarr:
+    """In-memory Dolibarr dataset."""
+
+    def __init__(self, volumes: Optional[SeedVolumes] = None, seed: int = 42):
+        self.volumes = volumes or SeedVolumes()
+        self.tables: Dict[str, Dict[int, Row]] = {name: {} for name in RESOURCES}
+        self.lines: Dict[Tuple[str, int], List[Line]] = {}
+        self.next_id: Dict[str, int] = {name: 1 for name in RESOURCES}
+        self.next_line_id = 1
+        self.request_count = 0
+        self._seed(random.Random(seed))
+
+    # -- seeding -----------------------------------------------------------
+
+    def _seed(self, rng: random.Random) -> None:
+        v = self.volumes
+        now = int(time.time())
+        span = 3 * 365 * 86400
+
+        def stamp() -> int:
+            return now - rng.randrange(span)
+
+        for i in range(1, v.users + 1):
+            self._insert("users", {
+                "login": f"user{i}", "lastname": f"Lastname{i}", "firstname": f"First{i}",
+                "email": f"user{i}@example.com", "admin": 1 if i == 1 else 0, "statut": 1,
+                "date_creation": stamp(), "date_modification": stamp(),
+            })
+        for i in range(1, v.thirdparties + 1):
+            self._insert("thirdparties", {
+                "nom": f"Company {i:06d}", "name_alias": f"Co{i}", "code_client": f"CU{i:06d}",
+                "email": f"contact{i}@company{i}.example", "phone": f"+49 30 {i:07d}",
+                "address": f"{rng.randrange(1, 200)} Main Street", "zip": f"{rng.randrange(10000, 99999)}",
+                "town": rng.choice(("Berlin", "Hamburg", "Munich", "Cologne", "Vienna", "Zurich")),
+                "country_code": rng.choice(("DE", "AT", "CH")), "status": 1,
+                "client": rng.choice((1, 1, 3)), "fournisseur": rng.choice((0, 0, 1)),
+                "entity": "1", "date_creation": stamp(), "date_modification": stamp(),
+            })
+        for i in range(1, v.products + 1):
+            price = round(rng.uniform(1, 2000), 2)
+            self._insert("products", {
+                "ref": f"PRD-{i:06d}", "label": f"Product {i} {rng.choice(('Widget', 'Service', 'Part', 'Kit'))}",
+                "description": f"Seeded product number {i}", "type": rng.choice((0, 0, 1)),
+                "price": _money(price), "price_ttc": _money(price * 1.2), "tva_tx": "20.000",
+                "stock_reel": float(rng.randrange(0, 500)), "status": 1, "status_buy": 1,
+                "date_creation": stamp(), "date_modification": stamp(),
+            })
+        customers = max(v.thirdparties, 1)
+        for i in range(1, v.projects + 1):
+            self._insert("projects", {
+                "ref": f"PJ-{i:05d}", "title": f"Project {i}", "socid": rng.randrange(1, customers + 1),
+                "status": rng.choice((0, 1, 1, 2)), "description": f"Seeded project {i}",
+                "date_creation": stamp(), "date_modification": stamp(),
+            })
+        for i in range(1, v.contacts + 1):
+            self._insert("contacts", {
+                "lastname": f"Contact{i}", "firstname": f"Person{i}", "email": f"person{i}@example.com",
+                "socid": rng.randrange(1, customers + 1), "poste": "Buyer", "phone_pro": f"+49 40 {i:07d}",
+                "date_creation": stamp(), "date_modification": stamp(),
+            })
+        for resource, count, statuses in (
+            ("invoices", v.invoices, (0, 1, 1, 2, 2, 2, 3)),
+            ("orders", v.orders, (-1, 0, 1, 2, 3, 3)),
+            ("proposals", v.proposals, (0, 1, 2, 2, 3, 4)),
+        ):
+            for _ in range(count):
+                doc_lines = [
+                    (0, rng.randrange(1, max(v.products, 1) + 1), float(rng.randrange(1, 20)),
+                     round(rng.uniform(1, 500), 2), 20.0)
+                    for _ in range(v.lines_per_invoice)
+                ]
+                row = {
+                    "socid": rng.randrange(1, customers + 1),
+                    "date": stamp(),
+                    "status": rng.choice(statuses),
+                    "fk_project": rng.randrange(1, v.projects + 1) if v.projects and rng.random() < 0.2 else None,
+                }
+                self._create_document(resource, row, doc_lines)
+
+    def _insert(self, resource: str, row: Row) -> Row:
+        row_id = self.next_id[resource]
+        self.next_id[resource] = row_id + 1
+        row["id"] = row_id
+        self.tables[resource][row_id] = row
+        return row
+
+    def _create_document(self, resource: str, row: Row, lines: List[Line]) -> Row:
+        row = self._insert(resource, row)
+        row.setdefault("date_creation", row.get("date") or int(time.time()))
+        row.setdefault("date_modification", row["date_creation"])
+        row.setdefault("status", 0)
+        stored: List[Line] = []
+        for _, product, qty, subprice, vat in lines:
+            stored.append((self.next_line_id, product, qty, subprice, vat))
+            self.next_line_id += 1
+        self.lines[(resource, row["id"])] = stored
+        self._number(resource, row)
+        self.recompute(resource, row)
+        return row
+
+    def _number(self, resource: str, row: Row) -> None:
+        if row["status"] == 0:
+            row["ref"] = f"(PROV{row['id']})"
+        else:
+            stamp = datetime.fromtimestamp(row["date"], timezone.utc)
+            row["ref"] = f"{_REF_PREFIX[resource]}{stamp:%y%m}-{row['id']:05d}"
+        if resource == "invoices":
+            row["paye"] = 1 if row["status"] == 2 else 0
+        if resource == "orders":
+            row["date_commande"] = row["date"]
+        if resource == "proposals":
+            row["datep"] = row["date"]
+        row["statut"] = row["status"]
+
+    def recompute(self, resource: str, row: Row) -> None:
+        ht = sum(qty * price for _, _, qty, price, _ in self.lines.get((resource, row["id"]), ()))
+        tva = sum(qty * price * vat / 100 for _, _, qty, price, vat in self.lines.get((resource, row["id"]), ()))
+        row["total_ht"] = _money(ht)
+        row["total_tva"] = _money(tva)
+        row["total_ttc"] = _money(ht + tva)
+
+    def touch(self, row: Row) -> None:
+        row["date_modification"] = int(time.time())
+
+    # -- rendering -----------------------------------------------------------
+
+    def render_line(self, line: Line) -> Row:
+        line_id, product, qty, subprice, vat = line
+        ht = qty * subprice
+        return {
+            "id": line_id, "rowid": line_id, "fk_product": product, "product_ref": f"PRD-{product:06d}",
+            "desc": f"Product {product}", "description": f"Product {product}", "product_type": 0,
+            "qty": qty, "subprice": _money(subprice), "tva_tx": f"{vat:.3f}",
+            "total_ht": _money(ht), "total_tva": _money(ht * vat / 100), "total_ttc": _money(ht * (1 + vat / 100)),
+        }
+
+    def render(self, resource: str, row: Row, properties: Optional[List[str]] = None) -> Row:
+        if properties:
+            return {key: row.get(key) for key in properties}
+        rendered = dict(row)
+        if resource in DOCUMENT_RESOURCES:
+            rendered["lines"] = [self.render_line(line) for line in self.lines.get((resource, row["id"]), ())]
+        return rendered
+
+    # -- writes --------------------------------------------------------------
+
+    @staticmethod
+    def _parse_line(data: Row) -> Line:
+        return (
+            0,
+            int(data.get("fk_product") or data.get("product_id") or 0),
+            float(data.get("qty") or 1),
+            float(data.get("subprice") or data.get("price") or 0),
+            float(data.get("tva_tx") or 0),
+        )
+
+    def create(self, resource: str, data: Row) -> int:
+        data = dict(data)
+        if resource in DOCUMENT_RESOURCES:
+            lines = [self._parse_line(line) for line in data.pop("lines", None) or []]
+            if resource == "orders" and "date_commande" in data:
+                data["date"] = data.pop("date_commande")
+            if isinstance(data.get("date"), str):
+                data["date"] = _to_timestamp(data["date"])
+            data.setdefault("date", int(time.time()))
+            data["status"] = 0
+            data["socid"] = int(data.get("socid") or 0)
+            return self._create_document(resource, data, lines)["id"]
+        data["date_creation"] = data["date_modification"] = int(time.time())
+        return self._insert(resource, data)["id"]
+
+    def update(self, resource: str, row: Row, data: Row) -> Row:
+        for key, value in data.items():
+            if key not in ("id", "lines"):
+                row[key] = value
+        self.touch(row)
+        return row
+
+    def add_line(self, resource: str, row: Row, data: Row) -> int:
+        line = self._parse_line(data)
+        line_id = self.next_line_id
+        self.next_line_id += 1
+        self.lines.setdefault((resource, row["id"]), []).append((line_id,) + line[1:])
+        self.recompute(resource, row)
+        self.touch(row)
+        return line_id
+
+    def find_line(self, resource: str, row: Row, line_id: int) -> Optional[int]:
+        for index, line in enumerate(self.lines.get((resource, row["id"]), ())):
+            if line[0] == line_id:
+                return index
+        return None
+
+    def validate(self, resource: str, row: Row) -> Row:
+        if row["status"] == 0:
+            row["status"] = 1
+            self._number(resource, row)
+            self.touch(row)
+        return row
+
+    def convert(self, source: str, row: Row, target: str) -> int:
+        lines = list(self.lines.get((source, row["id"]), ()))
+        new = self._create_document(target, {
+            "socid": row["socid"], "date": int(time.time()), "status": 0, "fk_project": row.get("fk_project"),
+        }, lines)
+        return new["id"]
+
+
+# ============================================================================
+# HTTP LAYER
+# ============================================================================
+
+_INVOICE_STATUS = {"draft": (0,), "unpaid": (1,), "paid": (2,), "cancelled": (3,)}
+
+_STATUS_URL = "/api/status"
+
+
+def _error(status: int, message: str) -> web.Response:
+    return web.json_response({"error": {"code": status, "message": message}}, status=status)
+
+
+def _sort_key(key: str) -> Callable[[Row], Any]:
+    def extract(row: Row) -> Any:
+        value = row.get(key)
+        number = _as_number(value)
+        if number is not None:
+            return (0, number, "")
+        return (1 if value is None else 0, 0.0, str(value or "").casefold())
+    return extract
+
+
+@dataclass
+class FakeServerSettings:
+    """Behaviour knobs of the stand-in server."""
+
+    api_key: str = ""
+    latency_ms: float = 0.0
+    jitter_ms: float = 0.0
+    empty_list_404: bool = False
+    max_limit: int = 0  # 0 = no cap, like Dolibarr's API_MAX_LIMIT unset
+
+
+class FakeDolibarrApp:
+    """Routes Dolibarr REST calls to a :class:`FakeDolibarr` dataset."""
+
+    def __init__(self, data: FakeDolibarr, settings: Optional[FakeServerSettings] = None):
+        self.data = data
+        self.settings = settings or FakeServerSettings()
+        self._rng = random.Random()
+
+    def build(self) -> web.Application:
+        app = web.Application(middlewares=[self._middleware])
+        app.router.add_route("*", _STATUS_URL, self._status)
+        app.router.add_route("*", API_PREFIX + "/{path:.*}", self._dispatch)
+        return app
+
+    @web.middleware
+    async def _middleware(self, request: web.Request, handler):
+        self.data.request_count += 1
+        delay = self.settings.latency_ms
+        if self.settings.jitter_ms:
+            delay += self._rng.uniform(0, self.settings.jitter_ms)
+        if delay:
+            await asyncio.sleep(delay / 1000)
+        if self.settings.api_key and request.headers.get("DOLAPIKEY") != self.settings.api_key:
+            return _error(401, "Unauthorized: Access denied")
+        return await handler(request)
+
+    async def _status(self, request: web.Request) -> web.Response:
+        return web.json_response({"success": {"code": 200, "dolibarr_version": DOLIBARR_VERSION, "access_locked": "0"}})
+
+    async def _dispatch(self, request: web.Request) -> web.Response:
+        parts = [p for p in request.match_info["path"].split("/") if p]
+        if not parts:
+            return _error(404, "Not Found")
+        if parts == ["status"]:
+            return await self._status(request)
+        if parts == ["setup", "modules"]:
+            return web.json_response(["societe", "product", "facture", "commande", "propal", "projet", "api"])
+
+        resource = parts[0]
+        if resource not in self.data.tables:
+            return _error(404, f"Not Found: unknown resource {resource}")
+        method = request.method.upper()
+        body: Row = {}
+        if method in ("POST", "PUT") and request.can_read_body:
+            try:
+                parsed = await request.json()
+            except ValueError:
+                return _error(400, "Bad Request: invalid JSON body")
+            body = parsed if isinstance(parsed, dict) else {}
+
+        try:
+            if len(parts) == 1:
+                if method == "GET":
+                    return self._list(resource, request)
+                if method == "POST":
+                    return web.json_response(self.data.create(resource, body))
+                return _error(405, "Method Not Allowed")
+
+            if len(parts) == 3 and parts[1] in ("createfromproposal", "createfromorder"):
+                source = "proposals" if parts[1] == "createfromproposal" else "orders"
+                return self._convert(source, int(parts[2]), resource)
+
+            row_id = int(parts[1])
+            row = self.data.tables[resource].get(row_id)
+            if row is None:
+                return _error(404, f"Not Found: {resource} {row_id} not found")
+
+            if len(parts) == 2:
+                if method == "GET":
+                    return web.json_response(self.data.render(resource, row))
+                if method == "PUT":
+                    return web.json_response(self.data.render(resource, self.data.update(resource, row, body)))
+                if method == "DELETE":
+                    del self.data.tables[resource][row_id]
+                    self.data.lines.pop((resource, row_id), None)
+                    return web.json_response({"success": {"code": 200, "message": "Object deleted"}})
+                return _error(405, "Method Not Allowed")
+
+            action = parts[2]
+            if action == "lines" and resource in DOCUMENT_RESOURCES:
+                return self._lines(resource, row, method, parts[3:], body)
+            if action == "validate" and method == "POST" and resource in DOCUMENT_RESOURCES:
+                return web.json_response(self.data.render(resource, self.data.validate(resource, row)))
+            if action == "payments" and method == "POST" and resource == "invoices":
+                row["status"] = 2
+                row["paye"] = 1
+                row["statut"] = 2
+                self.data.touch(row)
+                return web.json_response(self._rng.randrange(1, 10**6))
+            if action == "convert" and method == "POST" and resource == "proposals":
+                return self._convert("proposals", row_id, "orders")
+            return _error(404, f"Not Found: {request.path}")
+        except ValueError as e:
+            return _error(400, f"Bad Request: {e}")
+
+    def _list(self, resource: str, request: web.Request) -> web.Response:
+        query = request.query
+        rows = list(self.data.tables[resource].values())
+
+        entity = request.headers.get("DOLAPIENTITY")
+        if entity:
+            rows = [r for r in rows if str(r.get("entity", 1)) == entity]
+
+        if resource == "invoices" and query.get("status"):
+            wanted = _INVOICE_STATUS.get(query["status"])
+            if wanted is None:
+                raise ValueError(f"unknown invoice status {query['status']}")
+            rows = [r for r in rows if r["status"] in wanted]
+        if resource == "projects" and query.get("status", "") not in ("", "-1"):
+            rows = [r for r in rows if str(r["status"]) == query["status"]]
+        if query.get("thirdparty_ids"):
+            socids = {int(x) for x in query["thirdparty_ids"].split(",") if x.strip()}
+            rows = [r for r in rows if r.get("socid") in socids]
+        if query.get("sqlfilters"):
+            try:
+                predicate = parse_sqlfilters(query["sqlfilters"])
+            except USFSyntaxError as e:
+                raise ValueError(f"Error when validating parameter sqlfilters -> {e}") from None
+            rows = [r for r in rows if predicate(r)]
+
+        sortfields = [f.strip() for f in query.get("sortfield", "t.rowid").split(",") if f.strip()]
+        sortorders = [o.strip().upper() for o in query.get("sortorder", "ASC").split(",")]
+        for index in range(len(sortfields) - 1, -1, -1):
+            column = sortfields[index].split(".", 1)[-1].lower()
+            order = sortorders[index] if index < len(sortorders) else sortorders[-1]
+            rows.sort(key=_sort_key(COLUMN_ALIASES.get(column, column)), reverse=order == "DESC")
+
+        total = len(rows)
+        limit = int(query.get("limit", 100))
+        if self.settings.max_limit and (limit <= 0 or limit > self.settings.max_limit):
+            limit = self.settings.max_limit
+        page = max(int(query.get("page", 0)), 0)
+        if limit > 0:
+            rows = rows[page * limit:(page + 1) * limit]
+
+        properties = [p.strip() for p in query.get("properties", "").split(",") if p.strip()] or None
+        items = [self.data.render(resource, row, properties) for row in rows]
+
+        if query.get("pagination_data") in ("true", "1"):
+            page_count = (total + limit - 1) // limit if limit > 0 else 1
+            return web.json_response({
+                "data": items,
+                "pagination": {"total": total, "page": page, "page_count": page_count, "limit": limit},
+            })
+        if not items and self.settings.empty_list_404:
+            return _error(404, f"No {resource} found")
+        return web.json_response(items)
+
+    def _lines(self, resource: str, row: Row, method: str, rest: List[str], body: Row) -> web.Response:
+        if not rest:
+            if method == "GET":
+                return web.json_response([self.data.render_line(line) for line in self.data.lines.get((resource, row["id"]), ())])
+            if method == "POST":
+                return web.json_response(self.data.add_line(resource, row, body))
+            return _error(405, "Method Not Allowed")
+
+        line_id = int(rest[0])
+        index = self.data.find_line(resource, row, line_id)
+        if index is None:
+            return _error(404, f"Not Found: line {line_id}")
+        lines = self.data.lines[(resource, row["id"])]
+        if method == "DELETE":
+            lines.pop(index)
+        elif method == "PUT":
+            _, product, qty, subprice, vat = lines[index]
+            lines[index] = (
+                line_id,
+                int(body.get("fk_product", product) or 0),
+                float(body.get("qty", qty)),
+                float(body.get("subprice", subprice)),
+                float(body.get("tva_tx", vat)),
+            )
+        else:
+            return _error(405, "Method Not Allowed")
+        self.data.recompute(resource, row)
+        self.data.touch(row)
+        if method == "DELETE":
+            return web.json_response({"success": {"code": 200, "message": "Line deleted"}})
+        return web.json_response(self.data.render_line(lines[index]))
+
+    def _convert(self, source: str, source_id: int, target: str) -> web.Response:
+        row = self.data.tables[source].get(source_id)
+        if row is None:
+            return _error(404, f"Not Found: {source} {source_id} not found")
+        new_id = self.data.convert(source, row, target)
+        return web.json_response(self.data.render(target, self.data.tables[target][new_id]))
+
+
+def create_app(
+    data: Optional[FakeDolibarr] = None,
+    settings: Optional[FakeServerSettings] = None,
+) -> web.Application:
+    """Build the stand-in application (seeding a default dataset if none is given)."""
+    return FakeDolibarrApp(data or FakeDolibarr(), settings).build()
+
+
+@asynccontextmanager
+async def serve_fake_dolibarr(
+    data: Optional[FakeDolibarr] = None,
+    settings: Optional[FakeServerSettings] = None,
+    host: str = "127.0.0.1",
+    port: int = 0,
+    unix_socket: Optional[str] = None,
+) -> AsyncIterator[str]:
+    """Run the stand-in on the current loop; yields the ``DOLIBARR_URL`` to use.
+
+    With ``unix_socket`` the server listens on that path instead of TCP and
+    the yielded URL is only the logical one (``DOLIBARR_UNIX_SOCKET`` routes
+    the requests).
+    """
+    runner = web.AppRunner(create_app(data, settings), access_log=None)
+    await runner.setup()
+    if unix_socket:
+        site = web.UnixSite(runner, unix_socket)
+        await site.start()
+        url = f"http://{host}{API_PREFIX}"
+    else:
+        site = web.TCPSite(runner, host, port)
+        await site.start()
+        # ``runner.addresses`` reports the port the OS picked for ``port=0``.
+        url = f"http://{host}:{runner.addresses[0][1]}{API_PREFIX}"
+    try:
+        yield url
+    finally:
+        await runner.cleanup()
+
+
+def volume_options() -> List[str]:
+    """Names of the :class:`SeedVolumes` fields (used by the CLI)."""
+    return [f.name for f in fields(SeedVolumes)]
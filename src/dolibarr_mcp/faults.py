@@ -0,0 +1,228 @@
+"""Fault injection between :class:`DolibarrClient` and the backend.
+
+:class:`FaultInjectingTransport` wraps the client's transport and disturbs
+requests according to a :class:`FaultPlan`: added latency drawn from a
+distribution, connection resets, bursts of 5xx responses, slow bodies and
+truncated JSON. Each :class:`FaultRule` targets requests by method and
+endpoint template (``fnmatch`` patterns such as ``invoices/*``), can be
+limited to a time window after the first request, and fires with a given
+probability. A plan is plain JSON::
+
+    {
+      "seed": 7,
+      "rules": [
+        {"endpoint": "*", "latency": {"distribution": "lognormal", "median_ms": 40, "sigma": 0.8}},
+        {"method": "POST", "endpoint": "invoices/*/lines", "probability": 0.05,
+         "status": 503, "burst": 3},
+        {"endpoint": "products", "probability": 0.01, "reset": true, "start_s": 10, "duration_s": 30},
+        {"endpoint": "invoices", "probability": 0.02, "truncate": 0.5}
+      ]
+    }
+
+Load it in a server with ``DOLIBARR_FAULT_PLAN=plan.json`` or pass
+``FaultInjectingTransport(FaultPlan.load(path))`` to a client in tests and
+benchmarks. Injected delays honour the client session's total timeout, so a
+stalled response surfaces as the same timeout error a real one would.
+"""
+
+import asyncio
+import errno
+import fnmatch
+import json
+import random
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+
+import aiohttp
+from aiohttp import ClientSession
+
+from .metrics import normalize_endpoint
+from .transport import Transport, TransportResponse, send_http
+
+DISTRIBUTIONS = ("fixed", "uniform", "normal", "lognormal", "pareto")
+
+
+@dataclass(frozen=True)
+class LatencySpec:
+    """Latency distribution in milliseconds.
+
+    ``fixed`` uses ``ms``; ``uniform`` ``min_ms``..``max_ms``; ``normal``
+    ``mean_ms`` and ``stddev_ms``; ``lognormal`` ``median_ms`` and ``sigma``;
+    ``pareto`` ``min_ms`` and shape ``alpha`` (heavy tail). Samples are capped
+    at ``max_ms`` when it is set for the non-uniform distributions.
+    """
+
+    distribution: str = "fixed"
+    ms: float = 0.0
+    min_ms: float = 0.0
+    max_ms: Optional[float] = None
+    mean_ms: float = 0.0
+    stddev_ms: float = 0.0
+    median_ms: float = 0.0
+    sigma: float = 0.5
+    alpha: float = 2.0
+
+    def __post_init__(self) -> None:
+        if self.distribution not in DISTRIBUTIONS:
+            raise ValueError(f"Unknown latency distribution '{self.distribution}'")
+
+    def sample(self, rng: random.Random) -> float:
+        """Draw one delay in seconds."""
+        if self.distribution == "fixed":
+            value = self.ms
+        elif self.distribution == "uniform":
+            return rng.uniform(self.min_ms, self.max_ms if self.max_ms is not None else self.min_ms) / 1000
+        elif self.distribution == "normal":
+            value = rng.gauss(self.mean_ms, self.stddev_ms)
+        elif self.distribution == "lognormal":
+            value = self.median_ms * rng.lognormvariate(0.0, self.sigma)
+        else:
+            value = self.min_ms * rng.paretovariate(self.alpha)
+        if self.max_ms is not None:
+            value = min(value, self.max_ms)
+        return max(value, 0.0) / 1000
+
+
+@dataclass
+class FaultRule:
+    """Faults applied to the requests that match ``method`` and ``endpoint``."""
+
+    endpoint: str = "*"
+    method: str = "*"
+    probability: float = 1.0
+    start_s: float = 0.0
+    duration_s: Optional[float] = None
+    latency: Optional[LatencySpec] = None
+    reset: bool = False
+    status: Optional[int] = None
+    burst: int = 1
+    slow_body_ms: float = 0.0
+    truncate: Optional[float] = None
+    _burst_left: int = field(default=0, init=False, repr=False)
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "FaultRule":
+        data = dict(data)
+        latency = data.pop("latency", None)
+        rule = cls(**data, latency=LatencySpec(**latency) if latency else None)
+        if not 0 <= rule.probability <= 1:
+            raise ValueError("Fault probability must be between 0 and 1")
+        if rule.truncate is not None and not 0 <= rule.truncate < 1:
+            raise ValueError("truncate is the kept fraction of the body, between 0 and 1")
+        return rule
+
+    def matches(self, method: str, endpoint: str, elapsed: float) -> bool:
+        if elapsed < self.start_s:
+            return False
+        if self.duration_s is not None and elapsed >= self.start_s + self.duration_s:
+            return False
+        if self.method != "*" and self.method.upper() != method.upper():
+            return False
+        return fnmatch.fnmatchcase(endpoint, self.endpoint) or fnmatch.fnmatchcase(
+            normalize_endpoint(endpoint), self.endpoint
+        )
+
+    def fires(self, rng: random.Random) -> bool:
+        """Decide whether this request is hit; an active burst always is."""
+        if self._burst_left > 0:
+            self._burst_left -= 1
+            return True
+        if rng.random() < self.probability:
+            self._burst_left = max(self.burst - 1, 0)
+            return True
+        return False
+
+
+@dataclass
+class FaultPlan:
+    """Ordered fault rules plus the seed of their random draws."""
+
+    rules: List[FaultRule] = field(default_factory=list)
+    seed: Optional[int] = None
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "FaultPlan":
+        return cls(rules=[FaultRule.from_dict(rule) for rule in data.get("rules", [])], seed=data.get("seed"))
+
+    @classmethod
+    def load(cls, path: str) -> "FaultPlan":
+        with open(path, encoding="utf-8") as fh:
+            return cls.from_dict(json.load(fh))
+
+
+class FaultInjectingTransport(Transport):
+    """Apply a fault plan on top of another transport (plain HTTP by default)."""
+
+    def __init__(self, plan: FaultPlan, inner: Optional[Transport] = None) -> None:
+        self.plan = plan
+        self.inner = inner
+        self.rng = random.Random(plan.seed)
+        self.injected: Dict[str, int] = {}
+        self._started: Optional[float] = None
+
+    def _count(self, kind: str) -> None:
+        self.injected[kind] = self.injected.get(kind, 0) + 1
+
+    @staticmethod
+    async def _delay(session: Optional[ClientSession], seconds: float, waited: float) -> None:
+        """Sleep, raising the session's timeout error if the total budget runs out."""
+        total = getattr(getattr(session, "timeout", None), "total", None)
+        if isinstance(total, (int, float)) and waited + seconds >= total:
+            await asyncio.sleep(max(total - waited, 0.0))
+            raise aiohttp.ServerTimeoutError(f"Timeout after {total} s (injected delay)")
+        await asyncio.sleep(seconds)
+
+    async def send(
+        self,
+        session: ClientSession,
+        method: str,
+        endpoint: str,
+        url: str,
+        kwargs: Dict[str, Any],
+    ) -> TransportResponse:
+        now = time.monotonic()
+        if self._started is None:
+            self._started = now
+        elapsed = now - self._started
+        rules = [
+            rule for rule in self.plan.rules
+            if rule.matches(method, endpoint.strip("/"), elapsed) and rule.fires(self.rng)
+        ]
+
+        waited = 0.0
+        for rule in rules:
+            if rule.latency is not None:
+                delay = rule.latency.sample(self.rng)
+                self._count("latency")
+                await self._delay(session, delay, waited)
+                waited += delay
+
+        for rule in rules:
+            if rule.reset:
+                self._count("reset")
+                raise aiohttp.ClientOSError(errno.ECONNRESET, "Connection reset by peer (injected)")
+            if rule.status is not None:
+                self._count(f"status_{rule.status}")
+                body = json.dumps({"error": {"code": rule.status, "message": "Injected fault"}})
+                return TransportResponse(rule.status, "Injected Fault", body)
+
+        if self.inner is not None:
+            response = await self.inner.send(session, method, endpoint, url, kwargs)
+        else:
+            response = await send_http(session, method, url, kwargs)
+
+        for rule in rules:
+            if rule.slow_body_ms:
+                self._count("slow_body")
+                await self._delay(session, rule.slow_body_ms / 1000, waited)
+                waited += rule.slow_body_ms / 1000
+            if rule.truncate is not None and response.text:
+                self._count("truncate")
+                cut = int(len(response.text) * rule.truncate)
+                response = TransportResponse(response.status, response.reason, response.text[:cut])
+        return response
+
+    async def close(self) -> None:
+        if self.inner is not None:
+            await self.inner.close()
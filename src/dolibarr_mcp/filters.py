@@ -0,0 +1,329 @@
+"""Universal Search Filter (USF) builders and typed filter compilation.
+
+Dolibarr evaluates ``sqlfilters`` in the database, so every filter that can be
+expressed in USF should be pushed down instead of fetching rows and filtering
+them in Python. The builders here produce the individual ``(field:op:value)``
+terms; :func:`compile_document_filter` turns a typed :class:`DocumentFilter`
+into the ``sqlfilters``/``sortfield``/``sortorder`` triple for invoices, orders
+and proposals, and :func:`build_changed_since_filter` selects rows modified
+after a :class:`Watermark` for the delta tools.
+
+See: docs/developer/DOLIBARR_USF_SYNTAX.md
+"""
+
+import re
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta
+from typing import Any, Dict, Iterable, Literal, Optional
+from zoneinfo import ZoneInfo
+
+SortKey = Literal["date", "amount", "ref", "id"]
+SortOrder = Literal["asc", "desc"]
+
+
+def sanitize_search(s: str) -> str:
+    """Sanitize search input to prevent SQL injection."""
+    s = s.strip()
+    s = re.sub(r"[^0-9A-Za-z äöüÄÖÜß._\-@/+,&#()]", "", s)
+    return s[:80]
+
+
+def build_usf_like_filter(field: str, value: str) -> str:
+    """Build a Universal Search Filter (USF) like-filter.
+
+    Format: (field:like:'%value%')
+
+    Args:
+        field: Database field with table alias (e.g., 't.ref', 't.title')
+        value: Search value (will be wrapped in wildcards)
+
+    Returns:
+        USF-formatted filter string
+    """
+    return f"({field}:like:'%{value}%')"
+
+
+def build_usf_prefix_filter(field: str, value: str) -> str:
+    """Build a USF like-filter anchored at the start of the value.
+
+    Format: (field:like:'value%')
+    """
+    return f"({field}:like:'{value}%')"
+
+
+def build_usf_eq_filter(field: str, value: int | str) -> str:
+    """Build a Universal Search Filter (USF) equality filter.
+
+    Format: (field:=:value)
+
+    Args:
+        field: Database field with table alias (e.g., 't.fk_soc')
+        value: Exact value (int or str, will not be quoted)
+
+    Returns:
+        USF-formatted filter string
+    """
+    return f"({field}:=:{value})"
+
+
+def build_usf_compare_filter(field: str, operator: str, value: int | float | str) -> str:
+    """Build a USF comparison filter (``<``, ``<=``, ``>``, ``>=``).
+
+    Strings (dates, datetimes) are quoted, numbers are not.
+
+    Format: (field:>=:1000) or (field:>=:'2025-01-01')
+    """
+    if operator not in {"<", "<=", ">", ">="}:
+        raise ValueError(f"Unsupported USF operator: {operator}")
+    rendered = f"'{value}'" if isinstance(value, str) else value
+    return f"({field}:{operator}:{rendered})"
+
+
+def combine_filters(filters: Iterable[Optional[str]]) -> Optional[str]:
+    """Join USF terms with ``and``; returns None when there is nothing to join."""
+    terms = [f for f in filters if f]
+    return " and ".join(terms) if terms else None
+
+
+def parse_date(value: str, name: str = "date") -> date:
+    """Parse a ``YYYY-MM-DD`` string, rejecting anything else."""
+    try:
+        return date.fromisoformat(value)
+    except (TypeError, ValueError):
+        raise ValueError(f"{name} must be a date in YYYY-MM-DD format, got {value!r}") from None
+
+
+# Proposal status names accepted by the tools, mapped to llx_propal.fk_statut.
+PROPOSAL_STATUS_CODES: Dict[str, int] = {
+    "draft": 0,
+    "open": 1,
+    "validated": 1,
+    "signed": 2,
+    "declined": 3,
+    "notsigned": 3,
+    "billed": 4,
+}
+
+
+def proposal_status_code(status: str) -> int:
+    """Map a proposal status name (or numeric string) to its fk_statut code."""
+    key = status.strip().lower()
+    if key.isdigit():
+        return int(key)
+    try:
+        return PROPOSAL_STATUS_CODES[key]
+    except KeyError:
+        known = ", ".join(PROPOSAL_STATUS_CODES)
+        raise ValueError(f"Unknown proposal status '{status}' (expected one of: {known})") from None
+
+
+# Order status names accepted by the tools, mapped to llx_commande.fk_statut.
+ORDER_STATUS_CODES: Dict[str, int] = {
+    "canceled": -1,
+    "draft": 0,
+    "validated": 1,
+    "in_progress": 2,
+    "delivered": 3,
+}
+
+
+def order_status_code(status: str) -> int:
+    """Map an order status name (or numeric string) to its fk_statut code."""
+    key = status.strip().lower()
+    if key.lstrip("-").isdigit():
+        return int(key)
+    try:
+        return ORDER_STATUS_CODES[key]
+    except KeyError:
+        known = ", ".join(ORDER_STATUS_CODES)
+        raise ValueError(f"Unknown order status '{status}' (expected one of: {known})") from None
+
+
+# Product columns the product list tools can sort by.
+PRODUCT_SORT_COLUMNS: Dict[str, str] = {
+    "ref": "t.ref",
+    "label": "t.label",
+    "price": "t.price",
+    "date": "t.datec",
+    "id": "t.rowid",
+}
+
+
+@dataclass(frozen=True)
+class DocumentColumns:
+    """USF column names of a Dolibarr document table."""
+
+    date: str
+    customer: str = "t.fk_soc"
+    amount: str = "t.total_ttc"
+    ref: str = "t.ref"
+    project: str = "t.fk_projet"
+    status: str = "t.fk_statut"
+    id: str = "t.rowid"
+
+
+DOCUMENT_COLUMNS: Dict[str, DocumentColumns] = {
+    "invoices": DocumentColumns(date="t.datef"),
+    "orders": DocumentColumns(date="t.date_commande"),
+    "proposals": DocumentColumns(date="t.datep"),
+}
+
+
+@dataclass
+class DocumentFilter:
+    """Typed filters shared by the invoice, order and proposal list tools."""
+
+    date_from: Optional[str] = None
+    date_to: Optional[str] = None
+    customer_id: Optional[int] = None
+    min_total_ttc: Optional[float] = None
+    max_total_ttc: Optional[float] = None
+    ref_prefix: Optional[str] = None
+    project_id: Optional[int] = None
+    status: Optional[int] = None
+    sort_by: Optional[SortKey] = None
+    sort_order: SortOrder = "desc"
+
+
+@dataclass(frozen=True)
+class CompiledQuery:
+    """Query parameters produced by :func:`compile_document_filter`."""
+
+    sqlfilters: Optional[str] = None
+    sortfield: Optional[str] = None
+    sortorder: Optional[str] = None
+
+
+def compile_document_filter(document: str, spec: DocumentFilter) -> CompiledQuery:
+    """Translate typed document filters into one USF expression plus sorting.
+
+    Args:
+        document: One of ``invoices``, ``orders`` or ``proposals``
+        spec: Filters to apply; unset fields are ignored
+
+    Returns:
+        The compiled ``sqlfilters``/``sortfield``/``sortorder`` values
+
+    Raises:
+        ValueError: On unknown documents, malformed dates or inverted ranges
+    """
+    try:
+        columns = DOCUMENT_COLUMNS[document]
+    except KeyError:
+        raise ValueError(f"Filter pushdown is not available for '{document}'") from None
+
+    terms = []
+    if spec.date_from:
+        terms.append(build_usf_compare_filter(columns.date, ">=", parse_date(spec.date_from, "date_from").isoformat()))
+    if spec.date_to:
+        # Upper bound is inclusive; compare against the next day so datetime columns match too.
+        upper = parse_date(spec.date_to, "date_to") + timedelta(days=1)
+        terms.append(build_usf_compare_filter(columns.date, "<", upper.isoformat()))
+    if spec.date_from and spec.date_to and parse_date(spec.date_from) > parse_date(spec.date_to):
+        raise ValueError("date_from must not be after date_to")
+
+    if spec.customer_id:
+        terms.append(build_usf_eq_filter(columns.customer, int(spec.customer_id)))
+    if spec.min_total_ttc is not None:
+        terms.append(build_usf_compare_filter(columns.amount, ">=", float(spec.min_total_ttc)))
+    if spec.max_total_ttc is not None:
+        terms.append(build_usf_compare_filter(columns.amount, "<=", float(spec.max_total_ttc)))
+    if (
+        spec.min_total_ttc is not None
+        and spec.max_total_ttc is not None
+        and spec.min_total_ttc > spec.max_total_ttc
+    ):
+        raise ValueError("min_total_ttc must not exceed max_total_ttc")
+
+    if spec.ref_prefix:
+        ref = sanitize_search(spec.ref_prefix)
+        if ref:
+            terms.append(build_usf_prefix_filter(columns.ref, ref))
+    if spec.project_id:
+        terms.append(build_usf_eq_filter(columns.project, int(spec.project_id)))
+    if spec.status is not None:
+        terms.append(build_usf_eq_filter(columns.status, int(spec.status)))
+
+    sortfield = sortorder = None
+    if spec.sort_by:
+        sort_columns = {
+            "date": columns.date,
+            "amount": columns.amount,
+            "ref": columns.ref,
+            "id": columns.id,
+        }
+        sortfield = sort_columns[spec.sort_by]
+        sortorder = spec.sort_order.upper()
+        if spec.sort_by in ("date", "amount"):
+            # Ties on date/amount are common; the row id keeps top-N and paging stable.
+            sortfield = f"{sortfield},{columns.id}"
+            sortorder = f"{sortorder},{sortorder}"
+
+    return CompiledQuery(
+        sqlfilters=combine_filters(terms),
+        sortfield=sortfield,
+        sortorder=sortorder,
+    )
+
+
+@dataclass(frozen=True)
+class Watermark:
+    """Position in a ``(t.tms, t.rowid)`` ordered change feed.
+
+    ``modified`` is a naive datetime in the Dolibarr database timezone, which is
+    how ``t.tms`` is compared inside ``sqlfilters``.
+    """
+
+    modified: datetime
+    last_id: int = 0
+
+    def encode(self) -> str:
+        """Render the watermark as ``YYYY-MM-DD HH:MM:SS|rowid``."""
+        return f"{self.modified:%Y-%m-%d %H:%M:%S}|{self.last_id}"
+
+
+def parse_watermark(value: str, tz: ZoneInfo) -> Watermark:
+    """Parse a watermark or a plain ``since`` value.
+
+    Accepts a previous watermark (``2025-01-31 12:00:00|42``), a date, an ISO
+    datetime (timezone-aware values are converted to ``tz``) or a unix timestamp.
+    """
+    text = value.strip()
+    stamp, sep, last_id = text.partition("|")
+    try:
+        if stamp.isdigit():
+            modified = datetime.fromtimestamp(int(stamp), tz)
+        else:
+            modified = datetime.fromisoformat(stamp)
+        if modified.tzinfo is not None:
+            modified = modified.astimezone(tz).replace(tzinfo=None)
+        return Watermark(modified.replace(microsecond=0), int(last_id) if sep else 0)
+    except ValueError:
+        raise ValueError(
+            f"since must be a date, ISO datetime, unix timestamp or watermark, got {value!r}"
+        ) from None
+
+
+def watermark_from_row(row: Dict[str, Any], tz: ZoneInfo) -> Optional[Watermark]:
+    """Build the watermark pointing just after a returned row."""
+    stamp = row.get("date_modification") or row.get("tms")
+    if stamp in (None, ""):
+        return None
+    try:
+        modified = datetime.fromtimestamp(int(stamp), tz).replace(tzinfo=None)
+    except (TypeError, ValueError):
+        return None
+    return Watermark(modified, int(row.get("id") or 0))
+
+
+def build_changed_since_filter(watermark: Watermark) -> str:
+    """Build the USF filter selecting rows modified after a watermark."""
+    stamp = f"{watermark.modified:%Y-%m-%d %H:%M:%S}"
+    if not watermark.last_id:
+        return build_usf_compare_filter("t.tms", ">=", stamp)
+    # Rows sharing the watermark second are continued by rowid so nothing is skipped.
+    newer = build_usf_compare_filter("t.tms", ">", stamp)
+    same_stamp = build_usf_eq_filter("t.tms", f"'{stamp}'")
+    after_id = build_usf_compare_filter("t.rowid", ">", watermark.last_id)
+    same_second = f"({same_stamp} and {after_id})"
+    return f"({newer} or {same_second})"
@@ -0,0 +1,328 @@
+"""Load generator for end-to-end throughput of the MCP server.
+
+``dolibarr-mcp bench`` launches the server (stdio or HTTP transport) against a
+Dolibarr backend, the local stand-in server by default, and runs N simulated
+agents that each call tools drawn from a weighted scenario mix. The report has
+throughput, per-tool latency percentiles and error counts, and the Dolibarr
+requests the server made, taken from ``get_server_metrics`` before and after
+the run.
+
+A scenario is a JSON file::
+
+    {
+      "name": "mixed",
+      "agents": 8,
+      "duration_seconds": 30,
+      "think_time_ms": 0,
+      "calls": [
+        {"tool": "resolve_product_ref", "weight": 5,
+         "arguments": [{"ref": "PRD-000001"}, {"ref": "PRD-000042"}]},
+        {"tool": "get_invoices", "weight": 1, "arguments": {"limit": 50}}
+      ]
+    }
+
+``arguments`` is one argument dict or a list to pick from at random.
+``calls_per_agent`` may replace ``duration_seconds`` for a fixed amount of work.
+"""
+
+import asyncio
+import json
+import os
+import random
+import socket
+import statistics
+import subprocess
+import sys
+import time
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional, Union
+
+ArgumentSet = Dict[str, Any]
+
+
+@dataclass
+class ToolCallSpec:
+    """One entry of the scenario mix."""
+
+    tool: str
+    weight: float = 1.0
+    arguments: List[ArgumentSet] = field(default_factory=lambda: [{}])
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "ToolCallSpec":
+        arguments: Union[ArgumentSet, List[ArgumentSet]] = data.get("arguments") or {}
+        if isinstance(arguments, dict):
+            arguments = [arguments]
+        if data.get("weight", 1.0) <= 0:
+            raise ValueError(f"Weight of '{data['tool']}' must be positive")
+        return cls(tool=data["tool"], weight=float(data.get("weight", 1.0)), arguments=list(arguments) or [{}])
+
+
+@dataclass
+class Scenario:
+    """Workload definition: agents, run length and the weighted tool mix."""
+
+    calls: List[ToolCallSpec]
+    name: str = "scenario"
+    agents: int = 4
+    duration_seconds: Optional[float] = 10.0
+    calls_per_agent: Optional[int] = None
+    think_time_ms: float = 0.0
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "Scenario":
+        calls = [ToolCallSpec.from_dict(entry) for entry in data.get("calls", [])]
+        if not calls:
+            raise ValueError("Scenario has no calls")
+        calls_per_agent = data.get("calls_per_agent")
+        return cls(
+            calls=calls,
+            name=data.get("name", "scenario"),
+            agents=int(data.get("agents", 4)),
+            duration_seconds=None if calls_per_agent else float(data.get("duration_seconds", 10.0)),
+            calls_per_agent=calls_per_agent,
+            think_time_ms=float(data.get("think_time_ms", 0.0)),
+        )
+
+    @classmethod
+    def load(cls, path: str) -> "Scenario":
+        with open(path, encoding="utf-8") as fh:
+            return cls.from_dict(json.load(fh))
+
+    def pick(self, rng: random.Random) -> tuple:
+        spec = rng.choices(self.calls, weights=[c.weight for c in self.calls])[0]
+        return spec.tool, rng.choice(spec.arguments)
+
+
+@dataclass
+class ToolStats:
+    """Client-side latencies and errors of one tool."""
+
+    durations: List[float] = field(default_factory=list)
+    errors: Dict[str, int] = field(default_factory=dict)
+
+    def observe(self, duration: float, error: Optional[str] = None) -> None:
+        self.durations.append(duration)
+        if error:
+            self.errors[error] = self.errors.get(error, 0) + 1
+
+    def summary(self) -> Dict[str, Any]:
+        durations = sorted(self.durations)
+        calls = len(durations)
+        error_count = sum(self.errors.values())
+
+        def pct(q: float) -> float:
+            if not durations:
+                return 0.0
+            return round(durations[min(int(q / 100 * calls), calls - 1)] * 1000, 3)
+
+        return {
+            "calls": calls,
+            "errors": error_count,
+            "error_rate": round(error_count / calls, 4) if calls else 0.0,
+            "error_types": dict(self.errors),
+            "mean_ms": round(statistics.fmean(durations) * 1000, 3) if durations else 0.0,
+            "p50_ms": pct(50),
+            "p95_ms": pct(95),
+            "p99_ms": pct(99),
+            "max_ms": round(durations[-1] * 1000, 3) if durations else 0.0,
+        }
+
+
+async def _agent(
+    client: Any,
+    scenario: Scenario,
+    rng: random.Random,
+    stats: Dict[str, ToolStats],
+    deadline: Optional[float],
+) -> None:
+    done = 0
+    while True:
+        if scenario.calls_per_agent is not None and done >= scenario.calls_per_agent:
+            return
+        if deadline is not None and time.monotonic() >= deadline:
+            return
+        tool, arguments = scenario.pick(rng)
+        error = None
+        started = time.perf_counter()
+        try:
+            await client.call_tool(tool, arguments)
+        except Exception as e:  # every failure is a data point, not a reason to stop
+            error = type(e).__name__
+        stats.setdefault(tool, ToolStats()).observe(time.perf_counter() - started, error)
+        done += 1
+        if scenario.think_time_ms:
+            await asyncio.sleep(scenario.think_time_ms / 1000)
+
+
+async def _backend_metrics(client: Any) -> Optional[Dict[str, Any]]:
+    try:
+        result = await client.call_tool("get_server_metrics", {})
+    except Exception:
+        return None
+    return result.data if isinstance(result.data, dict) else result.structured_content
+
+
+def _backend_delta(before: Optional[Dict[str, Any]], after: Optional[Dict[str, Any]], calls: int) -> Dict[str, Any]:
+    if before is None or after is None:
+        return {"available": False}
+
+    def by_endpoint(snapshot: Dict[str, Any]) -> Dict[str, int]:
+        return {f"{e['method']} {e['endpoint']}": e["requests"] for e in snapshot.get("endpoints", [])}
+
+    start, end = by_endpoint(before), by_endpoint(after)
+    endpoints = {name: end[name] - start.get(name, 0) for name in sorted(end) if end[name] - start.get(name, 0)}
+    requests = after.get("requests", 0) - before.get("requests", 0)
+    return {
+        "available": True,
+        "requests": requests,
+        "errors": after.get("errors", 0) - before.get("errors", 0),
+        "requests_per_call": round(requests / calls, 3) if calls else 0.0,
+        "endpoints": endpoints,
+    }
+
+
+ClientFactory = Callable[[], Any]
+
+
+async def run_load(
+    client_factory: ClientFactory,
+    scenario: Scenario,
+    seed: Optional[int] = None,
+    shared_session: bool = False,
+) -> Dict[str, Any]:
+    """Run ``scenario`` and return the report.
+
+    ``client_factory`` returns an unopened fastmcp ``Client``. Each agent gets
+    its own session unless ``shared_session`` is set (stdio serves exactly
+    one session, so all agents multiplex over it).
+    """
+    rng = random.Random(seed)
+    stats: Dict[str, ToolStats] = {}
+
+    async with client_factory() as control:
+        before = await _backend_metrics(control)
+
+        async def agent(index: int) -> None:
+            agent_rng = random.Random(rng.random())
+            if shared_session:
+                await _agent(control, scenario, agent_rng, stats, deadline)
+                return
+            async with client_factory() as client:
+                await _agent(client, scenario, agent_rng, stats, deadline)
+
+        started = time.monotonic()
+        deadline = started + scenario.duration_seconds if scenario.duration_seconds else None
+        await asyncio.gather(*(agent(i) for i in range(scenario.agents)))
+        elapsed = time.monotonic() - started
+        after = await _backend_metrics(control)
+
+    calls = sum(len(s.durations) for s in stats.values())
+    errors = sum(sum(s.errors.values()) for s in stats.values())
+    return {
+        "scenario": scenario.name,
+        "agents": scenario.agents,
+        "elapsed_seconds": round(elapsed, 3),
+        "calls": calls,
+        "errors": errors,
+        "error_rate": round(errors / calls, 4) if calls else 0.0,
+        "throughput_per_second": round(calls / elapsed, 2) if elapsed else 0.0,
+        "tools": {tool: stats[tool].summary() for tool in sorted(stats)},
+        "backend": _backend_delta(before, after, calls),
+    }
+
+
+def format_report(report: Dict[str, Any]) -> str:
+    """Render a load report as a plain-text table."""
+    lines = [
+        f"Scenario {report['scenario']}: {report['agents']} agents, {report['elapsed_seconds']} s",
+        f"{report['calls']} calls, {report['throughput_per_second']} calls/s, "
+        f"{report['errors']} errors ({report['error_rate']:.2%})",
+        "",
+        f"{'tool':<32} {'calls':>7} {'err':>5} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'max ms':>9}",
+    ]
+    for tool, s in report["tools"].items():
+        lines.append(
+            f"{tool:<32} {s['calls']:>7} {s['errors']:>5} {s['p50_ms']:>9.2f} {s['p95_ms']:>9.2f} "
+            f"{s['p99_ms']:>9.2f} {s['max_ms']:>9.2f}"
+        )
+    backend = report["backend"]
+    lines.append("")
+    if not backend["available"]:
+        lines.append("Backend request counts unavailable (get_server_metrics failed)")
+    else:
+        lines.append(
+            f"Backend: {backend['requests']} requests ({backend['requests_per_call']} per call), "
+            f"{backend['errors']} errors"
+        )
+        for endpoint, count in backend["endpoints"].items():
+            lines.append(f"  {endpoint:<40} {count:>7}")
+    return "\n".join(lines)
+
+
+def free_port(host: str = "127.0.0.1") -> int:
+    with socket.socket() as sock:
+        sock.bind((host, 0))
+        return sock.getsockname()[1]
+
+
+async def _wait_for_port(host: str, port: int, process: subprocess.Popen, timeout: float) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"MCP server exited with code {process.returncode} during startup")
+        try:
+            _, writer = await asyncio.open_connection(host, port)
+        except OSError:
+            await asyncio.sleep(0.1)
+            continue
+        writer.close()
+        await writer.wait_closed()
+        return
+    raise RuntimeError(f"MCP server did not listen on {host}:{port} within {timeout:.0f} s")
+
+
+def server_command(*args: str) -> List[str]:
+    return [sys.executable, "-m", "dolibarr_mcp", "serve", *args]
+
+
+@asynccontextmanager
+async def launch_server(
+    transport: str,
+    env: Dict[str, str],
+    host: str = "127.0.0.1",
+    port: Optional[int] = None,
+    startup_timeout: float = 30.0,
+) -> AsyncIterator[ClientFactory]:
+    """Start the MCP server in a subprocess and yield a client factory for it."""
+    from fastmcp import Client
+    from fastmcp.client.transports import StdioTransport, StreamableHttpTransport
+
+    server_env = {**os.environ, **env}
+    if transport == "stdio":
+        command = server_command()
+        stdio = StdioTransport(command=command[0], args=command[1:], env=server_env, keep_alive=True)
+        try:
+            yield lambda: Client(stdio)
+        finally:
+            await stdio.close()
+        return
+
+    port = port or free_port(host)
+    process = subprocess.Popen(
+        server_command("--transport", "http", "--host", host, "--port", str(port)),
+        env=server_env,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    try:
+        await _wait_for_port(host, port, process, startup_timeout)
+        url = f"http://{host}:{port}/mcp"
+        yield lambda: Client(StreamableHttpTransport(url))
+    finally:
+        process.terminate()
+        try:
+            process.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            process.kill()
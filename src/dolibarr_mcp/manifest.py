@@ -0,0 +1,142 @@
+"""Cached tool manifest for faster server start.
+
+Registering a tool makes FastMCP build pydantic JSON schemas for its
+parameters and result, which is most of the server's import time (roughly
+0.3 s for the full tool set) and is repeated by every stdio process a host
+spawns. :class:`CachingToolRegistrar` stands in for the FastMCP instance in
+the ``register_*_tools`` functions: tools found in the manifest are built
+from the cached name, description and schemas, the others are generated as
+usual and added to it. The manifest is stored as one JSON file per key; the
+key hashes the package version, the sources of the package and the versions
+of FastMCP, pydantic and Python, so any code or dependency change starts a
+new manifest.
+
+Argument validation is unchanged: FastMCP builds the validating type adapter
+of a tool on its first call.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import platform
+import tempfile
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+MANIFEST_VERSION = 1
+
+_PACKAGE_DIR = Path(__file__).resolve().parent
+
+
+def default_cache_dir() -> str:
+    base = os.getenv("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(base, "dolibarr-mcp")
+
+
+def manifest_key() -> str:
+    """Hash of everything the generated schemas depend on."""
+    import fastmcp
+    import pydantic
+
+    from . import __version__
+
+    digest = hashlib.sha256()
+    for part in (MANIFEST_VERSION, __version__, fastmcp.__version__, pydantic.VERSION, platform.python_version()):
+        digest.update(f"{part}\0".encode())
+    for path in sorted(_PACKAGE_DIR.rglob("*.py")):
+        digest.update(str(path.relative_to(_PACKAGE_DIR)).encode() + b"\0")
+        digest.update(path.read_bytes())
+    return digest.hexdigest()[:16]
+
+
+class ToolManifest:
+    """Tool entries (description, parameters, output schema) stored under one key."""
+
+    def __init__(self, path: Optional[str] = None) -> None:
+        self.path = path
+        self.entries: Dict[str, Dict[str, Any]] = {}
+        self.hits = 0
+        self.misses = 0
+        self._dirty = False
+        if path:
+            try:
+                with open(path, encoding="utf-8") as fh:
+                    self.entries = json.load(fh).get("tools", {})
+            except FileNotFoundError:
+                pass
+            except (OSError, ValueError) as e:
+                logger.warning("Ignoring unreadable tool manifest %s: %s", path, e)
+
+    @classmethod
+    def for_directory(cls, directory: str) -> "ToolManifest":
+        return cls(os.path.join(directory, f"tools-{manifest_key()}.json"))
+
+    def get(self, name: str) -> Optional[Dict[str, Any]]:
+        entry = self.entries.get(name)
+        if entry is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return entry
+
+    def put(self, name: str, entry: Dict[str, Any]) -> None:
+        self.entries[name] = entry
+        self._dirty = True
+
+    def save(self) -> None:
+        """Write the manifest if it changed; failures only cost the next start."""
+        if not self.path or not self._dirty:
+            return
+        directory = os.path.dirname(self.path) or "."
+        try:
+            os.makedirs(directory, exist_ok=True)
+            fd, tmp = tempfile.mkstemp(dir=directory, prefix=".tools-", suffix=".json")
+            with os.fdopen(fd, "w", encoding="utf-8") as fh:
+                json.dump({"manifest": MANIFEST_VERSION, "tools": self.entries}, fh, separators=(",", ":"))
+            os.replace(tmp, self.path)
+            self._dirty = False
+        except OSError as e:
+            logger.debug("Could not write tool manifest %s: %s", self.path, e)
+
+
+class CachingToolRegistrar:
+    """Replacement for the FastMCP instance passed to ``register_*_tools``."""
+
+    def __init__(self, mcp: Any, manifest: ToolManifest) -> None:
+        self.mcp = mcp
+        self.manifest = manifest
+
+    def tool(self) -> Callable[[Callable[..., Any]], Any]:
+        from fastmcp.tools import FunctionTool
+
+        def decorator(fn: Callable[..., Any]) -> Any:
+            entry = self.manifest.get(fn.__name__)
+            if entry is not None:
+                tool = FunctionTool(
+                    fn=fn,
+                    name=fn.__name__,
+                    description=entry["description"],
+                    parameters=entry["parameters"],
+                    output_schema=entry["output_schema"],
+                    serializer=getattr(self.mcp, "_tool_serializer", None),
+                )
+            else:
+                tool = FunctionTool.from_function(fn, serializer=getattr(self.mcp, "_tool_serializer", None))
+                self.manifest.put(tool.name, {
+                    "description": tool.description,
+                    "parameters": tool.parameters,
+                    "output_schema": tool.output_schema,
+                })
+            return self.mcp.add_tool(tool)
+
+        return decorator
+
+
+def open_manifest(settings: Any) -> ToolManifest:
+    """Manifest selected by the startup settings (in-memory only when disabled)."""
+    if not settings.manifest_cache:
+        return ToolManifest()
+    return ToolManifest.for_directory(settings.manifest_cache_dir or default_cache_dir())
@@ -0,0 +1,305 @@
+"""Request metrics for the Dolibarr API client.
+
+Every request made through :class:`~dolibarr_mcp.dolibarr_client.DolibarrClient`
+is recorded per HTTP method and normalized endpoint template
+(``invoices/{id}/lines``): request and error counts, bytes in/out and a latency
+histogram from which p50/p95/p99 are derived. Connection-pool queue wait,
+connection reuse, retries and cache hits are tracked alongside. The data can be
+read as a dict (``get_server_metrics`` tool) or rendered in the Prometheus text
+exposition format (``/metrics`` on the HTTP transport).
+"""
+
+import bisect
+import re
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+
+from aiohttp import TraceConfig
+
+# Upper bucket bounds in seconds; the last bucket is +Inf.
+LATENCY_BUCKETS: Tuple[float, ...] = (
+    0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25,
+    0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0,
+)
+
+_NUMERIC_SEGMENT = re.compile(r"^\d+$")
+
+
+def normalize_endpoint(endpoint: str) -> str:
+    """Collapse an endpoint path into a template, e.g. ``invoices/{id}/lines``."""
+    path = endpoint.split("?", 1)[0].strip("/")
+    return "/".join("{id}" if _NUMERIC_SEGMENT.match(seg) else seg for seg in path.split("/"))
+
+
+class LatencyHistogram:
+    """Fixed-bucket histogram with interpolated percentiles."""
+
+    def __init__(self, buckets: Tuple[float, ...] = LATENCY_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+
+    def observe(self, seconds: float) -> None:
+        """Record one observation."""
+        self.counts[bisect.bisect_left(self.buckets, seconds)] += 1
+        self.count += 1
+        self.sum += seconds
+        self.max = max(self.max, seconds)
+
+    def percentile(self, q: float) -> float:
+        """Estimate the q-th percentile (0-100) in seconds."""
+        if not self.count:
+            return 0.0
+        rank = q / 100.0 * self.count
+        seen = 0
+        for index, bucket_count in enumerate(self.counts):
+            if bucket_count and seen + bucket_count >= rank:
+                lower = self.buckets[index - 1] if index > 0 else 0.0
+                upper = self.buckets[index] if index < len(self.buckets) else self.max
+                fraction = (rank - seen) / bucket_count
+                return min(lower + (upper - lower) * fraction, self.max)
+            seen += bucket_count
+        return self.max
+
+    def summary(self) -> Dict[str, float]:
+        """Return count, mean, p50/p95/p99 and max in milliseconds."""
+        return {
+            "count": self.count,
+            "mean_ms": round(self.sum / self.count * 1000, 3) if self.count else 0.0,
+            "p50_ms": round(self.percentile(50) * 1000, 3),
+            "p95_ms": round(self.percentile(95) * 1000, 3),
+            "p99_ms": round(self.percentile(99) * 1000, 3),
+            "max_ms": round(self.max * 1000, 3),
+        }
+
+
+@dataclass
+class EndpointStats:
+    """Counters for one (method, endpoint template) pair."""
+
+    requests: int = 0
+    errors: Dict[str, int] = field(default_factory=dict)
+    bytes_in: int = 0
+    bytes_out: int = 0
+    retries: int = 0
+    latency: LatencyHistogram = field(default_factory=LatencyHistogram)
+
+
+@dataclass
+class RequestTrace:
+    """Per-request values collected by the aiohttp trace hooks."""
+
+    queue_wait: float = 0.0
+    bytes_out: int = 0
+    bytes_in: int = 0
+    connection_reused: Optional[bool] = None
+    _queued_at: float = 0.0
+
+
+def prometheus_histogram(name: str, hist: LatencyHistogram, labels: str = "") -> List[str]:
+    """Bucket, sum and count lines of one histogram series in Prometheus text format."""
+    lines: List[str] = []
+    sep = "," if labels else ""
+    cumulative = 0
+    for bound, count in zip(hist.buckets + (float("inf"),), hist.counts):
+        cumulative += count
+        le = "+Inf" if bound == float("inf") else repr(bound)
+        lines.append(f'{name}_bucket{{{labels}{sep}le="{le}"}} {cumulative}')
+    block = f"{{{labels}}}" if labels else ""
+    lines.append(f"{name}_sum{block} {hist.sum}")
+    lines.append(f"{name}_count{block} {hist.count}")
+    return lines
+
+
+class RequestMetrics:
+    """In-process registry of Dolibarr request metrics."""
+
+    def __init__(self) -> None:
+        self.reset()
+
+    def _stats(self, method: str, endpoint: str) -> EndpointStats:
+        key = (method.upper(), normalize_endpoint(endpoint))
+        stats = self.endpoints.get(key)
+        if stats is None:
+            stats = self.endpoints[key] = EndpointStats()
+        return stats
+
+    def observe_request(
+        self,
+        method: str,
+        endpoint: str,
+        status: int,
+        duration: float,
+        trace: Optional[RequestTrace] = None,
+    ) -> None:
+        """Record a finished request; ``status`` 0 means no HTTP response."""
+        stats = self._stats(method, endpoint)
+        stats.requests += 1
+        stats.latency.observe(duration)
+        if status == 0 or status >= 400:
+            label = str(status) if status else "connection"
+            stats.errors[label] = stats.errors.get(label, 0) + 1
+        if trace is not None:
+            stats.bytes_in += trace.bytes_in
+            stats.bytes_out += trace.bytes_out
+            if trace.connection_reused is not None:
+                self.queue_wait.observe(trace.queue_wait)
+                if trace.connection_reused:
+                    self.connections_reused += 1
+                else:
+                    self.connections_created += 1
+
+    def record_retry(self, method: str, endpoint: str) -> None:
+        """Count a retried request."""
+        self._stats(method, endpoint).retries += 1
+
+    def record_cache(self, name: str, hit: bool) -> None:
+        """Count a cache lookup of the named cache."""
+        entry = self.cache.setdefault(name, {"hits": 0, "misses": 0})
+        entry["hits" if hit else "misses"] += 1
+
+    def reset(self) -> None:
+        """Drop all recorded values."""
+        self.started_at = time.time()
+        self.endpoints: Dict[Tuple[str, str], EndpointStats] = {}
+        self.queue_wait = LatencyHistogram()
+        self.connections_created = 0
+        self.connections_reused = 0
+        self.cache: Dict[str, Dict[str, int]] = {}
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Return all metrics as a JSON-serializable dict."""
+        endpoints: List[Dict[str, Any]] = []
+        total_requests = total_errors = 0
+        for (method, template), stats in sorted(self.endpoints.items()):
+            error_count = sum(stats.errors.values())
+            total_requests += stats.requests
+            total_errors += error_count
+            endpoints.append({
+                "method": method,
+                "endpoint": template,
+                "requests": stats.requests,
+                "errors": dict(stats.errors),
+                "retries": stats.retries,
+                "bytes_in": stats.bytes_in,
+                "bytes_out": stats.bytes_out,
+                "latency": stats.latency.summary(),
+            })
+        return {
+            "uptime_seconds": round(time.time() - self.started_at, 3),
+            "requests": total_requests,
+            "errors": total_errors,
+            "endpoints": endpoints,
+            "queue_wait": self.queue_wait.summary(),
+            "connections": {
+                "created": self.connections_created,
+                "reused": self.connections_reused,
+            },
+            "cache": {name: dict(entry) for name, entry in self.cache.items()},
+        }
+
+    def to_prometheus(self, prefix: str = "dolibarr_client") -> str:
+        """Render the metrics in the Prometheus text exposition format."""
+        lines: List[str] = []
+
+        def header(name: str, kind: str, text: str) -> None:
+            lines.append(f"# HELP {prefix}_{name} {text}")
+            lines.append(f"# TYPE {prefix}_{name} {kind}")
+
+        def histogram(name: str, hist: LatencyHistogram, labels: str) -> None:
+            lines.extend(prometheus_histogram(f"{prefix}_{name}", hist, labels))
+
+        items = sorted(self.endpoints.items())
+
+        header("requests_total", "counter", "Dolibarr API requests")
+        for (method, template), stats in items:
+            lines.append(f'{prefix}_requests_total{{method="{method}",endpoint="{template}"}} {stats.requests}')
+
+        header("errors_total", "counter", "Failed Dolibarr API requests by status")
+        for (method, template), stats in items:
+            for status, count in sorted(stats.errors.items()):
+                lines.append(
+                    f'{prefix}_errors_total{{method="{method}",endpoint="{template}",status="{status}"}} {count}'
+                )
+
+        header("retries_total", "counter", "Retried Dolibarr API requests")
+        for (method, template), stats in items:
+            lines.append(f'{prefix}_retries_total{{method="{method}",endpoint="{template}"}} {stats.retries}')
+
+        for direction in ("in", "out"):
+            header(f"bytes_{direction}_total", "counter", f"Bytes {'received' if direction == 'in' else 'sent'}")
+            for (method, template), stats in items:
+                value = stats.bytes_in if direction == "in" else stats.bytes_out
+                lines.append(f'{prefix}_bytes_{direction}_total{{method="{method}",endpoint="{template}"}} {value}')
+
+        header("request_duration_seconds", "histogram", "Dolibarr API request latency")
+        for (method, template), stats in items:
+            histogram("request_duration_seconds", stats.latency, f'method="{method}",endpoint="{template}"')
+
+        header("queue_wait_seconds", "histogram", "Time spent waiting for a pooled connection")
+        histogram("queue_wait_seconds", self.queue_wait, "")
+
+        header("connections_total", "counter", "Connections by origin")
+        lines.append(f'{prefix}_connections_total{{kind="created"}} {self.connections_created}')
+        lines.append(f'{prefix}_connections_total{{kind="reused"}} {self.connections_reused}')
+
+        header("cache_lookups_total", "counter", "Cache lookups by result")
+        for name, entry in sorted(self.cache.items()):
+            lines.append(f'{prefix}_cache_lookups_total{{cache="{name}",result="hit"}} {entry["hits"]}')
+            lines.append(f'{prefix}_cache_lookups_total{{cache="{name}",result="miss"}} {entry["misses"]}')
+
+        return "\n".join(lines) + "\n"
+
+
+def create_trace_config() -> TraceConfig:
+    """Build the aiohttp trace hooks that fill a :class:`RequestTrace`.
+
+    The trace object is passed per request as ``trace_request_ctx``; requests
+    made without one are ignored.
+    """
+
+    def _trace(ctx: Any) -> Optional[RequestTrace]:
+        trace = getattr(ctx, "trace_request_ctx", None)
+        return trace if isinstance(trace, RequestTrace) else None
+
+    async def on_queued_start(session, ctx, params):
+        trace = _trace(ctx)
+        if trace is not None:
+            trace._queued_at = time.perf_counter()
+
+    async def on_queued_end(session, ctx, params):
+        trace = _trace(ctx)
+        if trace is not None and trace._queued_at:
+            trace.queue_wait += time.perf_counter() - trace._queued_at
+
+    async def on_create_end(session, ctx, params):
+        trace = _trace(ctx)
+        if trace is not None:
+            trace.connection_reused = False
+
+    async def on_reuse(session, ctx, params):
+        trace = _trace(ctx)
+        if trace is not None:
+            trace.connection_reused = True
+
+    async def on_chunk_sent(session, ctx, params):
+        trace = _trace(ctx)
+        if trace is not None:
+            trace.bytes_out += len(params.chunk)
+
+    async def on_chunk_received(session, ctx, params):
+        trace = _trace(ctx)
+        if trace is not None:
+            trace.bytes_in += len(params.chunk)
+
+    config = TraceConfig()
+    config.on_connection_queued_start.append(on_queued_start)
+    config.on_connection_queued_end.append(on_queued_end)
+    config.on_connection_create_end.append(on_create_end)
+    config.on_connection_reuseconn.append(on_reuse)
+    config.on_request_chunk_sent.append(on_chunk_sent)
+    config.on_response_chunk_received.append(on_chunk_received)
+    return config
@@ -0,0 +1,116 @@
+"""FastMCP middleware for Dolibarr MCP Server."""
+
+import time
+from typing import Any
+
+from fastmcp.server.dependencies import get_http_headers
+from fastmcp.server.middleware import CallNext, Middleware, MiddlewareContext
+
+from .budget import check_budget, get_budget_mode, track_requests
+from .multicompany import ENTITY_HEADER, parse_entities, use_entity
+from .profiling import get_profiler
+from .slowlog import get_slow_log
+from .tenants import get_tenant_pool
+from .tracing import get_tracer
+
+
+class TenantMiddleware(Middleware):
+    """Serve tool calls with the client of the tenant named in the request headers."""
+
+    async def on_call_tool(self, context: MiddlewareContext, call_next: CallNext) -> Any:
+        pool = get_tenant_pool()
+        if pool is None:
+            return await call_next(context)
+        key = pool.resolve(get_http_headers())
+        if key is None:
+            return await call_next(context)
+        async with pool.lease(key):
+            return await call_next(context)
+
+
+class EntityMiddleware(Middleware):
+    """Route tool calls to the Multicompany entity named in the request headers."""
+
+    async def on_call_tool(self, context: MiddlewareContext, call_next: CallNext) -> Any:
+        entities = parse_entities(get_http_headers().get(ENTITY_HEADER))
+        if not entities:
+            return await call_next(context)
+        if len(entities) > 1:
+            raise ValueError(f"{ENTITY_HEADER} names one entity, got {len(entities)}")
+        with use_entity(entities[0]):
+            return await call_next(context)
+
+
+class ToolTracingMiddleware(Middleware):
+    """Open a server span per tool call.
+
+    Requests made by the tool become child spans, so a trace shows how many
+    Dolibarr round trips one call fanned out to and where the time went.
+    """
+
+    async def on_call_tool(self, context: MiddlewareContext, call_next: CallNext) -> Any:
+        tracer = get_tracer()
+        if not tracer.enabled:
+            return await call_next(context)
+
+        name = context.message.name
+        with tracer.span(f"tool/{name}", kind="server", **{"mcp.tool.name": name}):
+            return await call_next(context)
+
+
+class RequestBudgetMiddleware(Middleware):
+    """Check each tool call against its declared Dolibarr request budget.
+
+    Only successful calls are checked: a failing multi-step tool may spend
+    extra requests on its rollback. In ``fail`` mode the violation is raised
+    after the tool ran, so side effects have already happened; use it in
+    tests and CI, ``warn`` in production.
+    """
+
+    async def on_call_tool(self, context: MiddlewareContext, call_next: CallNext) -> Any:
+        if get_budget_mode() == "off":
+            return await call_next(context)
+
+        name = context.message.name
+        with track_requests(name) as counter:
+            result = await call_next(context)
+        check_budget(name, context.message.arguments or {}, counter)
+        return result
+
+
+class SlowToolLogMiddleware(Middleware):
+    """Log tool calls slower than the configured threshold.
+
+    The entry splits the call's time between Dolibarr requests and everything
+    else (validation, serialization, waiting on the event loop).
+    """
+
+    async def on_call_tool(self, context: MiddlewareContext, call_next: CallNext) -> Any:
+        name = context.message.name
+        started = time.perf_counter()
+        with track_requests(name) as counter:
+            try:
+                return await call_next(context)
+            finally:
+                get_slow_log().log_tool(
+                    name,
+                    context.message.arguments,
+                    time.perf_counter() - started,
+                    requests=counter.count,
+                    request_time=counter.request_time,
+                )
+
+
+class ProfilingMiddleware(Middleware):
+    """Run tool calls under cProfile while the profiler is armed."""
+
+    async def on_call_tool(self, context: MiddlewareContext, call_next: CallNext) -> Any:
+        profiler = get_profiler()
+        if not profiler.armed:
+            return await call_next(context)
+
+        profile = profiler.begin()
+        try:
+            return await call_next(context)
+        finally:
+            profiler.end(context.message.name, profile)
@@ -35,6 +35,7 @@ class CustomerResult(DolibarrBaseModel):
     town: Optional[str] = Field(None, description="City/Town")
     status: int = Field(..., description="Status (1=Active, 0=Inactive)")
     client: int = Field(..., description="Is customer (1=Yes, 0=No)")
+    entity: Optional[int] = Field(None, description="Multicompany entity")
     fournisseur: int = Field(..., description="Is supplier (1=Yes, 0=No)")
 
 
@@ -48,6 +49,21 @@ class InvoiceLine(DolibarrBaseModel):
     product_type: int = Field(0, description="Type (0=Product, 1=Service)")
 
 
+def line_payload(line: InvoiceLine) -> Dict[str, Any]:
+    """Map an invoice, order or proposal line onto the Dolibarr API line fields."""
+    line_data = line.model_dump(exclude_none=True)
+    api_line: Dict[str, Any] = {
+        "desc": line_data["desc"],
+        "subprice": str(line_data["subprice"]),
+        "qty": str(line_data["qty"]),
+        "tva_tx": str(line_data["tva_tx"]),
+        "product_type": line_data["product_type"],
+    }
+    if "product_id" in line_data:
+        api_line["fk_product"] = line_data["product_id"]
+    return api_line
+
+
 class InvoiceResult(DolibarrBaseModel):
     """Structured invoice result."""
     id: int = Field(..., description="Invoice ID")
@@ -59,6 +75,7 @@ class InvoiceResult(DolibarrBaseModel):
     total_ttc: Decimal = Field(..., description="Total gross amount")
     paye: int = Field(..., description="Paid amount (1=Paid, 0=Not paid)")
     status: int = Field(..., description="Status (0=Draft, 1=Unpaid, 2=Paid, 3=Abandoned)")
+    entity: Optional[int] = Field(None, description="Multicompany entity")
 
 
 class ProductResult(DolibarrBaseModel):
@@ -132,3 +149,36 @@ class OrderResult(DolibarrBaseModel):
 
     total_ttc: float = Field(..., description="Total gross amount")
     statut: int = Field(..., description="Status")
+
+
+class TopDocumentsResult(DolibarrBaseModel):
+    """The N most recent or largest documents of one type."""
+    document: Literal["invoices", "orders", "proposals"] = Field(..., description="Document type")
+    rank_by: Literal["latest", "largest"] = Field(..., description="Ranking applied by Dolibarr")
+    items: List[Union[InvoiceResult, OrderResult, ProposalResult]] = Field(..., description="Documents, best ranked first")
+
+
+class CursorPage(DolibarrBaseModel):
+    """One page of a server-side result snapshot."""
+    resource: str = Field(..., description="Resource the snapshot was taken from")
+    items: List[Dict[str, Any]] = Field(..., description="Rows on this page")
+    offset: int = Field(..., description="Position of the first row in the snapshot")
+    total: int = Field(..., description="Number of rows held in the snapshot")
+    truncated: bool = Field(False, description="True if the scan stopped at the row cap")
+    next_cursor: Optional[str] = Field(None, description="Cursor for the next page (null on the last page)")
+
+
+class CountResult(DolibarrBaseModel):
+    """Row count of a filtered list query."""
+    resource: str = Field(..., description="Counted resource")
+    total: int = Field(..., description="Number of matching rows")
+    method: Literal["pagination_data", "scan"] = Field(..., description="How the total was obtained")
+    truncated: bool = Field(False, description="The scan stopped at DOLIBARR_COUNT_MAX_ROWS; the total is a lower bound")
+
+
+class ChangesResult(DolibarrBaseModel):
+    """Rows modified after a watermark, oldest change first."""
+    resource: str = Field(..., description="Polled resource")
+    items: List[Dict[str, Any]] = Field(..., description="Changed rows")
+    watermark: str = Field(..., description="Pass as `since` on the next poll")
+    has_more: bool = Field(..., description="True if more changes are waiting; poll again immediately")
@@ -0,0 +1,122 @@
+"""Multicompany entity routing and cross-entity fan-out.
+
+Dolibarr's Multicompany module selects the entity of an API call with the
+``DOLAPIENTITY`` header. The entity of a tool call comes from, in order:
+
+1. the ``X-Dolibarr-Entity`` request header (HTTP transport, per session),
+2. ``DOLIBARR_ENTITY`` (the configured client's default),
+3. none: Dolibarr uses the API user's own entity.
+
+:func:`fan_out` runs one client call per entity concurrently through
+:meth:`DolibarrClient.for_entity` clients and merges the rows, so a search
+across companies costs one round trip instead of N serial ones.
+"""
+
+import asyncio
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, Iterable, Iterator, List, Optional, Union
+
+from .dolibarr_client import DolibarrAPIError, DolibarrClient
+
+ENTITY_HEADER = "x-dolibarr-entity"
+
+_current: ContextVar[Optional[int]] = ContextVar("dolibarr_mcp_entity", default=None)
+
+
+def current_entity() -> Optional[int]:
+    """The entity selected for the running tool call, if any."""
+    return _current.get()
+
+
+@contextmanager
+def use_entity(entity: Optional[int]) -> Iterator[None]:
+    """Route the client calls of this block to ``entity``."""
+    token = _current.set(entity)
+    try:
+        yield
+    finally:
+        _current.reset(token)
+
+
+def parse_entities(value: Union[str, Iterable[Any], None]) -> List[int]:
+    """``"1, 2,3"`` or ``[1, "2"]`` -> ``[1, 2, 3]`` without duplicates."""
+    if value is None:
+        return []
+    items = value.split(",") if isinstance(value, str) else value
+    entities: List[int] = []
+    for item in items:
+        text = str(item).strip()
+        if not text:
+            continue
+        try:
+            entity = int(text)
+        except ValueError:
+            raise ValueError(f"Invalid Multicompany entity '{text}'") from None
+        if entity < 1:
+            raise ValueError(f"Invalid Multicompany entity '{text}'")
+        if entity not in entities:
+            entities.append(entity)
+    return entities
+
+
+class FanOutError(DolibarrAPIError):
+    """At least one entity of a fan-out failed."""
+
+    def __init__(self, errors: Dict[int, Exception]):
+        self.errors = errors
+        details = "; ".join(f"entity {entity}: {error}" for entity, error in errors.items())
+        super().__init__(f"Query failed for {len(errors)} entit{'y' if len(errors) == 1 else 'ies'}: {details}")
+
+
+@dataclass
+class FanOutResult:
+    """Merged rows of all entities plus the entities that failed."""
+
+    rows: List[Dict[str, Any]] = field(default_factory=list)
+    errors: Dict[int, Exception] = field(default_factory=dict)
+
+
+EntityCall = Callable[[DolibarrClient], Awaitable[Any]]
+
+
+async def fan_out(
+    client: DolibarrClient,
+    entities: Iterable[int],
+    call: EntityCall,
+    partial: bool = False,
+) -> FanOutResult:
+    """Run ``call`` for each entity concurrently and merge the list results.
+
+    Rows keep their ``entity`` field or get the queried one. Objects shared
+    between entities come back from each of them and are kept once. Unless
+    ``partial`` is set, any failing entity raises :class:`FanOutError`.
+    """
+    entities = list(entities)
+    results = await asyncio.gather(
+        *(call(client.for_entity(entity)) for entity in entities),
+        return_exceptions=True,
+    )
+
+    merged = FanOutResult()
+    seen = set()
+    for entity, result in zip(entities, results):
+        if isinstance(result, BaseException):
+            if not isinstance(result, Exception):
+                raise result
+            merged.errors[entity] = result
+            continue
+        for row in result if isinstance(result, list) else []:
+            if not isinstance(row, dict):
+                continue
+            row.setdefault("entity", str(entity))
+            key = (str(row["entity"]), row.get("id"))
+            if row.get("id") is not None and key in seen:
+                continue
+            seen.add(key)
+            merged.rows.append(row)
+
+    if merged.errors and not partial:
+        raise FanOutError(merged.errors)
+    return merged
@@ -0,0 +1,157 @@
+"""On-demand cProfile profiling of tool calls.
+
+The profiler is armed for the next N tool calls and/or T seconds, either at
+startup (``dolibarr-mcp serve --profile``) or at runtime through the
+``start_profiling`` / ``stop_profiling`` tools. While armed, the profiling
+middleware runs each tool call under :mod:`cProfile` and merges the result
+into per-tool statistics, written as ``<tool>.pstats`` files when profiling
+stops. Inspect them with ``python -m pstats`` or snakeviz.
+
+Only one profiling session can be armed at a time, and only one tool call is
+profiled at any moment: a call that overlaps a profiled one runs normally.
+Because the profile spans the whole call including its awaits, code of other
+tasks scheduled meanwhile on the event loop is attributed to it as well.
+"""
+
+import cProfile
+import os
+import pstats
+import re
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+
+class ProfilerBusy(RuntimeError):
+    """A profiling session is already armed."""
+
+
+def _safe_name(tool: str) -> str:
+    return re.sub(r"[^A-Za-z0-9_.-]", "_", tool)
+
+
+class ToolProfiler:
+    """Controller for one profiling session at a time."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._armed = False
+        self._active: Optional[cProfile.Profile] = None
+        self._stats: Dict[str, pstats.Stats] = {}
+        self._counts: Dict[str, int] = {}
+        self.output_dir = "profiles"
+        # Set by ``serve --profile-dir``; takes precedence over DOLIBARR_PROFILE_DIR.
+        self.default_dir: Optional[str] = None
+        self.remaining_calls: Optional[int] = None
+        self.deadline: Optional[float] = None
+        self.started_at: Optional[float] = None
+
+    @property
+    def armed(self) -> bool:
+        return self._armed
+
+    def start(
+        self,
+        output_dir: str,
+        calls: Optional[int] = None,
+        seconds: Optional[float] = None,
+    ) -> Dict[str, Any]:
+        """Arm profiling for the next ``calls`` tool calls and/or ``seconds``.
+
+        With neither limit, profiling runs until :meth:`stop`.
+
+        Raises:
+            ProfilerBusy: If a session is already armed
+        """
+        with self._lock:
+            if self._armed:
+                raise ProfilerBusy("Profiling is already active; stop it first")
+            os.makedirs(output_dir, exist_ok=True)
+            self._armed = True
+            self._stats = {}
+            self._counts = {}
+            self.output_dir = output_dir
+            self.remaining_calls = calls
+            self.started_at = time.monotonic()
+            self.deadline = self.started_at + seconds if seconds else None
+        return self.status()
+
+    def stop(self) -> Dict[str, Any]:
+        """Disarm profiling and write one pstats file per profiled tool."""
+        with self._lock:
+            was_armed = self._armed
+            self._armed = False
+            stats, counts = self._stats, self._counts
+            self._stats, self._counts = {}, {}
+        files: List[str] = []
+        for tool, tool_stats in sorted(stats.items()):
+            path = os.path.join(self.output_dir, f"{_safe_name(tool)}.pstats")
+            tool_stats.dump_stats(path)
+            files.append(path)
+        return {"stopped": was_armed, "calls": counts, "files": files}
+
+    def status(self) -> Dict[str, Any]:
+        """Describe the current session."""
+        remaining_seconds = None
+        if self._armed and self.deadline is not None:
+            remaining_seconds = round(max(self.deadline - time.monotonic(), 0.0), 3)
+        return {
+            "armed": self._armed,
+            "output_dir": self.output_dir,
+            "remaining_calls": self.remaining_calls if self._armed else None,
+            "remaining_seconds": remaining_seconds,
+            "calls": dict(self._counts),
+        }
+
+    def _exhausted(self) -> bool:
+        if self.remaining_calls is not None and self.remaining_calls <= 0:
+            return True
+        return self.deadline is not None and time.monotonic() >= self.deadline
+
+    def begin(self) -> Optional[cProfile.Profile]:
+        """Start profiling a tool call if armed and idle; returns the profile or None."""
+        if not self._armed:
+            return None
+        if self._exhausted():
+            if self._active is None:
+                self.stop()
+            return None
+        with self._lock:
+            if not self._armed or self._active is not None:
+                return None
+            profile = cProfile.Profile()
+            try:
+                profile.enable()
+            except ValueError:
+                # Another profiler (e.g. an attached debugger) owns the hook.
+                return None
+            self._active = profile
+            if self.remaining_calls is not None:
+                self.remaining_calls -= 1
+        return profile
+
+    def end(self, tool: str, profile: Optional[cProfile.Profile]) -> None:
+        """Finish a call started with :meth:`begin` and merge its statistics."""
+        if profile is None:
+            return
+        profile.disable()
+        with self._lock:
+            self._active = None
+            if not self._armed:
+                # Stopped while this call was running; its profile is discarded.
+                return
+            if tool in self._stats:
+                self._stats[tool].add(profile)
+            else:
+                self._stats[tool] = pstats.Stats(profile)
+            self._counts[tool] = self._counts.get(tool, 0) + 1
+        if self._exhausted():
+            self.stop()
+
+
+_profiler = ToolProfiler()
+
+
+def get_profiler() -> ToolProfiler:
+    """Get the process-wide tool profiler."""
+    return _profiler
@@ -0,0 +1,68 @@
+"""Registry of the Dolibarr list resources exposed through generic tools.
+
+Cursor, count and delta tools operate on a resource name instead of one tool
+per entity. This module maps those names to the REST endpoint, the result model
+used to shape rows and the USF column holding the customer reference.
+"""
+
+from dataclasses import dataclass
+from typing import Dict, Literal, Optional, Type
+
+from .models import (
+    ContactResult,
+    CustomerResult,
+    DolibarrBaseModel,
+    InvoiceResult,
+    OrderResult,
+    ProductResult,
+    ProjectSearchResult,
+    ProposalResult,
+    UserResult,
+)
+
+
+ResourceName = Literal[
+    "customers",
+    "products",
+    "invoices",
+    "orders",
+    "proposals",
+    "projects",
+    "contacts",
+    "users",
+]
+
+
+@dataclass(frozen=True)
+class ResourceSpec:
+    """Static description of a Dolibarr list endpoint."""
+
+    name: str
+    endpoint: str
+    model: Type[DolibarrBaseModel]
+    customer_field: Optional[str] = None
+
+
+RESOURCES: Dict[str, ResourceSpec] = {
+    "customers": ResourceSpec("customers", "thirdparties", CustomerResult),
+    "products": ResourceSpec("products", "products", ProductResult),
+    "invoices": ResourceSpec("invoices", "invoices", InvoiceResult, "t.fk_soc"),
+    "orders": ResourceSpec("orders", "orders", OrderResult, "t.fk_soc"),
+    "proposals": ResourceSpec("proposals", "proposals", ProposalResult, "t.fk_soc"),
+    "projects": ResourceSpec("projects", "projects", ProjectSearchResult, "t.fk_soc"),
+    "contacts": ResourceSpec("contacts", "contacts", ContactResult, "t.fk_soc"),
+    "users": ResourceSpec("users", "users", UserResult),
+}
+
+
+def get_resource(name: str) -> ResourceSpec:
+    """Return the spec for a resource name.
+
+    Raises:
+        ValueError: If the resource is not known.
+    """
+    try:
+        return RESOURCES[name]
+    except KeyError:
+        known = ", ".join(sorted(RESOURCES))
+        raise ValueError(f"Unknown resource '{name}' (expected one of: {known})") from None
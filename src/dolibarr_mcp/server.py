@@ -1,35 +1,51 @@
 """FastMCP Server implementation for Dolibarr MCP.
 
 This is the main entry point that initializes the MCP server and registers
-all tools from the tools/ module.
+the tools of the enabled toolsets (``DOLIBARR_TOOLSETS``) from the tools/ module.
 """
 
+import asyncio
 import sys
 from typing import Optional
-from contextlib import asynccontextmanager
+from contextlib import AsyncExitStack, asynccontextmanager
 
 from fastmcp import FastMCP
+from fastmcp.server.http import StarletteWithLifespan
+from starlette.requests import Request
+from starlette.responses import JSONResponse, PlainTextResponse
 
-from .config import Config
+from .config import Config, StartupSettings
 from .dolibarr_client import DolibarrClient
-from .state import set_client
+from .cursors import CursorStore
+from .manifest import CachingToolRegistrar, open_manifest
+from .budget import configure_scan_budgets, set_budget_mode
+from .capabilities import CapabilityCache
+from .middleware import (
+    EntityMiddleware,
+    ProfilingMiddleware,
+    RequestBudgetMiddleware,
+    SlowToolLogMiddleware,
+    TenantMiddleware,
+    ToolTracingMiddleware,
+)
+from .slowlog import SlowLog, set_slow_log
+from .state import get_client, set_client, set_cursor_store
+from .tenants import TenantPool, set_tenant_pool
+from .tracing import create_tracer, get_tracer, set_tracer
+from .transport import create_transport
+from .warmup import WarmUp, get_warmup, set_warmup
+from .watchdog import Watchdog, get_watchdog, set_watchdog
 
-# Tool modules
-from .tools.proposals import register_proposal_tools
-from .tools.projects import register_project_tools
-from .tools.customers import register_customer_tools
-from .tools.users import register_user_tools
-from .tools.contacts import register_contact_tools
-from .tools.invoices import register_invoice_tools
-from .tools.orders import register_order_tools
-from .tools.products import register_product_tools
-from .tools.system import register_system_tools
+from .tools import register_toolsets, resolve_toolsets
 
 
 @asynccontextmanager
-async def server_lifespan(server: FastMCP):
+async def dolibarr_services(server: FastMCP):
     """Manage server lifecycle and API client session."""
     client: Optional[DolibarrClient] = None
+    watchdog: Optional[Watchdog] = None
+    warmup: Optional[WarmUp] = None
+    tenants: Optional[TenantPool] = None
     
     # Load configuration
     try:
@@ -42,51 +58,178 @@ async def server_lifespan(server: FastMCP):
         if not config.api_key or "your_dolibarr_api_key" in config.api_key:
             raise RuntimeError("DOLIBARR_API_KEY not configured properly")
             
+        set_tracer(create_tracer(config))
+        set_budget_mode(config.request_budget_mode)
+        configure_scan_budgets(config)
+        set_slow_log(SlowLog.from_config(config))
+
         # Initialize client
-        client = DolibarrClient(config)
+        client = DolibarrClient(
+            config,
+            transport=create_transport(config),
+            capability_cache=CapabilityCache.from_config(config),
+            entity=config.entity,
+            unix_socket=config.unix_socket or None,
+            count_max_rows=config.count_max_rows,
+        )
         await client.start_session()
         set_client(client)
+        set_cursor_store(CursorStore(
+            ttl_seconds=config.cursor_ttl_seconds,
+            max_total_rows=config.cursor_max_rows,
+        ))
+        if config.tenant_headers:
+            tenants = TenantPool.from_config(config)
+            tenants.adopt_connector(config.dolibarr_url, client.session.connector)
+            tenants.adopt_transport(client.transport)
+            set_tenant_pool(tenants)
+        if config.watchdog_interval_seconds:
+            watchdog = Watchdog.from_config(config)
+            watchdog.start()
+            set_watchdog(watchdog)
         
-        # Test connection
-        try:
-            status = await client.get_status()
-            version = status.get("dolibarr_version", "Unknown")
-            print(f"✅ Connected to Dolibarr API (Version: {version})", file=sys.stderr)
-        except Exception as e:
-            print(f"⚠️  Connection test failed: {e}", file=sys.stderr)
-            
+
+        # Test the connection and warm the pool in the background so the
+        # MCP handshake does not wait for Dolibarr
+        warmup = WarmUp.from_config(client, config)
+        warmup.start()
+        set_warmup(warmup)
+
         yield
         
     finally:
         # Cleanup
+        if warmup:
+            await warmup.stop()
+            set_warmup(None)
+        if tenants:
+            set_tenant_pool(None)
+            await tenants.close()
+        if watchdog:
+            await watchdog.stop()
+            set_watchdog(None)
         if client:
             try:
                 await client.close_session()
                 print("👋 Dolibarr client session closed", file=sys.stderr)
             finally:
                 set_client(None)
+                set_cursor_store(None)
+        get_tracer().shutdown()
+        set_tracer(None)
+        set_slow_log(None)
+
+
+_sessions = 0
+_services: Optional[AsyncExitStack] = None
+_services_lock = asyncio.Lock()
+
+
+@asynccontextmanager
+async def shared_services(server: FastMCP):
+    """Hold one reference on the services shared by sessions and the HTTP app.
+
+    The first holder starts the client, warm-up and watchdog; the last one
+    to leave closes them.
+    """
+    global _sessions, _services
+    async with _services_lock:
+        if _sessions == 0:
+            stack = AsyncExitStack()
+            await stack.enter_async_context(dolibarr_services(server))
+            _services = stack
+        _sessions += 1
+    try:
+        yield
+    finally:
+        async with _services_lock:
+            _sessions -= 1
+            if _sessions == 0 and _services is not None:
+                stack, _services = _services, None
+                await stack.aclose()
+
+
+@asynccontextmanager
+async def server_lifespan(server: FastMCP):
+    """Share one set of services between overlapping MCP sessions.
+
+    FastMCP enters the lifespan once per session. On the HTTP transport
+    sessions overlap, and the app itself holds the services for the whole
+    process (see :class:`DolibarrMCP`), so ``/ready`` and ``/metrics`` work
+    before the first session.
+    """
+    async with shared_services(server):
+        yield
+
+
+class DolibarrMCP(FastMCP):
+    """FastMCP server whose HTTP app starts the services at process start."""
+
+    def http_app(self, *args, **kwargs) -> StarletteWithLifespan:
+        app = super().http_app(*args, **kwargs)
+        session_manager = app.router.lifespan_context
+
+        @asynccontextmanager
+        async def lifespan(starlette_app):
+            async with shared_services(self):
+                async with session_manager(starlette_app):
+                    yield
+
+        app.router.lifespan_context = lifespan
+        return app
 
 
 # Initialize FastMCP server
 # Note: dependencies are configured in fastmcp.json (schema, transports, etc.)
-mcp = FastMCP(
+mcp = DolibarrMCP(
     "dolibarr-mcp",
     instructions="Professional Dolibarr ERP/CRM integration via Model Context Protocol",
     lifespan=server_lifespan
 )
 
+mcp.add_middleware(TenantMiddleware())
+mcp.add_middleware(EntityMiddleware())
+mcp.add_middleware(ToolTracingMiddleware())
+mcp.add_middleware(RequestBudgetMiddleware())
+mcp.add_middleware(SlowToolLogMiddleware())
+mcp.add_middleware(ProfilingMiddleware())
+
+
+# Register the enabled tool modules, reusing cached schemas where possible
+_settings = StartupSettings()
+_manifest = open_manifest(_settings)
+TOOLSETS = resolve_toolsets(_settings.toolsets)
+register_toolsets(CachingToolRegistrar(mcp, _manifest), TOOLSETS)
+
+
+def save_tool_manifest() -> None:
+    """Store the tool schemas generated at import for the next start (called by ``serve``)."""
+    _manifest.save()
+
+
+@mcp.custom_route("/metrics", methods=["GET"])
+async def metrics_endpoint(request: Request) -> PlainTextResponse:
+    """Expose Dolibarr client metrics in the Prometheus text format (HTTP transport only)."""
+    try:
+        body = get_client().metrics.to_prometheus()
+    except RuntimeError:
+        body = ""
+    watchdog = get_watchdog()
+    if watchdog:
+        body += watchdog.to_prometheus()
+    return PlainTextResponse(body, media_type="text/plain; version=0.0.4")
+
 
-# Register all tool modules
-register_proposal_tools(mcp)
-register_project_tools(mcp)
-register_customer_tools(mcp)
-register_user_tools(mcp)
-register_contact_tools(mcp)
-register_invoice_tools(mcp)
-register_order_tools(mcp)
-register_product_tools(mcp)
-register_system_tools(mcp)
+@mcp.custom_route("/ready", methods=["GET"])
+async def ready_endpoint(request: Request) -> JSONResponse:
+    """Readiness probe: 200 once warm-up has finished, 503 before (HTTP transport only)."""
+    warmup = get_warmup()
+    if warmup is None:
+        return JSONResponse({"state": "stopped", "ready": False}, status_code=503)
+    readiness = warmup.readiness.snapshot()
+    return JSONResponse(readiness, status_code=200 if readiness["ready"] else 503)
 
 
 if __name__ == "__main__":
+    save_tool_manifest()
     mcp.run()
@@ -0,0 +1,123 @@
+"""Slow-call log and sampled payload capture.
+
+Requests and tool calls slower than their threshold are logged at WARNING on
+the ``dolibarr_mcp.slow`` logger, with parameters, a timing breakdown and a
+size-capped payload sample, so slow queries surface without DEBUG logging.
+Per-request DEBUG logging is lazy and sampled (``DOLIBARR_LOG_SAMPLE_RATE``).
+"""
+
+import json
+import logging
+import random
+from dataclasses import dataclass
+from typing import Any, Mapping, Optional
+
+logger = logging.getLogger("dolibarr_mcp.slow")
+
+
+def payload_sample(value: Any, limit: int) -> str:
+    """Render a payload as text capped at ``limit`` characters."""
+    if value is None:
+        return ""
+    if isinstance(value, str):
+        text = value
+    else:
+        try:
+            text = json.dumps(value, default=str, ensure_ascii=False, separators=(",", ":"))
+        except (TypeError, ValueError):
+            text = repr(value)
+    if len(text) <= limit:
+        return text
+    return f"{text[:limit]}…(+{len(text) - limit} chars)"
+
+
+@dataclass
+class SlowLog:
+    """Thresholds (seconds) and sampling for request and tool logging."""
+
+    request_threshold: float = 2.0
+    tool_threshold: float = 5.0
+    payload_bytes: int = 1024
+    sample_rate: float = 1.0
+
+    @classmethod
+    def from_config(cls, config: Any) -> "SlowLog":
+        return cls(
+            request_threshold=config.slow_request_ms / 1000,
+            tool_threshold=config.slow_tool_ms / 1000,
+            payload_bytes=config.slow_log_payload_bytes,
+            sample_rate=config.log_sample_rate,
+        )
+
+    def sample(self) -> bool:
+        """Decide whether a request gets DEBUG logging."""
+        return self.sample_rate >= 1.0 or random.random() < self.sample_rate
+
+    def log_request(
+        self,
+        method: str,
+        endpoint: str,
+        params: Optional[Mapping[str, Any]],
+        status: int,
+        duration: float,
+        queue_wait: float = 0.0,
+        bytes_out: int = 0,
+        bytes_in: int = 0,
+        request_body: Any = None,
+        response_text: Optional[str] = None,
+    ) -> bool:
+        """Log the request if it crossed the threshold; returns whether it did."""
+        if duration < self.request_threshold:
+            return False
+        logger.warning(
+            "Slow Dolibarr request %s %s: %.0f ms (status=%s, queue_wait=%.0f ms, "
+            "sent=%d B, received=%d B) params=%s request=%s response=%s",
+            method.upper(),
+            endpoint,
+            duration * 1000,
+            status or "none",
+            queue_wait * 1000,
+            bytes_out,
+            bytes_in,
+            payload_sample(dict(params or {}), self.payload_bytes),
+            payload_sample(request_body, self.payload_bytes),
+            payload_sample(response_text, self.payload_bytes),
+        )
+        return True
+
+    def log_tool(
+        self,
+        tool: str,
+        arguments: Optional[Mapping[str, Any]],
+        duration: float,
+        requests: int = 0,
+        request_time: float = 0.0,
+    ) -> bool:
+        """Log the tool call if it crossed the threshold; returns whether it did."""
+        if duration < self.tool_threshold:
+            return False
+        logger.warning(
+            "Slow tool call %s: %.0f ms (%d Dolibarr requests, %.0f ms in requests, "
+            "%.0f ms elsewhere) arguments=%s",
+            tool,
+            duration * 1000,
+            requests,
+            request_time * 1000,
+            max(duration - request_time, 0.0) * 1000,
+            payload_sample(dict(arguments or {}), self.payload_bytes),
+        )
+        return True
+
+
+_slow_log = SlowLog()
+
+
+def get_slow_log() -> SlowLog:
+    """Get the process-wide slow-log settings."""
+    return _slow_log
+
+
+def set_slow_log(slow_log: Optional[SlowLog]) -> None:
+    """Install slow-log settings, or restore the defaults with None."""
+    global _slow_log
+    _slow_log = slow_log if slow_log is not None else SlowLog()
@@ -1,24 +1,53 @@
 """Global state management for Dolibarr MCP Server.
 
 This module holds the singleton instance of the DolibarrClient to avoid
-circular imports between the server module and tool modules.
+circular imports between the server module and tool modules. Tool calls
+served for a tenant (see :mod:`dolibarr_mcp.tenants`) get that tenant's
+client and cursor store instead, scoped to the Multicompany entity of the
+call (see :mod:`dolibarr_mcp.multicompany`).
 """
 
 from typing import Optional
+from .cursors import CursorStore
 from .dolibarr_client import DolibarrClient
+from .multicompany import current_entity
+from .tenants import current_tenant
 
 # Global client instance
 _client: Optional[DolibarrClient] = None
 
+# Snapshots behind the cursor tools
+_cursor_store: Optional[CursorStore] = None
+
 
 def get_client() -> DolibarrClient:
-    """Get the global client instance. Used by tool modules."""
-    if not _client:
+    """Get the client of the current tenant or the global one. Used by tool modules."""
+    tenant = current_tenant()
+    client = tenant.client if tenant is not None else _client
+    if not client:
         raise RuntimeError("Server not initialized - client is not available")
-    return _client
+    entity = current_entity()
+    return client if entity is None else client.for_entity(entity)
 
 
 def set_client(client: Optional[DolibarrClient]) -> None:
     """Set the global client instance."""
     global _client
     _client = client
+
+
+def get_cursor_store() -> CursorStore:
+    """Get the cursor snapshot store, creating a default one on first use."""
+    global _cursor_store
+    tenant = current_tenant()
+    if tenant is not None:
+        return tenant.cursor_store
+    if _cursor_store is None:
+        _cursor_store = CursorStore()
+    return _cursor_store
+
+
+def set_cursor_store(store: Optional[CursorStore]) -> None:
+    """Set (or reset with None) the cursor snapshot store."""
+    global _cursor_store
+    _cursor_store = store
@@ -0,0 +1,261 @@
+"""Per-tenant Dolibarr clients for a shared HTTP-mode server.
+
+With ``DOLIBARR_TENANT_HEADERS`` enabled, a request carrying an
+``X-Dolibarr-Api-Key`` header (and optionally ``X-Dolibarr-Url``) is served by
+a client for those credentials instead of the server's configured one, so one
+process can serve several Dolibarr users or instances. MCP clients set the
+headers once on their transport, so they apply to the whole session.
+
+:class:`TenantPool` keeps one :class:`Tenant` (client plus cursor store) per
+URL and API key. Clients of the same host share one aiohttp connector, and
+so its keep-alive connections, while headers and caches (capabilities,
+metrics, cursor snapshots) stay per tenant. The least recently used tenants
+beyond ``DOLIBARR_TENANT_MAX_CLIENTS`` and tenants idle for
+``DOLIBARR_TENANT_IDLE_SECONDS`` are closed, except while a tool call is using
+them.
+
+``X-Dolibarr-Url`` may only name the configured origin (scheme, host and
+port) or one listed in ``DOLIBARR_TENANT_ALLOWED_HOSTS``; the server never
+connects to a host a caller picked freely.
+
+Tenants of the configured origin go through the server's transport
+(balancer, cassettes, fault plan) and ``DOLIBARR_UNIX_SOCKET`` like the
+server's own client; tenants of other hosts use plain HTTP.
+"""
+
+import hashlib
+import time
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterator, Dict, Iterable, Mapping, Optional, Tuple
+from urllib.parse import urlsplit
+
+import aiohttp
+
+from .capabilities import CapabilityCache
+from .config import Config
+from .cursors import CursorStore
+from .dolibarr_client import DolibarrClient
+from .transport import Transport
+
+URL_HEADER = "x-dolibarr-url"
+API_KEY_HEADER = "x-dolibarr-api-key"
+
+HostKey = Tuple[str, str, Optional[int]]
+
+DEFAULT_PORTS = {"http": 80, "https": 443}
+
+
+class TenantError(ValueError):
+    """Tenant headers that cannot be served (unknown host, invalid URL)."""
+
+
+def host_key(url: str) -> HostKey:
+    """Origin of ``url``: scheme, host and port (the scheme's default if omitted)."""
+    parts = urlsplit(url)
+    scheme = parts.scheme.lower()
+    return scheme, (parts.hostname or "").lower(), parts.port or DEFAULT_PORTS.get(scheme)
+
+
+def allowed_host_key(entry: str) -> HostKey:
+    """Origin of a ``DOLIBARR_TENANT_ALLOWED_HOSTS`` entry; a bare host means https."""
+    entry = entry.strip()
+    return host_key(entry if "://" in entry else f"https://{entry}")
+
+
+@dataclass(frozen=True)
+class TenantKey:
+    """Credentials identifying one tenant."""
+
+    url: str
+    api_key: str = field(repr=False)
+
+    @property
+    def fingerprint(self) -> str:
+        """Short stable id for logs and metrics that does not reveal the key."""
+        return hashlib.sha256(f"{self.url}\0{self.api_key}".encode()).hexdigest()[:12]
+
+
+@dataclass
+class Tenant:
+    """Client and per-tenant state of one set of credentials."""
+
+    key: TenantKey
+    client: DolibarrClient
+    cursor_store: CursorStore
+    last_used: float = field(default_factory=time.monotonic)
+    active: int = 0
+
+
+_current: ContextVar[Optional[Tenant]] = ContextVar("dolibarr_mcp_tenant", default=None)
+
+
+def current_tenant() -> Optional[Tenant]:
+    """The tenant of the running tool call, if it was resolved from headers."""
+    return _current.get()
+
+
+class TenantPool:
+    """LRU pool of tenant clients sharing one connector per host."""
+
+    def __init__(
+        self,
+        config: Config,
+        max_clients: int = 32,
+        idle_seconds: float = 600.0,
+        allowed_hosts: Iterable[str] = (),
+    ) -> None:
+        self.config = config
+        self.max_clients = max_clients
+        self.idle_seconds = idle_seconds
+        self.home = host_key(config.dolibarr_url)
+        self.allowed_hosts = {allowed_host_key(host) for host in allowed_hosts if host.strip()}
+        self.allowed_hosts.add(self.home)
+        self.transport: Optional[Transport] = None
+        self.created = 0
+        self.evicted = 0
+        self._tenants: "OrderedDict[TenantKey, Tenant]" = OrderedDict()
+        self._connectors: Dict[HostKey, aiohttp.BaseConnector] = {}
+        self._borrowed: set = set()
+
+    @classmethod
+    def from_config(cls, config: Config) -> "TenantPool":
+        return cls(
+            config,
+            max_clients=config.tenant_max_clients,
+            idle_seconds=config.tenant_idle_seconds,
+            allowed_hosts=config.tenant_allowed_hosts.split(","),
+        )
+
+    def __len__(self) -> int:
+        return len(self._tenants)
+
+    def adopt_connector(self, url: str, connector: aiohttp.BaseConnector) -> None:
+        """Let tenants of ``url``'s host share an existing connector (not closed by the pool)."""
+        self._connectors[host_key(url)] = connector
+        self._borrowed.add(host_key(url))
+
+    def adopt_transport(self, transport: Optional[Transport]) -> None:
+        """Send requests of tenants on the configured origin through ``transport`` (not closed by the pool)."""
+        self.transport = transport
+
+    def resolve(self, headers: Mapping[str, str]) -> Optional[TenantKey]:
+        """Tenant named by request headers; None to use the server's own client."""
+        api_key = headers.get(API_KEY_HEADER, "").strip()
+        if not api_key:
+            return None
+        url = headers.get(URL_HEADER, "").strip() or self.config.dolibarr_url
+        try:
+            url = Config.validate_dolibarr_url(url)
+        except ValueError as e:
+            raise TenantError(str(e)) from None
+        scheme, host, port = host_key(url)
+        if (scheme, host, port) not in self.allowed_hosts:
+            raise TenantError(
+                f"Dolibarr host '{scheme}://{host}:{port}' is not allowed (see DOLIBARR_TENANT_ALLOWED_HOSTS)"
+            )
+        return TenantKey(url=url, api_key=api_key)
+
+    def _connector(self, url: str) -> aiohttp.BaseConnector:
+        key = host_key(url)
+        connector = self._connectors.get(key)
+        if connector is None or connector.closed:
+            if key == self.home and self.config.unix_socket:
+                connector = aiohttp.UnixConnector(path=self.config.unix_socket)
+            else:
+                connector = aiohttp.TCPConnector()
+            self._connectors[key] = connector
+            self._borrowed.discard(key)
+        return connector
+
+    def _create(self, key: TenantKey) -> Tenant:
+        config = self.config.model_copy(update={"dolibarr_url": key.url, "dolibarr_api_key": key.api_key})
+        home = host_key(key.url) == self.home
+        client = DolibarrClient(
+            config,
+            transport=self.transport if home else None,
+            capability_cache=CapabilityCache.from_config(config),
+            connector=self._connector(key.url),
+            entity=config.entity,
+            unix_socket=(config.unix_socket or None) if home else None,
+            count_max_rows=config.count_max_rows,
+            owns_transport=False,
+        )
+        store = CursorStore(ttl_seconds=config.cursor_ttl_seconds, max_total_rows=config.cursor_max_rows)
+        self.created += 1
+        return Tenant(key=key, client=client, cursor_store=store)
+
+    def _evictable(self, now: float) -> list:
+        """Idle tenants, then the least recently used ones beyond ``max_clients``."""
+        unused = [t for t in self._tenants.values() if t.active == 0]
+        evict = [t for t in unused if now - t.last_used >= self.idle_seconds]
+        excess = len(self._tenants) - len(evict) - self.max_clients
+        for tenant in unused:  # least recently used first
+            if excess <= 0:
+                break
+            if all(tenant is not t for t in evict):
+                evict.append(tenant)
+                excess -= 1
+        return evict
+
+    async def _close(self, tenants: Iterable[Tenant]) -> None:
+        for tenant in tenants:
+            await tenant.client.close_session()
+
+    @asynccontextmanager
+    async def lease(self, key: TenantKey) -> AsyncIterator[Tenant]:
+        """Use the tenant of ``key`` for the duration of the block."""
+        tenant = self._tenants.get(key)
+        if tenant is None:
+            tenant = self._create(key)
+            self._tenants[key] = tenant
+        self._tenants.move_to_end(key)
+        tenant.active += 1
+        token = _current.set(tenant)
+        try:
+            evicted = self._evictable(time.monotonic())
+            for old in evicted:
+                del self._tenants[old.key]
+            self.evicted += len(evicted)
+            await self._close(evicted)
+            yield tenant
+        finally:
+            _current.reset(token)
+            tenant.active -= 1
+            tenant.last_used = time.monotonic()
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "tenants": len(self._tenants),
+            "max_clients": self.max_clients,
+            "created": self.created,
+            "evicted": self.evicted,
+            "hosts": len(self._connectors),
+            "active_calls": sum(t.active for t in self._tenants.values()),
+        }
+
+    async def close(self) -> None:
+        """Close every tenant client and the connectors the pool created."""
+        tenants, self._tenants = list(self._tenants.values()), OrderedDict()
+        await self._close(tenants)
+        for key, connector in self._connectors.items():
+            if key not in self._borrowed:
+                await connector.close()
+        self._connectors.clear()
+        self._borrowed.clear()
+
+
+_pool: Optional[TenantPool] = None
+
+
+def get_tenant_pool() -> Optional[TenantPool]:
+    """Get the tenant pool, None when tenant headers are disabled."""
+    return _pool
+
+
+def set_tenant_pool(pool: Optional[TenantPool]) -> None:
+    """Install (or clear with None) the tenant pool."""
+    global _pool
+    _pool = pool
@@ -1,3 +1,55 @@
-"""MCP Tools modules for Dolibarr."""
+"""MCP Tools modules for Dolibarr.
 
-# Tools will be imported and registered in server.py
+Tool modules are grouped into toolsets. A deployment enables the ones it needs
+with ``DOLIBARR_TOOLSETS`` (e.g. ``invoices,products``) and only those modules
+are imported and registered, which shortens startup and the ``tools/list``
+payload every session sends to the model.
+"""
+
+import importlib
+from typing import Any, Dict, List
+
+# toolset -> "module:register function"
+TOOLSETS: Dict[str, str] = {
+    "proposals": "proposals:register_proposal_tools",
+    "projects": "projects:register_project_tools",
+    "customers": "customers:register_customer_tools",
+    "users": "users:register_user_tools",
+    "contacts": "contacts:register_contact_tools",
+    "invoices": "invoices:register_invoice_tools",
+    "orders": "orders:register_order_tools",
+    "products": "products:register_product_tools",
+    "system": "system:register_system_tools",
+    "cursors": "cursors:register_cursor_tools",
+    "documents": "documents:register_document_tools",
+    "changes": "changes:register_change_tools",
+    "admin": "admin:register_admin_tools",
+}
+
+# get_status and get_server_metrics back health checks and monitoring.
+ALWAYS_ENABLED = ("system",)
+
+
+def resolve_toolsets(spec: str) -> List[str]:
+    """Turn a comma-separated toolset list ("all" or empty for every toolset) into names.
+
+    Raises:
+        ValueError: For unknown toolset names
+    """
+    requested = {name.strip().lower() for name in spec.split(",") if name.strip()}
+    if not requested or "all" in requested:
+        return list(TOOLSETS)
+    unknown = requested - set(TOOLSETS)
+    if unknown:
+        raise ValueError(
+            f"Unknown toolset(s) {', '.join(sorted(unknown))}; choose from: {', '.join(TOOLSETS)}"
+        )
+    return [name for name in TOOLSETS if name in requested or name in ALWAYS_ENABLED]
+
+
+def register_toolsets(mcp: Any, names: List[str]) -> None:
+    """Import the modules of the given toolsets and register their tools."""
+    for name in names:
+        module_name, function_name = TOOLSETS[name].split(":")
+        module = importlib.import_module(f"{__name__}.{module_name}")
+        getattr(module, function_name)(mcp)
@@ -0,0 +1,72 @@
+"""Administrative tools for Dolibarr MCP Server.
+
+These inspect the MCP server process itself rather than Dolibarr data.
+"""
+
+from typing import Any, Dict, Optional
+
+from fastmcp import FastMCP
+from pydantic import Field
+
+from ..config import Config
+from ..profiling import ProfilerBusy, get_profiler
+from ..watchdog import Watchdog, get_watchdog
+
+
+def _config() -> Config:
+    from ..state import get_client
+    try:
+        return get_client().config
+    except RuntimeError:
+        return Config()
+
+
+# Used for memory diffs when the server runs without the watchdog task.
+_standalone_watchdog: Optional[Watchdog] = None
+
+
+def _watchdog() -> Watchdog:
+    global _standalone_watchdog
+    watchdog = get_watchdog()
+    if watchdog is not None:
+        return watchdog
+    if _standalone_watchdog is None:
+        _standalone_watchdog = Watchdog(tracemalloc_frames=_config().tracemalloc_frames)
+    return _standalone_watchdog
+
+
+def register_admin_tools(mcp: FastMCP) -> None:
+    """Register the server administration tools."""
+
+    @mcp.tool()
+    async def start_profiling(
+        calls: Optional[int] = Field(None, ge=1, le=10000, description="Profile the next N tool calls"),
+        seconds: Optional[float] = Field(None, gt=0, le=3600, description="Profile for T seconds")
+    ) -> Dict[str, Any]:
+        """Profile the next tool calls with cProfile (one .pstats file per tool).
+
+        Stops by itself once `calls` or `seconds` is reached (whichever comes
+        first); without either, profiling runs until `stop_profiling`.
+        """
+        try:
+            profiler = get_profiler()
+            directory = profiler.default_dir or _config().profile_dir
+            return profiler.start(directory, calls=calls, seconds=seconds)
+        except ProfilerBusy as e:
+            raise ValueError(str(e)) from e
+
+    @mcp.tool()
+    async def stop_profiling() -> Dict[str, Any]:
+        """Stop profiling and write the collected per-tool .pstats files."""
+        return get_profiler().stop()
+
+    @mcp.tool()
+    async def dump_memory_diff(
+        top: int = Field(10, ge=1, le=100, description="Number of allocation sites to return")
+    ) -> Dict[str, Any]:
+        """Compare a tracemalloc snapshot with the previous one.
+
+        The first call starts tracemalloc and records a baseline; later calls
+        return the largest allocation sites and what grew since the last call.
+        """
+        return _watchdog().memory_diff(limit=top)
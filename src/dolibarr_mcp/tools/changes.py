@@ -0,0 +1,80 @@
+"""Change-feed tools for Dolibarr MCP Server.
+
+`get_changes` returns the rows modified after a watermark, ordered by
+modification time and row id, so polling cost follows the change rate rather
+than the table size.
+"""
+
+from typing import Any, Dict, Literal, Type
+from zoneinfo import ZoneInfo
+
+from fastmcp import FastMCP
+from pydantic import BaseModel, Field
+
+from ..dolibarr_client import DolibarrAPIError, DolibarrClient
+from ..filters import build_changed_since_filter, parse_watermark, watermark_from_row
+from ..models import ChangesResult
+from ..resources import get_resource
+
+
+def _require_client() -> DolibarrClient:
+    from ..state import get_client
+    return get_client()
+
+
+def _change_item(model: Type[BaseModel], row: Dict[str, Any]) -> Dict[str, Any]:
+    """Project a row through the resource model, keeping the modification time the watermark uses."""
+    item = model(**row).model_dump(mode="json")
+    item["date_modification"] = row.get("date_modification") or row.get("tms")
+    return item
+
+
+def register_change_tools(mcp: FastMCP) -> None:
+    """Register the change-feed tools."""
+
+    @mcp.tool()
+    async def get_changes(
+        resource: Literal["customers", "products", "invoices", "orders", "proposals"] = Field(..., description="Resource to poll"),
+        since: str = Field(..., description="Watermark from the previous call, or a date/ISO datetime/unix timestamp for the first poll"),
+        limit: int = Field(100, ge=1, le=500, description="Maximum number of changed rows")
+    ) -> ChangesResult:
+        """Get rows created or modified since a watermark.
+
+        Returns the changes oldest first plus a new watermark. Store the
+        watermark and pass it as `since` on the next poll; if `has_more` is
+        true, poll again right away.
+        """
+        client = _require_client()
+        spec = get_resource(resource)
+        tz = ZoneInfo(client.config.server_timezone)
+
+        start = parse_watermark(since, tz)
+        params = {
+            "limit": limit,
+            "sqlfilters": build_changed_since_filter(start),
+            "sortfield": "t.tms,t.rowid",
+            "sortorder": "ASC,ASC",
+        }
+        try:
+            result = await client.request("GET", spec.endpoint, params=params)
+        except DolibarrAPIError as e:
+            # Older Dolibarr versions answer an empty list with 404.
+            if e.status_code != 404:
+                raise
+            result = []
+        rows = result if isinstance(result, list) else []
+
+        watermark = start
+        if rows:
+            watermark = watermark_from_row(rows[-1], tz)
+            if watermark is None:
+                raise RuntimeError(
+                    f"Dolibarr did not return modification timestamps for {resource}; cannot advance the watermark"
+                )
+
+        return ChangesResult(
+            resource=resource,
+            items=[_change_item(spec.model, row) for row in rows],
+            watermark=watermark.encode(),
+            has_more=len(rows) >= limit,
+        )
@@ -0,0 +1,80 @@
+"""Cursor tools for paging through large result sets.
+
+`open_cursor` scans a list endpoint once and keeps the rows in a server-side
+snapshot; `next_page` then serves further pages from memory instead of asking
+Dolibarr again with a growing offset.
+"""
+
+from typing import Optional
+
+from fastmcp import FastMCP
+from pydantic import Field
+
+from ..cursors import CursorError
+from ..dolibarr_client import DolibarrClient
+from ..filters import build_usf_eq_filter
+from ..models import CursorPage
+from ..resources import ResourceName, get_resource
+
+
+def _require_client() -> DolibarrClient:
+    from ..state import get_client
+    return get_client()
+
+
+def _cursor_store():
+    from ..state import get_cursor_store
+    return get_cursor_store()
+
+
+def register_cursor_tools(mcp: FastMCP) -> None:
+    """Register the cursor (snapshot paging) tools."""
+
+    @mcp.tool()
+    async def open_cursor(
+        resource: ResourceName = Field(..., description="Resource to page through"),
+        page_size: int = Field(50, ge=1, le=100, description="Rows returned per page"),
+        customer_id: Optional[int] = Field(None, description="Only rows of this customer (documents, projects, contacts)"),
+        status: Optional[str] = Field(None, description="Status filter passed to Dolibarr (e.g. draft, unpaid, paid)"),
+        max_rows: int = Field(10000, ge=1, le=100000, description="Upper bound of rows captured in the snapshot")
+    ) -> CursorPage:
+        """Snapshot a full result set and return its first page plus a cursor.
+
+        Pass `next_cursor` to `next_page` to continue. The snapshot expires
+        after a period of inactivity; open a new cursor if that happens.
+        """
+        client = _require_client()
+        spec = get_resource(resource)
+
+        params = {}
+        if status:
+            params["status"] = status
+        if customer_id:
+            if not spec.customer_field:
+                raise ValueError(f"Resource '{resource}' cannot be filtered by customer")
+            params["sqlfilters"] = build_usf_eq_filter(spec.customer_field, customer_id)
+
+        page_size_scan = client.config.cursor_scan_page_size
+        rows, truncated = await client.scan(spec.endpoint, params=params, page_size=page_size_scan, max_rows=max_rows)
+        items = [spec.model(**row).model_dump(mode="json") for row in rows]
+        return _cursor_store().open(resource, items, page_size=page_size, truncated=truncated)
+
+    @mcp.tool()
+    async def next_page(
+        cursor: str = Field(..., description="Cursor returned by open_cursor or a previous next_page")
+    ) -> CursorPage:
+        """Return the next page of a cursor snapshot without querying Dolibarr."""
+        try:
+            return _cursor_store().next_page(cursor)
+        except CursorError as e:
+            raise ValueError(str(e)) from e
+
+    @mcp.tool()
+    async def close_cursor(
+        cursor: str = Field(..., description="Any cursor of the snapshot to release")
+    ) -> bool:
+        """Release a cursor snapshot early. Returns False if it had already expired."""
+        try:
+            return _cursor_store().close(cursor)
+        except CursorError as e:
+            raise ValueError(str(e)) from e
@@ -1,13 +1,14 @@
 """Customer tools for Dolibarr MCP Server."""
 
 import re
-from typing import List, Optional
+from typing import Annotated, List, Optional
 
 from fastmcp import FastMCP
 from pydantic import Field
 
 from ..dolibarr_client import DolibarrClient, DolibarrAPIError
 from ..models import CustomerResult
+from ..multicompany import fan_out, parse_entities
 
 
 def _require_client() -> DolibarrClient:
@@ -39,16 +40,26 @@ def register_customer_tools(mcp: FastMCP) -> None:
     @mcp.tool()
     async def search_customers(
         query: str = Field(..., description="Search term for name or alias"),
-        limit: int = Field(20, ge=1, le=100, description="Maximum number of results")
+        limit: int = Field(20, ge=1, le=100, description="Maximum number of results (per entity)"),
+        entities: Annotated[
+            Optional[List[int]],
+            Field(description="Multicompany entities to search in parallel (default: the current entity)"),
+        ] = None,
     ) -> List[CustomerResult]:
-        """Search customers by name or alias."""
+        """Search customers by name or alias, optionally across several Multicompany entities."""
         client = _require_client()
-            
+        entities = parse_entities(entities)
+
         query_sanitized = _sanitize_search(query)
         sqlfilters = f"((t.nom:like:'%{query_sanitized}%') or (t.name_alias:like:'%{query_sanitized}%'))"
         
         try:
-            result = await client.search_customers(sqlfilters=sqlfilters, limit=limit)
+            if entities:
+                result = (await fan_out(
+                    client, entities, lambda c: c.search_customers(sqlfilters=sqlfilters, limit=limit)
+                )).rows
+            else:
+                result = await client.search_customers(sqlfilters=sqlfilters, limit=limit)
             return [CustomerResult(**item) for item in result]
         except DolibarrAPIError as e:
             raise RuntimeError(f"Dolibarr API Error: {e.message}")
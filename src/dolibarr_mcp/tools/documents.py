@@ -0,0 +1,75 @@
+"""Cross-document tools for Dolibarr MCP Server.
+
+Top-N queries ("the 10 most recent invoices", "the 5 largest open orders")
+sort in Dolibarr and request exactly N rows instead of over-fetching a page
+and sorting it in the agent's context.
+"""
+
+from typing import Literal, Optional
+
+from fastmcp import FastMCP
+from pydantic import Field
+
+from ..dolibarr_client import DolibarrClient
+from ..filters import (
+    DocumentFilter,
+    compile_document_filter,
+    order_status_code,
+    proposal_status_code,
+)
+from ..models import TopDocumentsResult
+from ..resources import get_resource
+
+
+def _require_client() -> DolibarrClient:
+    from ..state import get_client
+    return get_client()
+
+
+def register_document_tools(mcp: FastMCP) -> None:
+    """Register the cross-document (top-N) tools."""
+
+    @mcp.tool()
+    async def get_top_documents(
+        document: Literal["invoices", "orders", "proposals"] = Field(..., description="Document type"),
+        rank_by: Literal["latest", "largest"] = Field("latest", description="latest = newest date first, largest = highest total_ttc first"),
+        n: int = Field(10, ge=1, le=100, description="Number of documents to return"),
+        status: Optional[str] = Field(None, description="Status filter (invoices: draft/unpaid/paid; orders: draft/validated/in_progress/delivered/canceled; proposals: draft/open/signed/declined/billed)"),
+        customer_id: Optional[int] = Field(None, description="Filter by customer ID")
+    ) -> TopDocumentsResult:
+        """Return the N most recent or largest invoices, orders or proposals.
+
+        Sorting and limiting happen in Dolibarr, so exactly N rows are transferred.
+        """
+        client = _require_client()
+
+        spec = DocumentFilter(
+            customer_id=customer_id,
+            sort_by="date" if rank_by == "latest" else "amount",
+            sort_order="desc",
+        )
+        if status and document == "orders":
+            spec.status = order_status_code(status)
+        elif status and document == "proposals":
+            spec.status = proposal_status_code(status)
+        query = compile_document_filter(document, spec)
+
+        kwargs = {
+            "limit": n,
+            "sqlfilters": query.sqlfilters,
+            "sortfield": query.sortfield,
+            "sortorder": query.sortorder,
+        }
+        if document == "invoices":
+            rows = await client.get_invoices(status=status, **kwargs)
+        elif document == "orders":
+            rows = await client.get_orders(**kwargs)
+        else:
+            rows = await client.get_proposals(**kwargs)
+
+        model = get_resource(document).model
+        return TopDocumentsResult(
+            document=document,
+            rank_by=rank_by,
+            items=[model(**row) for row in rows[:n]],
+        )
@@ -1,12 +1,15 @@
 """Invoice tools for Dolibarr MCP Server."""
 
-from typing import List, Optional
+import asyncio
+from typing import Annotated, Dict, List, Optional
 
 from fastmcp import FastMCP
 from pydantic import Field
 
 from ..dolibarr_client import DolibarrClient
-from ..models import InvoiceResult, InvoiceLine
+from ..filters import DocumentFilter, SortKey, SortOrder, compile_document_filter
+from ..models import CountResult, InvoiceResult, InvoiceLine, line_payload
+from ..multicompany import fan_out, parse_entities
 
 
 def _require_client() -> DolibarrClient:
@@ -41,28 +44,16 @@ def register_invoice_tools(mcp: FastMCP) -> None:
         if payment_mode_id:
             payload["mode_reglement_id"] = payment_mode_id
                 
+        api_lines = [line_payload(line) for line in lines]
+        if (await client.capabilities()).lines_in_post:
+            # 2a. Header and lines in one request
+            return await client.create_invoice(payload, lines=api_lines)
+
         invoice_id = await client.create_invoice(payload)
         
-        # 2. Add lines individually
+        # 2b. Add lines individually
         try:
-            for line in lines:
-                line_data = line.model_dump(exclude_none=True)
-                
-                # Map fields to Dolibarr API format
-                api_line = {}
-                if "description" in line_data:
-                    api_line["desc"] = line_data["description"]
-                if "unit_price" in line_data:
-                    api_line["subprice"] = str(line_data["unit_price"])
-                if "quantity" in line_data:
-                    api_line["qty"] = str(line_data["quantity"])
-                if "vat_rate" in line_data:
-                    api_line["tva_tx"] = str(line_data["vat_rate"])
-                if "product_id" in line_data:
-                    api_line["fk_product"] = line_data["product_id"]
-                if "product_type" in line_data:
-                    api_line["product_type"] = line_data["product_type"]
-                    
+            for api_line in api_lines:
                 await client.add_invoice_line(invoice_id, api_line)
         except Exception:
             # Rollback: delete the invoice if line addition fails
@@ -71,6 +62,14 @@ def register_invoice_tools(mcp: FastMCP) -> None:
             
         return invoice_id
 
+    @mcp.tool()
+    async def create_invoice_from_order(
+        order_id: int = Field(..., description="Order ID to invoice")
+    ) -> int:
+        """Create a draft invoice with the customer, project and lines of an order. Returns the new invoice ID."""
+        client = _require_client()
+        return int(await client.create_invoice_from_order(order_id))
+
     @mcp.tool()
     async def add_invoice_line(
         invoice_id: int = Field(..., description="Invoice ID"),
@@ -104,14 +103,91 @@ def register_invoice_tools(mcp: FastMCP) -> None:
     @mcp.tool()
     async def get_invoices(
         limit: int = Field(100, ge=1, le=100, description="Maximum number of invoices"),
-        status: Optional[str] = Field(None, description="Filter by status (draft, unpaid, paid)")
+        status: Optional[str] = Field(None, description="Filter by status (draft, unpaid, paid)"),
+        page: int = Field(0, ge=0, description="Page number (starts at 0)"),
+        date_from: Optional[str] = Field(None, description="Only documents dated on or after this day (YYYY-MM-DD)"),
+        date_to: Optional[str] = Field(None, description="Only documents dated on or before this day (YYYY-MM-DD)"),
+        customer_id: Optional[int] = Field(None, description="Filter by customer ID"),
+        min_total_ttc: Optional[float] = Field(None, description="Minimum gross total"),
+        max_total_ttc: Optional[float] = Field(None, description="Maximum gross total"),
+        ref_prefix: Optional[str] = Field(None, max_length=40, description="Reference starts with this text"),
+        project_id: Optional[int] = Field(None, description="Filter by project ID"),
+        sort_by: Optional[SortKey] = Field(None, description="Sort by date, amount, ref or id"),
+        sort_order: SortOrder = Field("desc", description="Sort direction (asc or desc)"),
+        entities: Annotated[
+            Optional[List[int]],
+            Field(description="Multicompany entities to query in parallel (default: the current entity)"),
+        ] = None,
     ) -> List[InvoiceResult]:
-        """Get a list of invoices."""
+        """Get a list of invoices.
+        
+        All filters are evaluated by Dolibarr (sqlfilters), e.g. this month's
+        invoices of one customer above a given amount in a single request.
+        With ``entities`` each entity is queried concurrently and returns up
+        to ``limit`` invoices; results are grouped by entity.
+        """
         client = _require_client()
-            
-        result = await client.get_invoices(limit=limit, status=status)
+        entities = parse_entities(entities)
+
+        query = compile_document_filter("invoices", DocumentFilter(
+            date_from=date_from,
+            date_to=date_to,
+            customer_id=customer_id,
+            min_total_ttc=min_total_ttc,
+            max_total_ttc=max_total_ttc,
+            ref_prefix=ref_prefix,
+            project_id=project_id,
+            sort_by=sort_by,
+            sort_order=sort_order,
+        ))
+
+        async def fetch(entity_client: DolibarrClient) -> List[Dict]:
+            return await entity_client.get_invoices(
+                limit=limit,
+                status=status,
+                page=page,
+                sqlfilters=query.sqlfilters,
+                sortfield=query.sortfield,
+                sortorder=query.sortorder,
+            )
+
+        if entities:
+            result = (await fan_out(client, entities, fetch)).rows
+        else:
+            result = await fetch(client)
         return [InvoiceResult(**item) for item in result]
 
+    @mcp.tool()
+    async def count_invoices(
+        status: Optional[str] = Field(None, description="Filter by status (draft, unpaid, paid)"),
+        customer_id: Optional[int] = Field(None, description="Filter by customer ID")
+    ) -> CountResult:
+        """Count invoices without fetching them (e.g. "how many unpaid invoices")."""
+        client = _require_client()
+
+        params = {}
+        if status:
+            params["status"] = status
+        if customer_id:
+            params["thirdparty_ids"] = str(customer_id)
+
+        total, method, truncated = await client.count("invoices", params=params)
+        return CountResult(resource="invoices", total=total, method=method, truncated=truncated)
+
+    @mcp.tool()
+    async def get_invoice_summary(
+        customer_id: Optional[int] = Field(None, description="Restrict the summary to one customer")
+    ) -> Dict[str, int]:
+        """Count invoices per status (draft, unpaid, paid) in parallel."""
+        client = _require_client()
+
+        statuses = ["draft", "unpaid", "paid"]
+        base = {"thirdparty_ids": str(customer_id)} if customer_id else {}
+        results = await asyncio.gather(
+            *(client.count("invoices", params={**base, "status": status}) for status in statuses)
+        )
+        return {status: total for status, (total, _, _) in zip(statuses, results)}
+
     @mcp.tool()
     async def get_invoice_by_id(
         invoice_id: int = Field(..., description="Invoice ID")
@@ -6,7 +6,8 @@ from fastmcp import FastMCP
 from pydantic import Field
 
 from ..dolibarr_client import DolibarrClient
-from ..models import OrderResult, InvoiceLine
+from ..filters import DocumentFilter, SortKey, SortOrder, compile_document_filter
+from ..models import CountResult, OrderResult, InvoiceLine, line_payload
 
 
 def _require_client() -> DolibarrClient:
@@ -21,14 +22,64 @@ def register_order_tools(mcp: FastMCP) -> None:
     async def get_orders(
         limit: int = Field(100, ge=1, le=100, description="Maximum number of orders"),
         page: int = Field(0, ge=0, description="Page number (starts at 0)"),
-        status: Optional[int] = Field(None, description="Filter by status")
+        status: Optional[int] = Field(None, description="Filter by status (-1=Canceled, 0=Draft, 1=Validated, 2=In progress, 3=Delivered)"),
+        date_from: Optional[str] = Field(None, description="Only documents dated on or after this day (YYYY-MM-DD)"),
+        date_to: Optional[str] = Field(None, description="Only documents dated on or before this day (YYYY-MM-DD)"),
+        customer_id: Optional[int] = Field(None, description="Filter by customer ID"),
+        min_total_ttc: Optional[float] = Field(None, description="Minimum gross total"),
+        max_total_ttc: Optional[float] = Field(None, description="Maximum gross total"),
+        ref_prefix: Optional[str] = Field(None, max_length=40, description="Reference starts with this text"),
+        project_id: Optional[int] = Field(None, description="Filter by project ID"),
+        sort_by: Optional[SortKey] = Field(None, description="Sort by date, amount, ref or id"),
+        sort_order: SortOrder = Field("desc", description="Sort direction (asc or desc)")
     ) -> List[OrderResult]:
-        """Get a paginated list of orders."""
+        """Get a paginated list of orders.
+        
+        All filters are evaluated by Dolibarr (sqlfilters).
+        """
         client = _require_client()
-            
-        result = await client.get_orders(limit=limit, page=page, status=status)
+
+        query = compile_document_filter("orders", DocumentFilter(
+            date_from=date_from,
+            date_to=date_to,
+            customer_id=customer_id,
+            min_total_ttc=min_total_ttc,
+            max_total_ttc=max_total_ttc,
+            ref_prefix=ref_prefix,
+            project_id=project_id,
+            status=status,
+            sort_by=sort_by,
+            sort_order=sort_order,
+        ))
+
+        result = await client.get_orders(
+            limit=limit,
+            page=page,
+            sqlfilters=query.sqlfilters,
+            sortfield=query.sortfield,
+            sortorder=query.sortorder,
+        )
         return [OrderResult(**item) for item in result]
 
+    @mcp.tool()
+    async def count_orders(
+        status: Optional[int] = Field(None, description="Filter by status (-1=Canceled, 0=Draft, 1=Validated, 2=In progress, 3=Delivered)"),
+        customer_id: Optional[int] = Field(None, description="Filter by customer ID")
+    ) -> CountResult:
+        """Count orders without fetching them."""
+        client = _require_client()
+
+        # The orders endpoint has no status parameter; filter on fk_statut.
+        query = compile_document_filter("orders", DocumentFilter(status=status))
+        params = {}
+        if query.sqlfilters:
+            params["sqlfilters"] = query.sqlfilters
+        if customer_id:
+            params["thirdparty_ids"] = str(customer_id)
+
+        total, method, truncated = await client.count("orders", params=params)
+        return CountResult(resource="orders", total=total, method=method, truncated=truncated)
+
     @mcp.tool()
     async def get_order_by_id(
         order_id: int = Field(..., description="Order ID")
@@ -68,24 +119,7 @@ def register_order_tools(mcp: FastMCP) -> None:
         # 2. Add lines individually
         try:
             for line in lines:
-                line_data = line.model_dump(exclude_none=True)
-                
-                # Map fields to Dolibarr API format
-                api_line = {}
-                if "description" in line_data:
-                    api_line["desc"] = line_data["description"]
-                if "unit_price" in line_data:
-                    api_line["subprice"] = str(line_data["unit_price"])
-                if "quantity" in line_data:
-                    api_line["qty"] = str(line_data["quantity"])
-                if "vat_rate" in line_data:
-                    api_line["tva_tx"] = str(line_data["vat_rate"])
-                if "product_id" in line_data:
-                    api_line["fk_product"] = line_data["product_id"]
-                if "product_type" in line_data:
-                    api_line["product_type"] = line_data["product_type"]
-                    
-                await client.add_order_line(order_id, api_line)
+                await client.add_order_line(order_id, line_payload(line))
         except Exception:
             # Rollback: delete the order if line addition fails
             await client.delete_order(order_id)
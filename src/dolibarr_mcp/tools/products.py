@@ -1,12 +1,13 @@
 """Product tools for Dolibarr MCP Server."""
 
 import re
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Literal, Optional
 
 from fastmcp import FastMCP
 from pydantic import Field
 
 from ..dolibarr_client import DolibarrClient, DolibarrAPIError
+from ..filters import PRODUCT_SORT_COLUMNS, SortOrder
 from ..models import ProductResult
 
 
@@ -92,12 +93,21 @@ def register_product_tools(mcp: FastMCP) -> None:
     async def get_products(
         limit: int = Field(100, ge=1, le=100, description="Maximum number of products"),
         page: int = Field(0, ge=0, description="Page number (starts at 0)"),
-        category_id: Optional[int] = Field(None, description="Filter by category ID")
+        category_id: Optional[int] = Field(None, description="Filter by category ID"),
+        sort_by: Optional[Literal["ref", "label", "price", "date", "id"]] = Field(None, description="Sort column"),
+        sort_order: SortOrder = Field("asc", description="Sort direction (asc or desc)")
     ) -> List[ProductResult]:
-        """Get a paginated list of products."""
+        """Get a paginated list of products, optionally sorted by Dolibarr."""
         client = _require_client()
-            
-        result = await client.get_products(limit=limit, page=page, category_id=category_id)
+
+        sortfield = PRODUCT_SORT_COLUMNS[sort_by] if sort_by else None
+        result = await client.get_products(
+            limit=limit,
+            page=page,
+            category_id=category_id,
+            sortfield=sortfield,
+            sortorder=sort_order.upper(),
+        )
         return [ProductResult(**item) for item in result]
 
     @mcp.tool()
@@ -1,12 +1,16 @@
 """Project tools for Dolibarr MCP Server."""
 
-import re
 from typing import List, Optional
 
 from fastmcp import FastMCP
 from pydantic import Field
 
 from ..dolibarr_client import DolibarrClient
+from ..filters import (
+    build_usf_eq_filter as _build_usf_eq_filter,
+    build_usf_like_filter as _build_usf_like_filter,
+    sanitize_search as _sanitize_search,
+)
 from ..models import ProjectSearchResult
 
 
@@ -15,45 +19,6 @@ def _require_client() -> DolibarrClient:
     return get_client()
 
 
-def _sanitize_search(s: str) -> str:
-    """Sanitize search input to prevent SQL injection."""
-    s = s.strip()
-    s = re.sub(r"[^0-9A-Za-z äöüÄÖÜß._\-@/+,&#()]", "", s)
-    return s[:80]
-
-
-def _build_usf_like_filter(field: str, value: str) -> str:
-    """Build a Universal Search Filter (USF) like-filter.
-    
-    Format: (field:like:'%value%')
-    See: docs/developer/DOLIBARR_USF_SYNTAX.md
-    
-    Args:
-        field: Database field with table alias (e.g., 't.ref', 't.title')
-        value: Search value (will be wrapped in wildcards)
-    
-    Returns:
-        USF-formatted filter string
-    """
-    return f"({field}:like:'%{value}%')"
-
-
-def _build_usf_eq_filter(field: str, value: int | str) -> str:
-    """Build a Universal Search Filter (USF) equality filter.
-    
-    Format: (field:=:value)
-    See: docs/developer/DOLIBARR_USF_SYNTAX.md
-    
-    Args:
-        field: Database field with table alias (e.g., 't.fk_soc')
-        value: Exact value (int or str, will not be quoted)
-    
-    Returns:
-        USF-formatted filter string
-    """
-    return f"({field}:=:{value})"
-
-
 def register_project_tools(mcp: FastMCP) -> None:
     """Register all project-related tools."""
     
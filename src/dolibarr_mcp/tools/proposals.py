@@ -7,7 +7,8 @@ from fastmcp import FastMCP
 from pydantic import Field
 
 from ..dolibarr_client import DolibarrClient
-from ..models import ProposalResult, ProposalLine, InvoiceLine
+from ..filters import DocumentFilter, SortKey, SortOrder, compile_document_filter, proposal_status_code
+from ..models import CountResult, ProposalResult, ProposalLine, InvoiceLine, line_payload
 
 
 def _require_client() -> DolibarrClient:
@@ -24,26 +25,66 @@ def register_proposal_tools(mcp: FastMCP) -> None:
         limit: int = Field(100, ge=1, le=100, description="Maximum number of proposals"),
         status: Optional[str] = Field(None, description="Filter by status"),
         project_id: Optional[int] = Field(None, description="Filter by project ID"),
-        customer_id: Optional[int] = Field(None, description="Filter by customer ID")
+        customer_id: Optional[int] = Field(None, description="Filter by customer ID"),
+        page: int = Field(0, ge=0, description="Page number (starts at 0)"),
+        date_from: Optional[str] = Field(None, description="Only proposals dated on or after this day (YYYY-MM-DD)"),
+        date_to: Optional[str] = Field(None, description="Only proposals dated on or before this day (YYYY-MM-DD)"),
+        min_total_ttc: Optional[float] = Field(None, description="Minimum gross total"),
+        max_total_ttc: Optional[float] = Field(None, description="Maximum gross total"),
+        ref_prefix: Optional[str] = Field(None, max_length=40, description="Reference starts with this text"),
+        sort_by: Optional[SortKey] = Field(None, description="Sort by date, amount, ref or id"),
+        sort_order: SortOrder = Field("desc", description="Sort direction (asc or desc)")
     ) -> List[ProposalResult]:
         """Get a list of proposals (quotes) with optional filtering.
         
         Status values: draft, open, signed, declined, billed.
-        Can combine multiple filters.
+        Can combine multiple filters; all of them are evaluated by Dolibarr.
         """
         client = _require_client()
-        
-        thirdparty_ids = str(customer_id) if customer_id else None
-        
-        filters = []
-        if project_id:
-            filters.append(f"(t.fk_projet:=:{project_id})")
-        
-        sqlfilters = " AND ".join(filters) if filters else None
-        
-        result = await client.get_proposals(limit=limit, status=status, sqlfilters=sqlfilters, thirdparty_ids=thirdparty_ids)
+
+        query = compile_document_filter("proposals", DocumentFilter(
+            date_from=date_from,
+            date_to=date_to,
+            customer_id=customer_id,
+            min_total_ttc=min_total_ttc,
+            max_total_ttc=max_total_ttc,
+            ref_prefix=ref_prefix,
+            project_id=project_id,
+            status=proposal_status_code(status) if status else None,
+            sort_by=sort_by,
+            sort_order=sort_order,
+        ))
+
+        result = await client.get_proposals(
+            limit=limit,
+            page=page,
+            sqlfilters=query.sqlfilters,
+            sortfield=query.sortfield,
+            sortorder=query.sortorder,
+        )
         return [ProposalResult(**item) for item in result]
 
+    @mcp.tool()
+    async def count_proposals(
+        status: Optional[str] = Field(None, description="Filter by status (draft, open, signed, declined, billed)"),
+        customer_id: Optional[int] = Field(None, description="Filter by customer ID")
+    ) -> CountResult:
+        """Count proposals without fetching them (e.g. open proposals of a customer)."""
+        client = _require_client()
+
+        # The proposals endpoint has no status parameter; filter on fk_statut.
+        query = compile_document_filter("proposals", DocumentFilter(
+            status=proposal_status_code(status) if status else None,
+        ))
+        params = {}
+        if query.sqlfilters:
+            params["sqlfilters"] = query.sqlfilters
+        if customer_id:
+            params["thirdparty_ids"] = str(customer_id)
+
+        total, method, truncated = await client.count("proposals", params=params)
+        return CountResult(resource="proposals", total=total, method=method, truncated=truncated)
+
     @mcp.tool()
     async def get_proposal_by_id(
         proposal_id: int = Field(..., description="Proposal ID")
@@ -84,24 +125,7 @@ def register_proposal_tools(mcp: FastMCP) -> None:
         if lines:
             try:
                 for line in lines:
-                    line_data = line.model_dump(exclude_none=True)
-                    
-                    # Map fields to Dolibarr API format
-                    api_line = {}
-                    if "description" in line_data:
-                        api_line["desc"] = line_data["description"]
-                    if "unit_price" in line_data:
-                        api_line["subprice"] = str(line_data["unit_price"])
-                    if "quantity" in line_data:
-                        api_line["qty"] = str(line_data["quantity"])
-                    if "vat_rate" in line_data:
-                        api_line["tva_tx"] = str(line_data["vat_rate"])
-                    if "product_id" in line_data:
-                        api_line["fk_product"] = line_data["product_id"]
-                    if "product_type" in line_data:
-                        api_line["product_type"] = line_data["product_type"]
-                        
-                    await client.add_proposal_line(proposal_id, api_line)
+                    await client.add_proposal_line(proposal_id, line_payload(line))
             except Exception:
                 # Rollback: delete the proposal if line addition fails
                 await client.delete_proposal(proposal_id)
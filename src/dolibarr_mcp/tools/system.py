@@ -5,7 +5,7 @@ from typing import Any, Dict
 from fastmcp import FastMCP
 from pydantic import Field
 
-from ..dolibarr_client import DolibarrClient
+from ..dolibarr_client import DolibarrAPIError, DolibarrClient
 
 
 def _require_client() -> DolibarrClient:
@@ -18,7 +18,61 @@ def register_system_tools(mcp: FastMCP) -> None:
     
     @mcp.tool()
     async def get_status() -> Dict[str, Any]:
-        """Get Dolibarr system status and version information."""
+        """Get Dolibarr system status and version information.
+
+        ``readiness`` reports the server's background warm-up (connection
+        test, pooled connections, reference data) and ``capabilities`` the
+        optional API features detected on the backend, once probed. Until
+        the warm-up has reached Dolibarr, or when the status request fails,
+        only ``readiness`` (with ``last_error``) is returned.
+        """
+        from ..tenants import current_tenant
+        from ..warmup import get_warmup
         client = _require_client()
-            
-        return await client.get_status()
+
+        # The warm-up checks the configured backend; tenants bring their own.
+        warmup = get_warmup() if current_tenant() is None else None
+        if warmup and not warmup.readiness.connected:
+            # The warm-up is already retrying; don't block on the same timeouts.
+            return {"readiness": warmup.readiness.snapshot()}
+        try:
+            result = await client.get_status()
+        except DolibarrAPIError as e:
+            if not warmup:
+                raise
+            readiness = warmup.readiness.snapshot()
+            readiness["last_error"] = str(e)
+            return {"readiness": readiness}
+        if warmup and isinstance(result, dict):
+            result["readiness"] = warmup.readiness.snapshot()
+        capabilities = client.capability_cache.cached
+        if capabilities and isinstance(result, dict):
+            result["capabilities"] = capabilities.snapshot()
+        return result
+
+    @mcp.tool()
+    async def get_server_metrics() -> Dict[str, Any]:
+        """Get request metrics of this MCP server's Dolibarr client.
+
+        Returns per-endpoint request/error counts, bytes and p50/p95/p99
+        latency, connection-pool queue wait and reuse counters, the
+        process watchdog values (event-loop lag, RSS, alerts), per-frontend
+        load and health when several Dolibarr frontends are configured and,
+        with tenant headers enabled, the tenant pool counters. Calls made for
+        a tenant report that tenant's client.
+        """
+        from ..balancer import BalancingTransport
+        from ..tenants import get_tenant_pool
+        from ..watchdog import get_watchdog
+        client = _require_client()
+
+        result = client.metrics.snapshot()
+        watchdog = get_watchdog()
+        if watchdog:
+            result["process"] = watchdog.snapshot()
+        if isinstance(client.transport, BalancingTransport):
+            result["balancer"] = client.transport.snapshot()
+        tenants = get_tenant_pool()
+        if tenants:
+            result["tenants"] = tenants.snapshot()
+        return result
@@ -0,0 +1,352 @@
+"""Lightweight tracing for tool calls and the Dolibarr requests they make.
+
+The tool middleware opens a server span per MCP tool call, and
+:class:`~dolibarr_mcp.dolibarr_client.DolibarrClient` opens a client span per
+HTTP request, with child spans for connection-pool queue wait and JSON decoding.
+The active span travels in a :mod:`contextvars` variable, so concurrent tool
+calls on the HTTP transport keep separate traces.
+
+A trace is exported once its root span ends, in the OTLP/JSON encoding: either
+appended as one line to a file (``DOLIBARR_TRACE_FILE``) or posted to a
+collector (``DOLIBARR_TRACE_OTLP_ENDPOINT``). With neither configured the
+tracer is disabled and spans cost a single attribute lookup.
+"""
+
+import asyncio
+import json
+import logging
+import os
+import queue
+import secrets
+import threading
+import time
+import urllib.request
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from contextvars import ContextVar, Token
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterator, List, Literal, Optional
+
+logger = logging.getLogger(__name__)
+
+SpanKind = Literal["internal", "server", "client"]
+
+# OTLP enum values
+_OTLP_KIND = {"internal": 1, "server": 2, "client": 3}
+_STATUS_OK = 1
+_STATUS_ERROR = 2
+
+_current_span: ContextVar[Optional["Span"]] = ContextVar("dolibarr_mcp_span", default=None)
+
+
+@dataclass
+class Span:
+    """A timed operation within a trace."""
+
+    name: str
+    trace_id: str
+    span_id: str
+    parent_id: Optional[str] = None
+    kind: SpanKind = "internal"
+    start_ns: int = 0
+    end_ns: int = 0
+    attributes: Dict[str, Any] = field(default_factory=dict)
+    error: Optional[str] = None
+    _token: Optional[Token] = field(default=None, repr=False)
+
+    @property
+    def duration_ms(self) -> float:
+        return (self.end_ns - self.start_ns) / 1_000_000
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        self.attributes[key] = value
+
+    def record_error(self, error: Any) -> None:
+        """Mark the span as failed."""
+        self.error = str(error) or type(error).__name__
+
+    def to_otlp(self) -> Dict[str, Any]:
+        """Encode the span as an OTLP/JSON span object."""
+        span: Dict[str, Any] = {
+            "traceId": self.trace_id,
+            "spanId": self.span_id,
+            "name": self.name,
+            "kind": _OTLP_KIND[self.kind],
+            "startTimeUnixNano": str(self.start_ns),
+            "endTimeUnixNano": str(self.end_ns),
+            "attributes": [_otlp_attribute(k, v) for k, v in self.attributes.items()],
+            "status": (
+                {"code": _STATUS_ERROR, "message": self.error}
+                if self.error is not None
+                else {"code": _STATUS_OK}
+            ),
+        }
+        if self.parent_id:
+            span["parentSpanId"] = self.parent_id
+        return span
+
+
+def _otlp_attribute(key: str, value: Any) -> Dict[str, Any]:
+    if isinstance(value, bool):
+        encoded = {"boolValue": value}
+    elif isinstance(value, int):
+        encoded = {"intValue": str(value)}
+    elif isinstance(value, float):
+        encoded = {"doubleValue": value}
+    else:
+        encoded = {"stringValue": str(value)}
+    return {"key": key, "value": encoded}
+
+
+def encode_otlp(spans: List[Span], service_name: str = "dolibarr-mcp") -> Dict[str, Any]:
+    """Wrap spans in an OTLP ``ExportTraceServiceRequest`` JSON document."""
+    return {
+        "resourceSpans": [{
+            "resource": {"attributes": [_otlp_attribute("service.name", service_name)]},
+            "scopeSpans": [{
+                "scope": {"name": "dolibarr_mcp"},
+                "spans": [span.to_otlp() for span in spans],
+            }],
+        }]
+    }
+
+
+class SpanExporter(ABC):
+    """Receives the spans of each finished trace."""
+
+    @abstractmethod
+    def export(self, spans: List[Span]) -> None:
+        """Take the spans of one finished trace; must not block the event loop."""
+
+    def shutdown(self) -> None:
+        """Flush and release resources."""
+
+
+class InMemoryExporter(SpanExporter):
+    """Keeps finished spans in a list (tests and ad-hoc inspection)."""
+
+    def __init__(self) -> None:
+        self.spans: List[Span] = []
+
+    def export(self, spans: List[Span]) -> None:
+        self.spans.extend(spans)
+
+
+class JsonFileExporter(SpanExporter):
+    """Appends one OTLP/JSON document per trace to a file (JSON Lines).
+
+    Encoding and writing happen on a background thread, so the event loop
+    never waits on the disk; the file is flushed whenever the queue runs
+    empty and on :meth:`shutdown`.
+    """
+
+    def __init__(self, path: str, service_name: str = "dolibarr-mcp") -> None:
+        self.path = path
+        self.service_name = service_name
+        self._queue: "queue.Queue[Optional[List[Span]]]" = queue.Queue()
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+
+    def _write_loop(self) -> None:
+        with open(self.path, "a", encoding="utf-8") as fh:
+            while True:
+                spans = self._queue.get()
+                try:
+                    if spans is None:
+                        return
+                    fh.write(json.dumps(encode_otlp(spans, self.service_name), separators=(",", ":")) + "\n")
+                    if self._queue.empty():
+                        fh.flush()
+                except Exception as e:
+                    logger.warning("Trace export to %s failed: %s", self.path, e)
+                finally:
+                    self._queue.task_done()
+
+    def export(self, spans: List[Span]) -> None:
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._write_loop, name="dolibarr-mcp-trace-file", daemon=True)
+                self._thread.start()
+        self._queue.put(spans)
+
+    def flush(self) -> None:
+        """Block until every exported trace is on disk."""
+        if self._thread is not None:
+            self._queue.join()
+
+    def shutdown(self) -> None:
+        with self._lock:
+            thread, self._thread = self._thread, None
+        if thread is not None:
+            self._queue.put(None)
+            thread.join()
+
+
+class OTLPHttpExporter(SpanExporter):
+    """Posts traces to an OTLP/HTTP collector (``/v1/traces``, JSON encoding).
+
+    Posting happens in the default executor so the event loop never waits on
+    the collector; failures are logged and the trace is dropped.
+    """
+
+    def __init__(self, endpoint: str, service_name: str = "dolibarr-mcp", timeout: float = 5.0) -> None:
+        endpoint = endpoint.rstrip("/")
+        if not endpoint.endswith("/v1/traces"):
+            endpoint += "/v1/traces"
+        self.endpoint = endpoint
+        self.service_name = service_name
+        self.timeout = timeout
+
+    def _post(self, body: bytes) -> None:
+        request = urllib.request.Request(
+            self.endpoint,
+            data=body,
+            headers={"Content-Type": "application/json"},
+            method="POST",
+        )
+        try:
+            with urllib.request.urlopen(request, timeout=self.timeout):
+                pass
+        except Exception as e:
+            logger.warning("Trace export to %s failed: %s", self.endpoint, e)
+
+    def export(self, spans: List[Span]) -> None:
+        body = json.dumps(encode_otlp(spans, self.service_name)).encode("utf-8")
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            self._post(body)
+        else:
+            loop.run_in_executor(None, self._post, body)
+
+
+class Tracer:
+    """Creates spans and hands finished traces to the exporters."""
+
+    def __init__(self, exporters: Optional[List[SpanExporter]] = None) -> None:
+        self.exporters = list(exporters or [])
+        self._pending: Dict[str, List[Span]] = {}
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.exporters)
+
+    def current_span(self) -> Optional[Span]:
+        return _current_span.get()
+
+    def start_span(self, name: str, kind: SpanKind = "internal", **attributes: Any) -> Optional[Span]:
+        """Start a span as a child of the current one and make it current.
+
+        Returns None when tracing is disabled. Every started span must be
+        passed to :meth:`end_span` in the same context.
+        """
+        if not self.exporters:
+            return None
+        parent = _current_span.get()
+        span = Span(
+            name=name,
+            trace_id=parent.trace_id if parent else secrets.token_hex(16),
+            span_id=secrets.token_hex(8),
+            parent_id=parent.span_id if parent else None,
+            kind=kind,
+            start_ns=time.time_ns(),
+            attributes=attributes,
+        )
+        span._token = _current_span.set(span)
+        return span
+
+    def end_span(self, span: Optional[Span], error: Any = None) -> None:
+        """Finish a span started with :meth:`start_span`."""
+        if span is None:
+            return
+        span.end_ns = time.time_ns()
+        if error is not None and span.error is None:
+            span.record_error(error)
+        if span._token is not None:
+            _current_span.reset(span._token)
+            span._token = None
+        self._finish(span)
+
+    def record_span(
+        self,
+        name: str,
+        start_ns: int,
+        end_ns: int,
+        kind: SpanKind = "internal",
+        **attributes: Any,
+    ) -> None:
+        """Record an already-measured child of the current span (e.g. queue wait)."""
+        parent = _current_span.get()
+        if not self.exporters or parent is None:
+            return
+        self._finish(Span(
+            name=name,
+            trace_id=parent.trace_id,
+            span_id=secrets.token_hex(8),
+            parent_id=parent.span_id,
+            kind=kind,
+            start_ns=start_ns,
+            end_ns=end_ns,
+            attributes=attributes,
+        ))
+
+    @contextmanager
+    def span(self, name: str, kind: SpanKind = "internal", **attributes: Any) -> Iterator[Optional[Span]]:
+        """Context manager around :meth:`start_span`/:meth:`end_span`."""
+        span = self.start_span(name, kind, **attributes)
+        try:
+            yield span
+        except BaseException as e:
+            self.end_span(span, error=e)
+            raise
+        else:
+            self.end_span(span)
+
+    def _finish(self, span: Span) -> None:
+        spans = self._pending.setdefault(span.trace_id, [])
+        spans.append(span)
+        if span.parent_id is not None:
+            return
+        # Root finished: the trace is complete.
+        del self._pending[span.trace_id]
+        span.set_attribute(
+            "dolibarr.request_count",
+            sum(1 for s in spans if s.kind == "client"),
+        )
+        for exporter in self.exporters:
+            try:
+                exporter.export(spans)
+            except Exception as e:
+                logger.warning("Trace exporter %s failed: %s", type(exporter).__name__, e)
+
+    def shutdown(self) -> None:
+        """Shut down all exporters; unfinished traces are dropped."""
+        self._pending.clear()
+        for exporter in self.exporters:
+            exporter.shutdown()
+
+
+_tracer = Tracer()
+
+
+def get_tracer() -> Tracer:
+    """Get the process-wide tracer (disabled unless configured)."""
+    return _tracer
+
+
+def set_tracer(tracer: Optional[Tracer]) -> None:
+    """Install a tracer, or restore the disabled default with None."""
+    global _tracer
+    _tracer = tracer if tracer is not None else Tracer()
+
+
+def create_tracer(config: Any) -> Tracer:
+    """Build a tracer from the ``trace_*`` configuration fields."""
+    exporters: List[SpanExporter] = []
+    if config.trace_file:
+        exporters.append(JsonFileExporter(config.trace_file))
+    if config.trace_otlp_endpoint:
+        exporters.append(OTLPHttpExporter(config.trace_otlp_endpoint))
+    return Tracer(exporters)
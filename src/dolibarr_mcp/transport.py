@@ -0,0 +1,73 @@
+"""Pluggable transports between :class:`DolibarrClient` and the Dolibarr server.
+
+``DolibarrClient`` hands every request (method, endpoint, full URL and the
+aiohttp keyword arguments) to its transport and gets back the status, reason
+and body text. Without a transport the request goes straight through the
+client's aiohttp session. Transports wrap or replace that path, e.g. to record
+traffic to a cassette, to serve a recorded cassette back offline or to
+inject faults.
+"""
+
+from dataclasses import dataclass
+from typing import Any, Dict, Optional
+
+from aiohttp import ClientSession
+
+from .metrics import RequestMetrics
+
+
+@dataclass
+class TransportResponse:
+    """What the client needs from a response."""
+
+    status: int
+    reason: str
+    text: str
+
+
+async def send_http(session: ClientSession, method: str, url: str, kwargs: Dict[str, Any]) -> TransportResponse:
+    """Send a request through an aiohttp session and read the whole body."""
+    async with session.request(method, url, **kwargs) as response:
+        text = await response.text()
+        return TransportResponse(response.status, response.reason or "", text)
+
+
+class Transport:
+    """Base transport: plain HTTP through the client's session.
+
+    ``metrics`` is set to the owning client's :class:`RequestMetrics` so
+    transports that retry can count their retries there.
+    """
+
+    metrics: Optional[RequestMetrics] = None
+
+    async def send(
+        self,
+        session: ClientSession,
+        method: str,
+        endpoint: str,
+        url: str,
+        kwargs: Dict[str, Any],
+    ) -> TransportResponse:
+        return await send_http(session, method, url, kwargs)
+
+    async def close(self) -> None:
+        """Release resources (files, connections) held by the transport."""
+
+
+def create_transport(config: Any) -> Optional[Transport]:
+    """Build the transport selected by the configuration (None for plain HTTP)."""
+    from .balancer import BalancingTransport
+    from .cassette import CassetteRecorder, ReplayTransport
+    from .faults import FaultInjectingTransport, FaultPlan
+
+    transport: Optional[Transport] = None
+    if config.replay_cassette:
+        transport = ReplayTransport(config.replay_cassette, latency_scale=config.replay_latency_scale)
+    elif config.record_cassette:
+        transport = CassetteRecorder(config.record_cassette)
+    if config.fault_plan:
+        transport = FaultInjectingTransport(FaultPlan.load(config.fault_plan), inner=transport)
+    if (config.dolibarr_urls or config.dolibarr_replica_urls) and not config.replay_cassette:
+        transport = BalancingTransport.from_config(config, inner=transport)
+    return transport
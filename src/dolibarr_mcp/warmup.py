@@ -0,0 +1,167 @@
+"""Background warm-up of the Dolibarr client after server start.
+
+The lifespan used to await a connection test before the MCP handshake could
+complete; a slow or unreachable Dolibarr delayed it by up to three request
+timeouts. The warm-up task now does that work after the server is up:
+
+1. probe connectivity with ``get_status``, retrying with backoff until it works,
+2. pre-open a few pooled connections with concurrent status requests,
+3. run the registered warm-up hooks (reference data loaders).
+
+Progress is kept in a :class:`Readiness` record reported by the ``get_status``
+tool and the ``/ready`` route of the HTTP transport. Tool calls are accepted
+throughout; they simply pay the connection set-up themselves until warm-up
+has finished.
+"""
+
+import asyncio
+import logging
+import sys
+import time
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+WarmupHook = Callable[[Any], Awaitable[Any]]
+
+_hooks: List[Tuple[str, WarmupHook]] = []
+
+
+def register_warmup_hook(name: str, hook: WarmupHook) -> None:
+    """Run ``hook(client)`` during warm-up, after connectivity is confirmed."""
+    _hooks.append((name, hook))
+
+
+@dataclass
+class Readiness:
+    """Warm-up progress: ``starting``, ``unavailable`` (probe failing) or ``ready``."""
+
+    state: str = "starting"
+    started_at: float = field(default_factory=time.time)
+    ready_at: Optional[float] = None
+    attempts: int = 0
+    dolibarr_version: Optional[str] = None
+    last_error: Optional[str] = None
+    connections: int = 0
+    hooks: Dict[str, str] = field(default_factory=dict)
+
+    @property
+    def ready(self) -> bool:
+        return self.state == "ready"
+
+    @property
+    def connected(self) -> bool:
+        """The connection test has succeeded at least once."""
+        return self.dolibarr_version is not None
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "state": self.state,
+            "ready": self.ready,
+            "attempts": self.attempts,
+            "dolibarr_version": self.dolibarr_version,
+            "last_error": self.last_error,
+            "warmup_seconds": round(self.ready_at - self.started_at, 3) if self.ready_at else None,
+            "connections": self.connections,
+            "hooks": dict(self.hooks),
+        }
+
+
+class WarmUp:
+    """Warm-up task for one client."""
+
+    def __init__(
+        self,
+        client: Any,
+        connections: int = 4,
+        retry_initial: float = 1.0,
+        retry_max: float = 30.0,
+    ) -> None:
+        self.client = client
+        self.connections = connections
+        self.retry_initial = retry_initial
+        self.retry_max = retry_max
+        self.readiness = Readiness()
+        self._task: Optional[asyncio.Task] = None
+
+    @classmethod
+    def from_config(cls, client: Any, config: Any) -> "WarmUp":
+        return cls(client, connections=config.warmup_connections)
+
+    def start(self) -> None:
+        self._task = asyncio.get_running_loop().create_task(self.run(), name="dolibarr-mcp-warmup")
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    async def _probe(self) -> None:
+        delay = self.retry_initial
+        while True:
+            self.readiness.attempts += 1
+            try:
+                status = await self.client.get_status()
+            except Exception as e:
+                self.readiness.state = "unavailable"
+                self.readiness.last_error = str(e)
+                if self.readiness.attempts == 1:
+                    print(f"⚠️  Connection test failed: {e}", file=sys.stderr)
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, self.retry_max)
+                continue
+            success = status.get("success") if isinstance(status, dict) else None
+            source = success if isinstance(success, dict) else status
+            self.readiness.dolibarr_version = source.get("dolibarr_version", "Unknown")
+            self.readiness.last_error = None
+            print(f"✅ Connected to Dolibarr API (Version: {self.readiness.dolibarr_version})", file=sys.stderr)
+            return
+
+    async def _open_connections(self) -> None:
+        if self.connections <= 0:
+            return
+        metrics = self.client.metrics
+        created = metrics.connections_created
+        # The endpoint that answered the probe; status is missing on some setups
+        endpoint = self.client.capability_cache.status_endpoint or "status"
+        # Concurrent requests cannot share a connection, so each opens one
+        # that stays in the keep-alive pool afterwards
+        await asyncio.gather(
+            *(self.client.request("GET", endpoint) for _ in range(self.connections)),
+            return_exceptions=True,
+        )
+        self.readiness.connections = metrics.connections_created - created
+
+    async def run(self) -> Readiness:
+        await self._probe()
+        await self._open_connections()
+        for name, hook in list(_hooks):
+            try:
+                await hook(self.client)
+                self.readiness.hooks[name] = "ok"
+            except Exception as e:
+                logger.warning("Warm-up step %s failed: %s", name, e)
+                self.readiness.hooks[name] = f"failed: {e}"
+        self.readiness.state = "ready"
+        self.readiness.ready_at = time.time()
+        return self.readiness
+
+
+_warmup: Optional[WarmUp] = None
+
+
+def get_warmup() -> Optional[WarmUp]:
+    """Get the warm-up of the running server, if any."""
+    return _warmup
+
+
+def set_warmup(warmup: Optional[WarmUp]) -> None:
+    """Install (or clear with None) the server warm-up."""
+    global _warmup
+    _warmup = warmup
@@ -0,0 +1,231 @@
+"""Event-loop lag and memory watchdog for the MCP server process.
+
+Large list validations and JSON decoding run on the event loop; while they
+do, every other session on the HTTP transport waits. The watchdog task sleeps
+for a fixed interval and measures how late it wakes up (loop lag), samples the
+process RSS and, when :mod:`tracemalloc` is tracing, the top allocation sites.
+Crossed thresholds are logged on ``dolibarr_mcp.watchdog`` (rate limited) and
+counted, and all values appear in ``get_server_metrics`` and ``/metrics``.
+"""
+
+import asyncio
+import logging
+import os
+import sys
+import time
+import tracemalloc
+from typing import Any, Dict, List, Optional
+
+from .metrics import LatencyHistogram, prometheus_histogram
+
+logger = logging.getLogger("dolibarr_mcp.watchdog")
+
+LAG_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+def current_rss_bytes() -> int:
+    """Resident set size of this process (peak RSS where /proc is unavailable)."""
+    try:
+        with open("/proc/self/statm", encoding="ascii") as fh:
+            pages = int(fh.read().split()[1])
+        return pages * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError, AttributeError):
+        pass
+    try:
+        import resource
+    except ImportError:  # Windows
+        return 0
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KiB, macOS bytes
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+def top_allocations(snapshot: tracemalloc.Snapshot, limit: int = 10) -> List[Dict[str, Any]]:
+    """Summarize the largest allocation sites of a tracemalloc snapshot."""
+    return [
+        {"location": str(stat.traceback), "size_kb": round(stat.size / 1024, 1), "count": stat.count}
+        for stat in snapshot.statistics("lineno")[:limit]
+    ]
+
+
+class Watchdog:
+    """Background monitor of loop lag and memory use."""
+
+    def __init__(
+        self,
+        interval: float = 1.0,
+        lag_threshold: float = 0.25,
+        rss_threshold_bytes: int = 0,
+        tracemalloc_frames: int = 0,
+        alert_cooldown: float = 60.0,
+    ) -> None:
+        self.interval = interval
+        self.lag_threshold = lag_threshold
+        self.rss_threshold_bytes = rss_threshold_bytes
+        self.tracemalloc_frames = tracemalloc_frames
+        self.alert_cooldown = alert_cooldown
+        self.lag = LatencyHistogram(LAG_BUCKETS)
+        self.last_lag = 0.0
+        self.rss_bytes = 0
+        self.peak_rss_bytes = 0
+        self.alerts: Dict[str, int] = {"loop_lag": 0, "rss": 0}
+        self._last_alert: Dict[str, float] = {}
+        self._baseline: Optional[tracemalloc.Snapshot] = None
+        self._task: Optional[asyncio.Task] = None
+
+    @classmethod
+    def from_config(cls, config: Any) -> "Watchdog":
+        return cls(
+            interval=config.watchdog_interval_seconds,
+            lag_threshold=config.loop_lag_threshold_ms / 1000,
+            rss_threshold_bytes=int(config.rss_threshold_mb * 1024 * 1024),
+            tracemalloc_frames=config.tracemalloc_frames,
+        )
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def start(self) -> None:
+        """Start the watchdog task on the running loop."""
+        if self.running:
+            return
+        if self.tracemalloc_frames and not tracemalloc.is_tracing():
+            tracemalloc.start(self.tracemalloc_frames)
+            self._baseline = tracemalloc.take_snapshot()
+        self._task = asyncio.get_running_loop().create_task(self._run(), name="dolibarr-mcp-watchdog")
+
+    async def stop(self) -> None:
+        """Cancel the watchdog task."""
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            expected = loop.time() + self.interval
+            await asyncio.sleep(self.interval)
+            self.record_lag(max(loop.time() - expected, 0.0))
+            self.record_rss(current_rss_bytes())
+
+    def record_lag(self, lag: float) -> None:
+        self.last_lag = lag
+        self.lag.observe(lag)
+        if lag >= self.lag_threshold:
+            self._alert(
+                "loop_lag",
+                "Event loop blocked for %.0f ms (threshold %.0f ms)",
+                lag * 1000,
+                self.lag_threshold * 1000,
+            )
+
+    def record_rss(self, rss: int) -> None:
+        self.rss_bytes = rss
+        self.peak_rss_bytes = max(self.peak_rss_bytes, rss)
+        if self.rss_threshold_bytes and rss >= self.rss_threshold_bytes:
+            if not self._due("rss"):
+                return
+            top = ""
+            # Snapshots are expensive: only take one for an alert that is logged.
+            if tracemalloc.is_tracing():
+                sites = top_allocations(tracemalloc.take_snapshot(), limit=5)
+                top = "; top allocations: " + ", ".join(f"{s['location']} {s['size_kb']} KiB" for s in sites)
+            logger.warning(
+                "RSS %.1f MiB above threshold %.1f MiB%s",
+                rss / 1048576,
+                self.rss_threshold_bytes / 1048576,
+                top,
+            )
+
+    def _due(self, kind: str) -> bool:
+        """Count a threshold crossing; True when its alert is out of cooldown."""
+        self.alerts[kind] += 1
+        now = time.monotonic()
+        if now - self._last_alert.get(kind, float("-inf")) < self.alert_cooldown:
+            return False
+        self._last_alert[kind] = now
+        return True
+
+    def _alert(self, kind: str, message: str, *args: Any) -> None:
+        if self._due(kind):
+            logger.warning(message, *args)
+
+    def memory_diff(self, limit: int = 10) -> Dict[str, Any]:
+        """Compare a new tracemalloc snapshot with the previous one.
+
+        Starts tracing (and only records a baseline) when it is not active yet.
+        """
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(self.tracemalloc_frames or 1)
+            self._baseline = tracemalloc.take_snapshot()
+            return {"tracing": True, "baseline_taken": True, "diff": []}
+
+        snapshot = tracemalloc.take_snapshot()
+        current, peak = tracemalloc.get_traced_memory()
+        result: Dict[str, Any] = {
+            "tracing": True,
+            "baseline_taken": self._baseline is None,
+            "traced_kb": round(current / 1024, 1),
+            "traced_peak_kb": round(peak / 1024, 1),
+            "top": top_allocations(snapshot, limit),
+            "diff": [],
+        }
+        if self._baseline is not None:
+            result["diff"] = [
+                {
+                    "location": str(stat.traceback),
+                    "size_diff_kb": round(stat.size_diff / 1024, 1),
+                    "count_diff": stat.count_diff,
+                    "size_kb": round(stat.size / 1024, 1),
+                }
+                for stat in snapshot.compare_to(self._baseline, "lineno")[:limit]
+            ]
+        self._baseline = snapshot
+        return result
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Return watchdog values as a JSON-serializable dict."""
+        return {
+            "running": self.running,
+            "loop_lag": {**self.lag.summary(), "last_ms": round(self.last_lag * 1000, 3)},
+            "rss_mb": round(self.rss_bytes / 1048576, 1),
+            "peak_rss_mb": round(self.peak_rss_bytes / 1048576, 1),
+            "tracemalloc": tracemalloc.is_tracing(),
+            "alerts": dict(self.alerts),
+        }
+
+    def to_prometheus(self, prefix: str = "dolibarr_mcp") -> str:
+        """Render watchdog values in the Prometheus text exposition format."""
+        lines = [
+            f"# HELP {prefix}_event_loop_lag_seconds Event loop wake-up delay",
+            f"# TYPE {prefix}_event_loop_lag_seconds histogram",
+        ]
+        lines.extend(prometheus_histogram(f"{prefix}_event_loop_lag_seconds", self.lag))
+        lines.append(f"# HELP {prefix}_resident_memory_bytes Resident set size")
+        lines.append(f"# TYPE {prefix}_resident_memory_bytes gauge")
+        lines.append(f"{prefix}_resident_memory_bytes {self.rss_bytes}")
+        lines.append(f"# HELP {prefix}_watchdog_alerts_total Watchdog threshold crossings")
+        lines.append(f"# TYPE {prefix}_watchdog_alerts_total counter")
+        for kind, count in sorted(self.alerts.items()):
+            lines.append(f'{prefix}_watchdog_alerts_total{{kind="{kind}"}} {count}')
+        return "\n".join(lines) + "\n"
+
+
+_watchdog: Optional[Watchdog] = None
+
+
+def get_watchdog() -> Optional[Watchdog]:
+    """Get the running watchdog, if the server started one."""
+    return _watchdog
+
+
+def set_watchdog(watchdog: Optional[Watchdog]) -> None:
+    """Install (or clear with None) the process watchdog."""
+    global _watchdog
+    _watchdog = watchdog
@@ -0,0 +1,72 @@
+"""Shared fixtures for the Dolibarr MCP test-suite."""
+
+import json
+import os
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Optional
+
+import pytest
+from unittest.mock import MagicMock
+
+# Build tool schemas fresh instead of reusing the user's manifest cache.
+os.environ.setdefault("DOLIBARR_MANIFEST_CACHE", "false")
+
+from dolibarr_mcp.budget import check_budget, track_requests
+from dolibarr_mcp.dolibarr_client import DolibarrClient
+
+
+class FakeResponse:
+    """Minimal stand-in for an aiohttp response used as an async context manager."""
+
+    def __init__(self, status: int, body: Any):
+        self.status = status
+        self.reason = "OK" if status < 400 else "Error"
+        self._text = body if isinstance(body, str) else json.dumps(body)
+
+    async def text(self) -> str:
+        return self._text
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+
+@pytest.fixture
+def http_client():
+    """DolibarrClient whose session answers through a handler.
+
+    Requests go through ``_make_request`` (metrics, tracing, budgets) but never
+    leave the process. Set ``client.handler = lambda method, url, kwargs: body``
+    to control the responses; the default answers ``{"id": 1}``.
+    """
+    client = DolibarrClient(MagicMock(dolibarr_url="https://erp.example/api/index.php", api_key="key"))
+    client.handler: Callable[[str, str, Dict[str, Any]], Any] = lambda method, url, kwargs: {"id": 1}
+
+    def _request(method, url, **kwargs):
+        body = client.handler(method, url, kwargs)
+        if isinstance(body, FakeResponse):
+            return body
+        return FakeResponse(200, body)
+
+    client.session = MagicMock()
+    client.session.request = MagicMock(side_effect=_request)
+    return client
+
+
+@pytest.fixture
+def request_budget():
+    """Fail the test when the wrapped block exceeds a tool's request budget.
+
+        with request_budget("create_invoice", {"lines": lines}) as counter:
+            await tools["create_invoice"](...)
+    """
+
+    @contextmanager
+    def guard(tool: str, arguments: Optional[Dict[str, Any]] = None):
+        with track_requests(tool) as counter:
+            yield counter
+        check_budget(tool, arguments or {}, counter, mode="fail")
+
+    return guard
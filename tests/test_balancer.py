@@ -0,0 +1,158 @@
+"""Tests for load balancing over several Dolibarr frontends."""
+
+import asyncio
+import socket
+import time
+
+import pytest
+import pytest_asyncio
+
+from dolibarr_mcp.balancer import BalancerSettings, BalancingTransport, Node
+from dolibarr_mcp.config import Config
+from dolibarr_mcp.dolibarr_client import DolibarrClient
+from dolibarr_mcp.fake_server import FakeDolibarr, SeedVolumes, serve_fake_dolibarr
+from dolibarr_mcp.transport import Transport, TransportResponse, create_transport
+
+SMALL = SeedVolumes(thirdparties=3, products=3, invoices=1, lines_per_invoice=1,
+                    orders=1, proposals=1, projects=1, contacts=1, users=1)
+
+
+@pytest_asyncio.fixture
+async def frontends():
+    """Two frontends serving the same dataset, like two PHP servers on one database."""
+    data = FakeDolibarr(SMALL, seed=4)
+    async with serve_fake_dolibarr(data) as first, serve_fake_dolibarr(data) as second:
+        yield first, second
+
+
+def _dead_url() -> str:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+    return f"http://127.0.0.1:{port}/api/index.php"
+
+
+def _client(url, transport):
+    return DolibarrClient(Config(dolibarr_url=url, api_key="k"), transport=transport)
+
+
+def test_create_transport_builds_nodes():
+    config = Config(
+        dolibarr_url="https://erp.example",
+        api_key="k",
+        dolibarr_urls="https://erp2.example, https://erp.example",
+        dolibarr_replica_urls="https://ro.example",
+        balancer_strategy="ewma",
+    )
+    transport = create_transport(config)
+    assert isinstance(transport, BalancingTransport)
+    assert [(n.base_url, n.writable) for n in transport.nodes] == [
+        ("https://erp.example/api/index.php", True),
+        ("https://erp2.example/api/index.php", True),
+        ("https://ro.example/api/index.php", False),
+    ]
+    assert transport.settings.strategy == "ewma"
+    assert create_transport(Config(dolibarr_url="https://erp.example", api_key="k")) is None
+
+
+@pytest.mark.asyncio
+async def test_least_outstanding_spreads_concurrent_reads(frontends):
+    first, second = frontends
+    transport = BalancingTransport(first, [Node(first), Node(second)])
+    client = _client(first, transport)
+    async with client:
+        await asyncio.gather(*(client.get_products(limit=1) for _ in range(8)))
+        status = await client.get_status()
+
+    assert status
+    counts = [node.requests for node in transport.nodes]
+    assert sum(counts) == 9 and min(counts) >= 4
+    assert all(node.outstanding == 0 for node in transport.nodes)
+
+
+@pytest.mark.asyncio
+async def test_dead_frontend_is_ejected_and_reads_retried(frontends):
+    first, _ = frontends
+    dead = Node(_dead_url())
+    transport = BalancingTransport(first, [dead, Node(first)], BalancerSettings(eject_failures=2))
+    client = _client(first, transport)
+    async with client:
+        for _ in range(5):
+            assert await client.get_products(limit=1)
+
+    assert dead.errors == 2 and dead.ejections == 1
+    assert transport.retries == 2
+    assert client.metrics.snapshot()["endpoints"][0]["retries"] == 2
+    snapshot = transport.snapshot()
+    assert [node["healthy"] for node in snapshot["nodes"]] == [False, True]
+
+
+@pytest.mark.asyncio
+async def test_writes_go_to_primary_and_reads_to_replicas(frontends):
+    first, second = frontends
+    primary, replica = Node(first), Node(second, writable=False)
+    transport = BalancingTransport(first, [primary, replica])
+    client = _client(first, transport)
+    async with client:
+        customer_id = await client.create_customer({"name": "Balanced Ltd"})
+        customer = await client.get_customer_by_id(customer_id)
+
+    assert customer["name"] == "Balanced Ltd"
+    assert primary.requests == 1 and replica.requests == 1
+
+
+class _Flaky(Transport):
+    def __init__(self, failing):
+        self.failing = failing
+
+    async def send(self, session, method, endpoint, url, kwargs):
+        if url.startswith(self.failing):
+            return TransportResponse(503, "Service Unavailable", "")
+        return TransportResponse(200, "OK", "[]")
+
+
+@pytest.mark.asyncio
+async def test_unhealthy_replica_falls_back_to_primary():
+    primary = Node("http://a/api/index.php")
+    replica = Node("http://b/api/index.php", writable=False)
+    transport = BalancingTransport(primary.base_url, [primary, replica],
+                                   BalancerSettings(eject_failures=1), inner=_Flaky("http://b/"))
+
+    response = await transport.send(None, "GET", "products", "http://a/api/index.php/products", {})
+    assert response.status == 503
+    assert replica.ejections == 1
+    assert transport.pick("GET") is primary
+
+    await transport.send(None, "GET", "status", "http://a/api/status", {})
+    assert primary.requests == 1
+
+
+def test_ewma_prefers_fast_nodes():
+    slow, fast = Node("http://a/api/index.php", ewma=0.2), Node("http://b/api/index.php", ewma=0.01)
+    transport = BalancingTransport(slow.base_url, [slow, fast], BalancerSettings(strategy="ewma"))
+    assert transport.pick("GET") is fast
+    fast.outstanding = 30
+    assert transport.pick("GET") is slow
+    with pytest.raises(ValueError):
+        BalancerSettings(strategy="random")
+
+
+class _Hanging(Transport):
+    async def send(self, session, method, endpoint, url, kwargs):
+        await asyncio.sleep(30)
+
+
+@pytest.mark.asyncio
+async def test_cancelled_requests_do_not_eject_nodes():
+    node = Node("http://a/api/index.php")
+    transport = BalancingTransport(node.base_url, [node], BalancerSettings(eject_failures=1), inner=_Hanging())
+    for _ in range(3):
+        task = asyncio.ensure_future(transport.send(None, "GET", "products", "http://a/api/index.php/products", {}))
+        await asyncio.sleep(0)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+    assert node.outstanding == 0
+    assert (node.errors, node.ejections) == (0, 0)
+    assert node.healthy(time.monotonic())
@@ -0,0 +1,42 @@
+"""Tests for the benchmark regression comparison."""
+
+import pytest
+
+from benchmarks.compare import compare, format_comparison
+from benchmarks.harness import BenchmarkCase, measure
+
+
+def _results(**medians):
+    return {"benchmarks": {name: {"median_s": value} for name, value in medians.items()}}
+
+
+def test_compare_flags_regressions_beyond_threshold():
+    baseline = _results(a=1.0, b=1.0, c=1.0, gone=1.0)
+    current = _results(a=1.05, b=1.2, c=0.5, added=1.0)
+
+    result = compare(baseline, current, threshold=0.10)
+
+    assert result.regressions == ["b"]
+    assert result.improvements == ["c"]
+    assert result.missing == ["gone"]
+    assert result.new == ["added"]
+    assert not result.ok
+    assert "REGRESSION" in format_comparison(result)
+
+
+def test_compare_passes_within_threshold():
+    result = compare(_results(a=1.0), _results(a=1.09), threshold=0.10)
+    assert result.ok
+
+
+@pytest.mark.asyncio
+async def test_measure_calibrates_iterations():
+    calls = []
+    case = BenchmarkCase("unit.noop", "unit", lambda ctx: calls.append(ctx))
+
+    stats = await measure(case, "ctx", rounds=3, min_round_time=0.001)
+
+    assert stats["rounds"] == 3
+    assert stats["iterations"] > 1
+    assert stats["min_s"] <= stats["median_s"]
+    assert set(calls) == {"ctx"}
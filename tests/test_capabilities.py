@@ -0,0 +1,171 @@
+"""Tests for the cached backend capability probe."""
+
+import asyncio
+
+import pytest
+import pytest_asyncio
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from dolibarr_mcp import state
+from dolibarr_mcp.budget import check_budget, track_requests
+from dolibarr_mcp.capabilities import Capabilities, CapabilityCache, parse_version
+from dolibarr_mcp.config import Config
+from dolibarr_mcp.dolibarr_client import DolibarrAPIError, DolibarrClient
+from dolibarr_mcp.fake_server import FakeDolibarr, SeedVolumes, serve_fake_dolibarr
+from dolibarr_mcp.models import InvoiceLine
+from dolibarr_mcp.tools.invoices import register_invoice_tools
+from dolibarr_mcp.tools.orders import register_order_tools
+
+SMALL = SeedVolumes(thirdparties=5, products=5, invoices=2, lines_per_invoice=2,
+                    orders=2, proposals=1, projects=1, contacts=1, users=1)
+
+
+@pytest_asyncio.fixture
+async def backend():
+    data = FakeDolibarr(SMALL, seed=3)
+    async with serve_fake_dolibarr(data) as url:
+        async with DolibarrClient(Config(dolibarr_url=url, api_key="k")) as client:
+            yield data, client
+
+
+@pytest.fixture
+def tools():
+    registered = {}
+    mcp = MagicMock()
+    mcp.tool = lambda: (lambda f: registered.setdefault(f.__name__, f))
+    register_invoice_tools(mcp)
+    return registered
+
+
+def test_parse_version():
+    assert parse_version("20.0.2") == (20, 0, 2)
+    assert parse_version("18.0") == (18, 0)
+    assert parse_version("Connected") is None
+    assert parse_version(None) is None
+
+
+@pytest.mark.asyncio
+async def test_probe_detects_features_and_is_cached(backend):
+    _, client = backend
+    with track_requests("some_tool") as counter:
+        capabilities = await client.capabilities()
+    assert counter.count == 0  # probe requests are not charged to the tool
+
+    assert capabilities.dolibarr_version == "20.0.0"
+    assert capabilities.status_endpoint == "status"
+    assert capabilities.pagination_data and capabilities.properties
+    assert capabilities.lines_in_post and capabilities.createfromorder
+
+    requests = client.metrics.snapshot()["requests"]
+    assert await client.capabilities() is capabilities
+    assert client.metrics.snapshot()["requests"] == requests
+    assert client.metrics.cache["capabilities"] == {"hits": 1, "misses": 1}
+
+
+@pytest.mark.asyncio
+async def test_cache_expires_after_ttl(backend):
+    _, client = backend
+    client.capability_cache = CapabilityCache(ttl=0.01)
+    first = await client.capabilities()
+    assert await client.capabilities() is first
+    await asyncio.sleep(0.02)
+    second = await client.capabilities()
+    assert first is not second
+    assert client.metrics.cache["capabilities"]["misses"] == 2
+
+
+@pytest.mark.asyncio
+async def test_unknown_version_disables_unprobed_features():
+    client = DolibarrClient(MagicMock())
+    with patch.object(client, "request", new_callable=AsyncMock) as mock_request:
+        mock_request.side_effect = [
+            DolibarrAPIError("Not found", status_code=404),  # status
+            [{"name": "modFacture"}],                          # setup/modules
+            [{"id": 1, "ref": "C1"}],                          # thirdparties probe
+        ]
+        capabilities = await client.capabilities()
+
+    assert capabilities.status_endpoint == "setup/modules"
+    assert capabilities.dolibarr_version == "Connected"
+    assert not capabilities.pagination_data and not capabilities.properties
+    assert not capabilities.lines_in_post and not capabilities.createfromorder
+    assert client.capability_cache.status_endpoints()[0] == "setup/modules"
+
+
+@pytest.mark.asyncio
+async def test_count_skips_pagination_data_when_unsupported():
+    client = DolibarrClient(MagicMock())
+    client.capability_cache.store(Capabilities(pagination_data=False, properties=True))
+    with patch.object(client, "request", new_callable=AsyncMock) as mock_request:
+        mock_request.return_value = [{"id": 1}, {"id": 2}]
+        total, method, _ = await client.count("orders", page_size=10)
+
+    assert (total, method) == (2, "scan")
+    mock_request.assert_awaited_once()
+    assert mock_request.call_args.kwargs["params"]["properties"] == "id"
+
+
+@pytest.mark.asyncio
+async def test_create_invoice_sends_lines_in_one_request(backend, tools):
+    data, client = backend
+    await client.capabilities()
+    lines = [InvoiceLine(desc=f"Item {i}", subprice=10, qty=2, tva_tx=20) for i in range(3)]
+    state.set_client(client)
+    try:
+        with track_requests("create_invoice") as counter:
+            invoice_id = await tools["create_invoice"](
+                customer_id=1, date="2025-01-01", lines=lines, project_id=None, payment_mode_id=None,
+            )
+    finally:
+        state.set_client(None)
+
+    assert counter.requests == ["POST invoices"]
+    invoice = await client.get_invoice_by_id(invoice_id)
+    assert len(invoice["lines"]) == 3
+    assert invoice["total_ht"].startswith("60.")
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("version", ["20.0.0", "6.0.0"])
+async def test_invoice_from_order_uses_fastest_path(backend, version):
+    data, client = backend
+    client.capability_cache.store(Capabilities(dolibarr_version=version, createfromorder=version != "6.0.0"))
+    order_id = min(data.tables["orders"])
+    order = await client.get_order_by_id(order_id)
+
+    with track_requests("create_invoice_from_order") as counter:
+        invoice_id = await client.create_invoice_from_order(order_id)
+
+    if version == "6.0.0":
+        assert counter.requests[:2] == ["GET orders/{id}", "POST invoices"]
+        assert len(counter.requests) == 2 + len(order["lines"])
+    else:
+        assert counter.requests == ["POST invoices/createfromorder/{id}"]
+    assert check_budget("create_invoice_from_order", {"order_id": order_id}, counter, mode="fail") == (
+        2 + len(order["lines"]) if version == "6.0.0" else 2
+    )
+    invoice = await client.get_invoice_by_id(invoice_id)
+    assert invoice["socid"] == order["socid"]
+    assert invoice["total_ht"] == order["total_ht"]
+
+
+@pytest.mark.asyncio
+async def test_create_order_sends_line_fields(backend):
+    data, client = backend
+    registered = {}
+    mcp = MagicMock()
+    mcp.tool = lambda: (lambda f: registered.setdefault(f.__name__, f))
+    register_order_tools(mcp)
+    lines = [InvoiceLine(desc=f"Item {i}", subprice=10, qty=2, tva_tx=20) for i in range(2)]
+    state.set_client(client)
+    try:
+        order_id = await registered["create_order"](
+            customer_id=1, date="2025-01-01", lines=lines, project_id=None, delivery_date=None,
+        )
+    finally:
+        state.set_client(None)
+
+    order = await client.get_order_by_id(order_id)
+    assert len(order["lines"]) == 2
+    assert order["total_ht"].startswith("40.")
+    assert order["total_tva"].startswith("8.")
@@ -0,0 +1,86 @@
+"""Tests for cassette recording and offline replay."""
+
+import json
+import time
+
+import pytest
+
+from dolibarr_mcp.cassette import CassetteRecorder, ReplayTransport, load_cassette
+from dolibarr_mcp.config import Config
+from dolibarr_mcp.dolibarr_client import DolibarrAPIError, DolibarrClient
+from dolibarr_mcp.fake_server import FakeDolibarr, SeedVolumes, serve_fake_dolibarr
+
+SMALL = SeedVolumes(thirdparties=20, products=20, invoices=10, lines_per_invoice=2,
+                    orders=5, proposals=5, projects=2, contacts=5, users=2)
+
+
+async def _session(client):
+    products = await client.get_products(limit=5)
+    invoice = await client.get_invoice_by_id(3)
+    invoice_id = await client.create_invoice({"socid": 1, "date": "2025-01-01", "lines": []})
+    with pytest.raises(DolibarrAPIError) as missing:
+        await client.get_product_by_id(9999)
+    return products, invoice, invoice_id, missing.value.status_code
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("name", ["session.jsonl", "session.jsonl.gz"])
+async def test_record_then_replay_offline(tmp_path, name):
+    path = str(tmp_path / name)
+    async with serve_fake_dolibarr(FakeDolibarr(SMALL, seed=3)) as url:
+        config = Config(dolibarr_url=url, api_key="secret")
+        async with DolibarrClient(config, transport=CassetteRecorder(path)) as client:
+            recorded = await _session(client)
+
+    interactions = load_cassette(path)
+    assert [(i.method, i.endpoint, i.status) for i in interactions] == [
+        ("GET", "products", 200), ("GET", "invoices/3", 200), ("POST", "invoices", 200), ("GET", "products/9999", 404),
+    ]
+    assert interactions[2].body["socid"] == 1
+    assert all(i.duration > 0 for i in interactions)
+    assert "secret" not in json.dumps([vars(i) for i in interactions])
+
+    # The server is gone: everything comes from the cassette.
+    replay = ReplayTransport(path, latency_scale=0)
+    async with DolibarrClient(config, transport=replay) as client:
+        assert await _session(client) == recorded
+        assert client.metrics.snapshot()["requests"] == 4
+
+        with pytest.raises(DolibarrAPIError, match="No recorded response for GET products/1"):
+            await client.get_product_by_id(1)
+    assert replay.replayed == 4 and replay.misses == 1
+
+
+@pytest.mark.asyncio
+async def test_replay_scales_latency_and_repeats_last_response(tmp_path):
+    path = tmp_path / "c.jsonl"
+    entry = {"method": "GET", "endpoint": "status", "status": 200, "reason": "OK", "duration": 0.05}
+    lines = [json.dumps({"cassette": 1})]
+    lines += [json.dumps({**entry, "response": json.dumps({"success": {"n": n}})}) for n in (1, 2)]
+    path.write_text("\n".join(lines) + "\n")
+
+    client = DolibarrClient(Config(dolibarr_url="https://erp.example/api/index.php", api_key="k"),
+                            transport=ReplayTransport(str(path), latency_scale=2.0))
+    started = time.perf_counter()
+    answers = [await client.get_status() for _ in range(3)]
+    assert time.perf_counter() - started >= 0.3
+    assert [a["success"]["n"] for a in answers] == [1, 2, 2]
+    await client.close_session()
+
+
+@pytest.mark.asyncio
+async def test_replay_keeps_entities_apart(tmp_path):
+    path = str(tmp_path / "entities.jsonl")
+    data = FakeDolibarr(SMALL, seed=3)
+    for row_id in (4, 5):
+        data.tables["thirdparties"][row_id]["entity"] = "2"
+    async with serve_fake_dolibarr(data) as url:
+        config = Config(dolibarr_url=url, api_key="k")
+        async with DolibarrClient(config, transport=CassetteRecorder(path)) as client:
+            recorded = [await client.for_entity(e).get_customers(limit=3) for e in (1, 2)]
+
+    assert [i.entity for i in load_cassette(path)] == ["1", "2"]
+    async with DolibarrClient(config, transport=ReplayTransport(path, latency_scale=0)) as client:
+        replayed = [await client.for_entity(e).get_customers(limit=3) for e in (1, 2)]
+    assert replayed == recorded
+    assert {row["id"] for row in replayed[1]} == {4, 5}
@@ -0,0 +1,104 @@
+"""Tests for the modification-watermark change feed."""
+
+import pytest
+from datetime import datetime
+from unittest.mock import AsyncMock, MagicMock
+from zoneinfo import ZoneInfo
+
+from dolibarr_mcp import state as state_module
+from dolibarr_mcp.config import Config
+from dolibarr_mcp.dolibarr_client import DolibarrAPIError
+from dolibarr_mcp.filters import (
+    Watermark,
+    build_changed_since_filter,
+    parse_watermark,
+    watermark_from_row,
+)
+from dolibarr_mcp.tools.changes import register_change_tools
+
+UTC = ZoneInfo("UTC")
+
+
+class TestWatermarks:
+    """Parsing and rendering of change-feed watermarks."""
+
+    def test_parse_date(self):
+        assert parse_watermark("2025-03-01", UTC) == Watermark(datetime(2025, 3, 1))
+
+    def test_parse_aware_datetime_converts_to_server_tz(self):
+        wm = parse_watermark("2025-03-01T12:00:00+00:00", ZoneInfo("Europe/Berlin"))
+        assert wm.modified == datetime(2025, 3, 1, 13, 0, 0)
+
+    def test_roundtrip(self):
+        wm = Watermark(datetime(2025, 3, 1, 8, 30, 5), 42)
+        assert parse_watermark(wm.encode(), UTC) == wm
+
+    def test_parse_rejects_garbage(self):
+        with pytest.raises(ValueError, match="since"):
+            parse_watermark("yesterday'; --", UTC)
+
+    def test_initial_filter_is_inclusive(self):
+        assert build_changed_since_filter(Watermark(datetime(2025, 1, 1))) == "(t.tms:>=:'2025-01-01 00:00:00')"
+
+    def test_continuation_filter_breaks_ties_by_rowid(self):
+        flt = build_changed_since_filter(Watermark(datetime(2025, 1, 1, 10), 7))
+        assert flt == (
+            "((t.tms:>:'2025-01-01 10:00:00') or "
+            "((t.tms:=:'2025-01-01 10:00:00') and (t.rowid:>:7)))"
+        )
+
+    def test_watermark_from_row(self):
+        wm = watermark_from_row({"id": "12", "date_modification": 1735725600}, UTC)
+        assert wm == Watermark(datetime(2025, 1, 1, 10, 0, 0), 12)
+        assert watermark_from_row({"id": 1}, UTC) is None
+
+
+@pytest.mark.asyncio
+async def test_get_changes_advances_watermark():
+    registered = {}
+    mcp = MagicMock()
+    mcp.tool = lambda: lambda f: registered.setdefault(f.__name__, f)
+    register_change_tools(mcp)
+
+    mock_client = AsyncMock()
+    mock_client.config = Config(dolibarr_url="https://test.dolibarr.com", api_key="key")
+    mock_client.request.return_value = [
+        {"id": 5, "ref": "P5", "label": "A", "type": 0, "price": 1, "price_ttc": 1, "tva_tx": 0, "date_modification": 1735725600},
+        {"id": 9, "ref": "P9", "label": "B", "type": 0, "price": 1, "price_ttc": 1, "tva_tx": 0, "date_modification": 1735725660},
+    ]
+    state_module.set_client(mock_client)
+    try:
+        result = await registered["get_changes"](resource="products", since="2025-01-01", limit=2)
+    finally:
+        state_module.set_client(None)
+
+    method, endpoint = mock_client.request.call_args.args
+    params = mock_client.request.call_args.kwargs["params"]
+    assert (method, endpoint) == ("GET", "products")
+    assert params["sortfield"] == "t.tms,t.rowid"
+    assert params["sqlfilters"] == "(t.tms:>=:'2025-01-01 00:00:00')"
+    assert result.watermark == "2025-01-01 10:01:00|9"
+    assert result.has_more is True
+    assert [item["id"] for item in result.items] == [5, 9]
+    assert [item["date_modification"] for item in result.items] == [1735725600, 1735725660]
+
+
+@pytest.mark.asyncio
+async def test_get_changes_treats_404_as_no_changes():
+    registered = {}
+    mcp = MagicMock()
+    mcp.tool = lambda: lambda f: registered.setdefault(f.__name__, f)
+    register_change_tools(mcp)
+
+    mock_client = AsyncMock()
+    mock_client.config = Config(dolibarr_url="https://test.dolibarr.com", api_key="key")
+    mock_client.request.side_effect = DolibarrAPIError("Not found", status_code=404)
+    state_module.set_client(mock_client)
+    try:
+        result = await registered["get_changes"](resource="invoices", since="2025-01-01 10:00:00|7", limit=50)
+    finally:
+        state_module.set_client(None)
+
+    assert result.items == []
+    assert result.watermark == "2025-01-01 10:00:00|7"
+    assert result.has_more is False
@@ -11,7 +11,7 @@ def test_serve_stdio_transport():
     """Test that serve command works with stdio transport."""
     runner = CliRunner()
     
-    with patch("dolibarr_mcp.cli.mcp") as mock_mcp:
+    with patch("dolibarr_mcp.server.mcp") as mock_mcp:
         # Mock the mcp.run to prevent actually starting the server
         mock_mcp.run = MagicMock()
         
@@ -31,7 +31,7 @@ def test_serve_http_transport():
     """Test that serve command works with http transport."""
     runner = CliRunner()
     
-    with patch("dolibarr_mcp.cli.mcp") as mock_mcp:
+    with patch("dolibarr_mcp.server.mcp") as mock_mcp:
         mock_mcp.run = MagicMock()
         
         from dolibarr_mcp.cli import serve as serve_cmd
@@ -47,3 +47,19 @@ def test_cli_commands_exist():
     assert serve is not None
     assert test is not None
     assert version is not None
+
+
+def test_cli_import_does_not_build_server():
+    """Short-lived commands must not pay for fastmcp and tool registration."""
+    import os
+    import subprocess
+    import sys
+
+    src = os.path.join(os.path.dirname(__file__), "..", "src")
+    env = {**os.environ, "PYTHONPATH": os.pathsep.join(filter(None, [src, os.environ.get("PYTHONPATH")]))}
+    code = (
+        "import sys, dolibarr_mcp.cli; "
+        "print(sorted(m for m in ('fastmcp', 'aiohttp', 'dolibarr_mcp.server') if m in sys.modules))"
+    )
+    result = subprocess.run([sys.executable, "-c", code], env=env, capture_output=True, text=True, check=True)
+    assert result.stdout.strip() == "[]"
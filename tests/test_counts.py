@@ -0,0 +1,140 @@
+"""Tests for count queries that avoid fetching rows."""
+
+import pytest
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from dolibarr_mcp import state as state_module
+from dolibarr_mcp.config import Config
+from dolibarr_mcp.dolibarr_client import DolibarrClient, DolibarrAPIError
+from dolibarr_mcp.fake_server import FakeDolibarr, SeedVolumes, serve_fake_dolibarr
+from dolibarr_mcp.tools.invoices import register_invoice_tools
+from dolibarr_mcp.tools.orders import register_order_tools
+from dolibarr_mcp.tools.proposals import register_proposal_tools
+
+
+@pytest.fixture
+def client():
+    return DolibarrClient(MagicMock())
+
+
+@pytest.mark.asyncio
+async def test_count_uses_pagination_data(client):
+    """The total comes from the pagination metadata of a limit=1 request."""
+    with patch.object(client, "request", new_callable=AsyncMock) as mock_request:
+        mock_request.return_value = {
+            "data": [{"id": 1}],
+            "pagination": {"total": 4711, "page": 0, "page_count": 4711, "limit": 1},
+        }
+        total, method, truncated = await client.count("invoices", params={"status": "unpaid"})
+
+    assert (total, method, truncated) == (4711, "pagination_data", False)
+    mock_request.assert_awaited_once()
+    params = mock_request.call_args.kwargs["params"]
+    assert params["limit"] == 1
+    assert params["pagination_data"] == "true"
+    assert params["status"] == "unpaid"
+
+
+@pytest.mark.asyncio
+async def test_count_falls_back_to_id_scan(client):
+    """Servers without pagination_data are counted with an id-only scan."""
+    with patch.object(client, "request", new_callable=AsyncMock) as mock_request:
+        mock_request.side_effect = [
+            [{"id": 1}],
+            [{"id": i} for i in range(3)],
+            [{"id": 9}],
+        ]
+        total, method, truncated = await client.count("proposals", page_size=3)
+
+    assert (total, method, truncated) == (4, "scan", False)
+    scan_params = mock_request.call_args_list[1].kwargs["params"]
+    assert scan_params["properties"] == "id"
+    assert "pagination_data" not in scan_params
+
+
+@pytest.mark.asyncio
+async def test_count_empty_404(client):
+    """Legacy 404 for empty lists counts as zero."""
+    with patch.object(client, "request", new_callable=AsyncMock) as mock_request:
+        mock_request.side_effect = DolibarrAPIError("Not found", status_code=404)
+        total, _, _ = await client.count("orders")
+
+    assert total == 0
+
+
+@pytest.mark.asyncio
+async def test_invoice_summary_counts_each_status():
+    """get_invoice_summary issues one count per status."""
+    registered = {}
+    mcp = MagicMock()
+    mcp.tool = lambda: lambda f: registered.setdefault(f.__name__, f)
+    register_invoice_tools(mcp)
+
+    mock_client = AsyncMock()
+    mock_client.count.side_effect = [(2, "pagination_data", False), (5, "pagination_data", False), (40, "pagination_data", False)]
+    state_module.set_client(mock_client)
+    try:
+        summary = await registered["get_invoice_summary"](customer_id=42)
+    finally:
+        state_module.set_client(None)
+
+    assert summary == {"draft": 2, "unpaid": 5, "paid": 40}
+    for call in mock_client.count.call_args_list:
+        assert call.kwargs["params"]["thirdparty_ids"] == "42"
+
+
+@pytest.mark.asyncio
+async def test_count_orders_and_proposals_filter_status():
+    """Status counts only cover documents in that status, not the whole list."""
+    registered = {}
+    mcp = MagicMock()
+    mcp.tool = lambda: lambda f: registered.setdefault(f.__name__, f)
+    register_order_tools(mcp)
+    register_proposal_tools(mcp)
+
+    data = FakeDolibarr(SeedVolumes(thirdparties=5, products=3, invoices=1, lines_per_invoice=1,
+                                    orders=40, proposals=40, projects=1, contacts=1, users=1), seed=7)
+    expected_orders = sum(1 for row in data.tables["orders"].values() if row["status"] == 1)
+    expected_proposals = sum(1 for row in data.tables["proposals"].values() if row["status"] == 2)
+    assert 0 < expected_orders < 40 and 0 < expected_proposals < 40
+
+    async with serve_fake_dolibarr(data) as url:
+        async with DolibarrClient(Config(dolibarr_url=url, api_key="k")) as client:
+            state_module.set_client(client)
+            try:
+                orders = await registered["count_orders"](status=1, customer_id=None)
+                proposals = await registered["count_proposals"](status="signed", customer_id=None)
+                everything = await registered["count_orders"](status=None, customer_id=None)
+            finally:
+                state_module.set_client(None)
+
+    assert orders.total == expected_orders
+    assert proposals.total == expected_proposals
+    assert everything.total == 40
+
+
+@pytest.mark.asyncio
+async def test_count_scan_ends_on_legacy_404_after_full_page(client):
+    """A row count that is a multiple of the page size ends with a 404 page on old servers."""
+    with patch.object(client, "request", new_callable=AsyncMock) as mock_request:
+        mock_request.side_effect = [
+            [{"id": 1}],
+            [{"id": i} for i in range(3)],
+            [{"id": i} for i in range(3, 6)],
+            DolibarrAPIError("Not found", status_code=404),
+        ]
+        total, method, truncated = await client.count("orders", page_size=3)
+
+    assert (total, method, truncated) == (6, "scan", False)
+
+
+@pytest.mark.asyncio
+async def test_count_scan_reports_truncation(client):
+    """The id-only scan stops at count_max_rows and says so."""
+    client.count_max_rows = 4
+    with patch.object(client, "request", new_callable=AsyncMock) as mock_request:
+        mock_request.side_effect = [[{"id": 1}]] + [[{"id": i} for i in range(3)]] * 2
+        total, method, truncated = await client.count("orders", page_size=3)
+
+    assert (total, method, truncated) == (4, "scan", True)
+    assert mock_request.await_count == 3
@@ -0,0 +1,153 @@
+"""Tests for server-side result cursors."""
+
+import pytest
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from dolibarr_mcp import state as state_module
+from dolibarr_mcp.config import Config
+from dolibarr_mcp.cursors import CursorError, CursorStore
+from dolibarr_mcp.dolibarr_client import DolibarrClient
+from dolibarr_mcp.tools.cursors import register_cursor_tools
+
+
+def _rows(n):
+    return [{"id": i} for i in range(n)]
+
+
+class TestCursorStore:
+    """Snapshot paging, eviction and token handling."""
+
+    def test_pages_through_snapshot(self):
+        store = CursorStore()
+        page = store.open("invoices", _rows(25), page_size=10)
+        assert [r["id"] for r in page.items] == list(range(10))
+        assert page.total == 25
+
+        page = store.next_page(page.next_cursor)
+        assert page.offset == 10
+        page = store.next_page(page.next_cursor)
+        assert [r["id"] for r in page.items] == list(range(20, 25))
+        assert page.next_cursor is None
+
+    def test_cursor_is_replayable(self):
+        store = CursorStore()
+        first = store.open("invoices", _rows(30), page_size=10)
+        a = store.next_page(first.next_cursor)
+        b = store.next_page(first.next_cursor)
+        assert a.items == b.items
+
+    def test_ttl_eviction(self):
+        store = CursorStore(ttl_seconds=10)
+        with patch("dolibarr_mcp.cursors.time.monotonic", return_value=100.0):
+            page = store.open("invoices", _rows(20), page_size=5)
+        with patch("dolibarr_mcp.cursors.time.monotonic", return_value=200.0):
+            with pytest.raises(CursorError, match="expired"):
+                store.next_page(page.next_cursor)
+        assert store.total_rows == 0
+
+    def test_row_budget_evicts_oldest(self):
+        store = CursorStore(max_total_rows=30)
+        old = store.open("invoices", _rows(20), page_size=5)
+        store.open("orders", _rows(20), page_size=5)
+        assert len(store) == 1
+        assert store.total_rows == 20
+        with pytest.raises(CursorError):
+            store.next_page(old.next_cursor)
+
+    def test_oversized_snapshot_is_truncated(self):
+        store = CursorStore(max_total_rows=15)
+        page = store.open("invoices", _rows(40), page_size=5)
+        assert page.total == 15
+        assert page.truncated is True
+
+    def test_malformed_cursor(self):
+        with pytest.raises(CursorError, match="Malformed"):
+            CursorStore().next_page("not-a-cursor")
+
+    def test_close_releases_rows(self):
+        store = CursorStore()
+        page = store.open("invoices", _rows(20), page_size=5)
+        assert store.close(page.next_cursor) is True
+        assert store.total_rows == 0
+        assert store.close(page.next_cursor) is False
+
+
+class TestClientScan:
+    """DolibarrClient.scan pages with a constant limit."""
+
+    @pytest.mark.asyncio
+    async def test_scan_stops_on_short_page(self):
+        client = DolibarrClient(MagicMock())
+        with patch.object(client, "request", new_callable=AsyncMock) as mock_request:
+            mock_request.side_effect = [_rows(3), _rows(3), _rows(1)]
+            rows, truncated = await client.scan("invoices", page_size=3, max_rows=100)
+
+        assert len(rows) == 7
+        assert truncated is False
+        pages = [call.kwargs["params"]["page"] for call in mock_request.call_args_list]
+        limits = {call.kwargs["params"]["limit"] for call in mock_request.call_args_list}
+        assert pages == [0, 1, 2]
+        assert limits == {3}
+
+    @pytest.mark.asyncio
+    async def test_scan_respects_max_rows(self):
+        client = DolibarrClient(MagicMock())
+        with patch.object(client, "request", new_callable=AsyncMock) as mock_request:
+            mock_request.return_value = _rows(4)
+            rows, truncated = await client.scan("invoices", page_size=4, max_rows=6)
+
+        assert len(rows) == 6
+        assert truncated is True
+        assert mock_request.await_count == 2
+
+
+class TestCursorTools:
+    """open_cursor / next_page tool wiring."""
+
+    @pytest.fixture
+    def tools(self):
+        registered = {}
+        mcp = MagicMock()
+        mcp.tool = lambda: lambda f: registered.setdefault(f.__name__, f)
+        register_cursor_tools(mcp)
+        return registered
+
+    @pytest.mark.asyncio
+    async def test_open_cursor_scans_once(self, tools):
+        config = Config(dolibarr_url="https://test.dolibarr.com", api_key="key", cursor_scan_page_size=500)
+        client = DolibarrClient(config)
+        rows = [
+            {"id": i, "ref": f"INV{i}", "socid": 7, "date": 0, "total_ht": 1, "total_tva": 0,
+             "total_ttc": 1, "paye": 0, "status": 1, "note_private": "x" * 50}
+            for i in range(120)
+        ]
+        state_module.set_client(client)
+        state_module.set_cursor_store(CursorStore())
+        try:
+            with patch.object(client, "request", new_callable=AsyncMock) as mock_request:
+                mock_request.return_value = rows
+                page = await tools["open_cursor"](
+                    resource="invoices", page_size=50, customer_id=7, status=None, max_rows=10000
+                )
+                second = await tools["next_page"](cursor=page.next_cursor)
+                third = await tools["next_page"](cursor=second.next_cursor)
+
+            assert mock_request.await_count == 1
+            params = mock_request.call_args.kwargs["params"]
+            assert params["sqlfilters"] == "(t.fk_soc:=:7)"
+            assert page.total == 120
+            assert "note_private" not in page.items[0]
+            assert len(third.items) == 20
+            assert third.next_cursor is None
+        finally:
+            state_module.set_client(None)
+            state_module.set_cursor_store(None)
+
+    @pytest.mark.asyncio
+    async def test_next_page_rejects_unknown_cursor(self, tools):
+        state_module.set_cursor_store(CursorStore())
+        try:
+            with pytest.raises(ValueError, match="Malformed"):
+                await tools["next_page"](cursor="???")
+        finally:
+            state_module.set_cursor_store(None)
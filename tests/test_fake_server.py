@@ -0,0 +1,114 @@
+"""Tests for the local Dolibarr stand-in server."""
+
+from datetime import datetime, timezone
+
+import pytest
+import pytest_asyncio
+
+from dolibarr_mcp.config import Config
+from dolibarr_mcp.dolibarr_client import DolibarrAPIError, DolibarrClient
+from dolibarr_mcp.fake_server import (
+    FakeDolibarr,
+    FakeServerSettings,
+    SeedVolumes,
+    parse_sqlfilters,
+    serve_fake_dolibarr,
+)
+from dolibarr_mcp.filters import DocumentFilter, Watermark, build_changed_since_filter, compile_document_filter
+
+SMALL = SeedVolumes(thirdparties=50, products=30, invoices=120, lines_per_invoice=3,
+                    orders=20, proposals=20, projects=5, contacts=10, users=3)
+
+
+def test_usf_parser_and_or_like():
+    predicate = parse_sqlfilters("((t.ref:like:'PRD-0%') or (t.label:=:'x')) and (t.rowid:>=:3)")
+    assert predicate({"ref": "PRD-001", "label": "y", "id": 3})
+    assert not predicate({"ref": "PRD-001", "label": "y", "id": 2})
+    assert predicate({"ref": "ABC", "label": "X", "id": 7})  # case-insensitive equality
+    assert parse_sqlfilters("(t.fk_soc:in:(1,2))")({"socid": 2})
+    assert parse_sqlfilters("(t.datef:>=:'2025-01-01')")({"date": 1735689600})
+    assert parse_sqlfilters("(t.ref:'PRD-1')")({"ref": "prd-1"})
+
+
+@pytest_asyncio.fixture
+async def client():
+    data = FakeDolibarr(SMALL, seed=1)
+    async with serve_fake_dolibarr(data, FakeServerSettings(api_key="secret")) as url:
+        async with DolibarrClient(Config(dolibarr_url=url, api_key="secret")) as client:
+            client.fake = data
+            yield client
+
+
+@pytest.mark.asyncio
+async def test_status_and_auth(client):
+    status = await client.get_status()
+    assert status["success"]["dolibarr_version"]
+
+    async with DolibarrClient(Config(dolibarr_url=client.base_url, api_key="wrong")) as other:
+        with pytest.raises(DolibarrAPIError) as excinfo:
+            await other.get_products(limit=1)
+    assert excinfo.value.status_code == 401
+
+
+@pytest.mark.asyncio
+async def test_paging_sort_and_pagination_data(client):
+    first = await client.get_products(limit=10, page=0, sortfield="t.ref", sortorder="DESC")
+    second = await client.get_products(limit=10, page=1, sortfield="t.ref", sortorder="DESC")
+    refs = [p["ref"] for p in first + second]
+    assert refs == sorted(refs, reverse=True)
+    assert refs[0] == "PRD-000030"
+
+    total, method, _ = await client.count("invoices")
+    assert (total, method) == (120, "pagination_data")
+
+    rows, truncated = await client.scan("thirdparties", page_size=7, max_rows=1000)
+    assert len(rows) == 50 and not truncated
+
+
+@pytest.mark.asyncio
+async def test_document_filters_match_python_filtering(client):
+    query = compile_document_filter("invoices", DocumentFilter(min_total_ttc=1000, sort_by="amount", sort_order="desc"))
+    rows = await client.get_invoices(limit=0, sqlfilters=query.sqlfilters, sortfield=query.sortfield, sortorder=query.sortorder)
+
+    expected = [r for r in client.fake.tables["invoices"].values() if float(r["total_ttc"]) >= 1000]
+    assert len(rows) == len(expected)
+    totals = [float(r["total_ttc"]) for r in rows]
+    assert totals == sorted(totals, reverse=True)
+    assert all(len(r["lines"]) == 3 for r in rows)
+
+    ids = await client.request("GET", "invoices", params={"properties": "id", "limit": 5})
+    assert all(set(row) == {"id"} for row in ids)
+
+
+@pytest.mark.asyncio
+async def test_invoice_lifecycle(client):
+    invoice_id = await client.create_invoice({"socid": 1, "date": "2025-03-01"})
+    line_id = await client.add_invoice_line(invoice_id, {"desc": "Work", "subprice": "100", "qty": "2", "tva_tx": "20"})
+    assert isinstance(line_id, int)
+
+    invoice = await client.get_invoice_by_id(invoice_id)
+    assert invoice["ref"] == f"(PROV{invoice_id})"
+    assert invoice["total_ttc"].startswith("240.")
+
+    validated = await client.validate_invoice(invoice_id)
+    assert validated["status"] == 1 and not validated["ref"].startswith("(PROV")
+
+    unpaid = await client.get_invoices(status="unpaid", limit=0)
+    assert invoice_id in {row["id"] for row in unpaid}
+
+    await client.delete_invoice(invoice_id)
+    with pytest.raises(DolibarrAPIError) as excinfo:
+        await client.get_invoice_by_id(invoice_id)
+    assert excinfo.value.status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_change_feed_filter(client):
+    product = client.fake.tables["products"][5]
+    await client.update_product(5, {"label": "Renamed"})
+    modified = datetime.fromtimestamp(product["date_modification"] - 1, timezone.utc).replace(tzinfo=None)
+    since = Watermark(modified=modified)
+    rows = await client.request("GET", "products", params={
+        "sqlfilters": build_changed_since_filter(since), "sortfield": "t.tms,t.rowid", "sortorder": "ASC,ASC",
+    })
+    assert rows[-1]["id"] == 5
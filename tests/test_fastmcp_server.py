@@ -46,3 +46,34 @@ def test_mcp_server_initialized():
     # Verify it's a FastMCP instance
     assert hasattr(server_module.mcp, 'run')
 
+
+
+@pytest.mark.asyncio
+async def test_overlapping_sessions_share_one_client():
+    """HTTP sessions overlap; only the last one to end may close the client."""
+    started = []
+
+    from contextlib import asynccontextmanager
+
+    @asynccontextmanager
+    async def fake_services(server):
+        client = AsyncMock()
+        started.append(client)
+        state_module.set_client(client)
+        try:
+            yield
+        finally:
+            state_module.set_client(None)
+
+    with patch.object(server_module, "dolibarr_services", fake_services):
+        first = server_module.server_lifespan(server_module.mcp)
+        second = server_module.server_lifespan(server_module.mcp)
+        await first.__aenter__()
+        await second.__aenter__()
+        await first.__aexit__(None, None, None)
+        assert state_module.get_client() is started[0]
+        await second.__aexit__(None, None, None)
+
+    assert len(started) == 1
+    with pytest.raises(RuntimeError):
+        state_module.get_client()
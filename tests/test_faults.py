@@ -0,0 +1,123 @@
+"""Tests for the fault-injection transport."""
+
+import time
+from unittest.mock import MagicMock
+
+import pytest
+import pytest_asyncio
+from aiohttp import ClientTimeout
+
+from dolibarr_mcp import state
+from dolibarr_mcp.capabilities import Capabilities
+from dolibarr_mcp.config import Config
+from dolibarr_mcp.dolibarr_client import DolibarrAPIError, DolibarrClient
+from dolibarr_mcp.faults import FaultInjectingTransport, FaultPlan, LatencySpec
+from dolibarr_mcp.fake_server import FakeDolibarr, SeedVolumes, serve_fake_dolibarr
+from dolibarr_mcp.models import InvoiceLine
+from dolibarr_mcp.tools.invoices import register_invoice_tools
+
+SMALL = SeedVolumes(thirdparties=10, products=10, invoices=5, lines_per_invoice=1,
+                    orders=2, proposals=2, projects=1, contacts=2, users=1)
+
+
+class _Draws:
+    """Stand-in for random.Random returning scripted values."""
+
+    def __init__(self, *values):
+        self.values = list(values)
+
+    def random(self):
+        return self.values.pop(0)
+
+
+@pytest_asyncio.fixture
+async def backend():
+    data = FakeDolibarr(SMALL, seed=5)
+    async with serve_fake_dolibarr(data) as url:
+        yield data, Config(dolibarr_url=url, api_key="k")
+
+
+def _client(config, *rules, seed=1):
+    return DolibarrClient(config, transport=FaultInjectingTransport(FaultPlan.from_dict({"seed": seed, "rules": list(rules)})))
+
+
+def test_latency_distributions():
+    import random
+
+    rng = random.Random(3)
+    assert LatencySpec("fixed", ms=20).sample(rng) == 0.02
+    assert all(0.01 <= LatencySpec("uniform", min_ms=10, max_ms=20).sample(rng) <= 0.02 for _ in range(100))
+    tail = [LatencySpec("pareto", min_ms=10, alpha=1.5, max_ms=500).sample(rng) for _ in range(1000)]
+    assert min(tail) >= 0.01 and max(tail) <= 0.5
+    assert sorted(tail)[990] > 5 * sorted(tail)[500]  # heavy tail
+    with pytest.raises(ValueError):
+        LatencySpec("bimodal")
+    with pytest.raises(ValueError):
+        FaultPlan.from_dict({"rules": [{"probability": 2}]})
+
+
+@pytest.mark.asyncio
+async def test_status_burst_then_recovery(backend):
+    _, config = backend
+    async with _client(config, {"endpoint": "products/*", "probability": 0.5, "status": 503, "burst": 3}) as client:
+        client.transport.rng = _Draws(0.1, 0.9)
+        for _ in range(3):
+            with pytest.raises(DolibarrAPIError) as error:
+                await client.get_product_by_id(1)
+            assert error.value.status_code == 503
+        assert (await client.get_product_by_id(1))["id"] == 1
+        assert await client.get_products(limit=1)  # other endpoints untouched
+        assert client.transport.injected == {"status_503": 3}
+        assert client.metrics.snapshot()["errors"] == 3
+
+
+@pytest.mark.asyncio
+async def test_reset_truncate_and_schedule(backend):
+    _, config = backend
+    async with _client(
+        config,
+        {"method": "GET", "endpoint": "thirdparties", "reset": True},
+        {"endpoint": "invoices", "truncate": 0.5},
+        {"endpoint": "products", "status": 500, "start_s": 3600},
+    ) as client:
+        with pytest.raises(DolibarrAPIError, match="HTTP client error"):
+            await client.get_customers(limit=5)
+        truncated = await client.request("GET", "invoices", params={"limit": 5})
+        assert truncated["raw_response"].startswith("[")
+        assert await client.get_products(limit=1)  # window not open yet
+
+
+@pytest.mark.asyncio
+async def test_injected_delay_respects_session_timeout(backend):
+    _, config = backend
+    client = _client(config, {"endpoint": "*", "latency": {"distribution": "fixed", "ms": 5000}})
+    client.timeout = ClientTimeout(total=0.2)
+    async with client:
+        started = time.perf_counter()
+        with pytest.raises(DolibarrAPIError, match="HTTP client error"):
+            await client.get_product_by_id(1)
+        assert time.perf_counter() - started < 1.0
+
+
+@pytest.mark.asyncio
+async def test_create_invoice_rolls_back_on_line_failure(backend):
+    data, config = backend
+    tools = {}
+    mcp = MagicMock()
+    mcp.tool = lambda: (lambda f: tools.setdefault(f.__name__, f))
+    register_invoice_tools(mcp)
+
+    before = set(data.tables["invoices"])
+    async with _client(config, {"method": "POST", "endpoint": "invoices/*/lines", "status": 503}) as client:
+        # Backends without lines in POST add the lines one by one
+        client.capability_cache.store(Capabilities(dolibarr_version="6.0.0"))
+        state.set_client(client)
+        try:
+            with pytest.raises(DolibarrAPIError):
+                await tools["create_invoice"](
+                    customer_id=1, date="2025-01-01", project_id=None, payment_mode_id=None,
+                    lines=[InvoiceLine(desc="x", subprice=1, qty=1, tva_tx=20)],
+                )
+        finally:
+            state.set_client(None)
+    assert set(data.tables["invoices"]) == before
@@ -0,0 +1,79 @@
+"""Tests for the load generator behind ``dolibarr-mcp bench``."""
+
+import random
+
+import pytest
+from fastmcp import Client, FastMCP
+
+from dolibarr_mcp.loadgen import Scenario, format_report, run_load
+
+
+def _scenario(**overrides):
+    data = {
+        "name": "unit",
+        "agents": 3,
+        "calls_per_agent": 10,
+        "calls": [
+            {"tool": "lookup", "weight": 3, "arguments": [{"ref": "A"}, {"ref": "B"}]},
+            {"tool": "broken"},
+        ],
+    }
+    data.update(overrides)
+    return Scenario.from_dict(data)
+
+
+def _server():
+    mcp = FastMCP("load")
+    backend = {"requests": 0}
+
+    @mcp.tool()
+    async def lookup(ref: str) -> str:
+        backend["requests"] += 1
+        return ref
+
+    @mcp.tool()
+    async def broken() -> str:
+        raise ValueError("boom")
+
+    @mcp.tool()
+    async def get_server_metrics() -> dict:
+        return {
+            "requests": backend["requests"],
+            "errors": 0,
+            "endpoints": [{"method": "GET", "endpoint": "products", "requests": backend["requests"]}],
+        }
+
+    return mcp
+
+
+def test_scenario_parsing():
+    scenario = _scenario()
+    assert scenario.duration_seconds is None
+    assert scenario.calls[0].arguments == [{"ref": "A"}, {"ref": "B"}]
+    assert scenario.calls[1].arguments == [{}]
+
+    tools = {scenario.pick(random.Random(i))[0] for i in range(50)}
+    assert tools == {"lookup", "broken"}
+
+    with pytest.raises(ValueError):
+        Scenario.from_dict({"calls": []})
+    with pytest.raises(ValueError):
+        _scenario(calls=[{"tool": "x", "weight": 0}])
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("shared_session", [False, True])
+async def test_run_load_reports_latency_errors_and_backend(shared_session):
+    mcp = _server()
+
+    report = await run_load(lambda: Client(mcp), _scenario(), seed=1, shared_session=shared_session)
+
+    assert report["calls"] == 30
+    lookup, broken = report["tools"]["lookup"], report["tools"]["broken"]
+    assert lookup["calls"] + broken["calls"] == 30
+    assert lookup["errors"] == 0
+    assert broken["errors"] == broken["calls"] and broken["error_types"] == {"ToolError": broken["calls"]}
+    assert lookup["p50_ms"] <= lookup["p99_ms"] <= lookup["max_ms"]
+    assert report["backend"]["requests"] == lookup["calls"]
+    assert report["backend"]["endpoints"] == {"GET products": lookup["calls"]}
+    assert "lookup" in format_report(report)
@@ -0,0 +1,93 @@
+"""Tests for the cached tool manifest."""
+
+import json
+import os
+import subprocess
+import sys
+from typing import List
+
+import pytest
+from fastmcp import Client, FastMCP
+from fastmcp.exceptions import ToolError
+from pydantic import Field
+
+from dolibarr_mcp.manifest import CachingToolRegistrar, ToolManifest
+from dolibarr_mcp.models import ProductResult
+from dolibarr_mcp.tools.invoices import register_invoice_tools
+from dolibarr_mcp.tools.products import register_product_tools
+
+
+def _register_demo(mcp):
+    @mcp.tool()
+    async def add(a: int = Field(..., ge=0, description="First"), b: int = Field(1, description="Second")) -> int:
+        """Add two numbers."""
+        return a + b
+
+    @mcp.tool()
+    async def products(n: int = Field(1)) -> List[ProductResult]:
+        """Fake products."""
+        return [ProductResult(id=i, ref=f"P{i}", label="x", type=0, price=1, price_ttc=1.2, tva_tx=20) for i in range(n)]
+
+
+def _build(path):
+    mcp = FastMCP("t")
+    manifest = ToolManifest(path)
+    registrar = CachingToolRegistrar(mcp, manifest)
+    for register in (_register_demo, register_product_tools, register_invoice_tools):
+        register(registrar)
+    manifest.save()
+    return mcp, manifest
+
+
+async def _listing(mcp):
+    return [tool.to_mcp_tool(name=tool.key).model_dump() for tool in await mcp._list_tools()]
+
+
+@pytest.mark.asyncio
+async def test_cached_tools_match_generated_ones(tmp_path):
+    path = str(tmp_path / "tools.json")
+    fresh, first = _build(path)
+    cached, second = _build(path)
+
+    assert first.hits == 0 and first.misses > 0
+    assert second.misses == 0 and second.hits == first.misses
+    assert await _listing(cached) == await _listing(fresh)
+
+    async with Client(cached) as client:
+        assert (await client.call_tool("add", {"a": 2, "b": 3})).data == 5
+        assert len((await client.call_tool("products", {"n": 2})).structured_content["result"]) == 2
+        with pytest.raises(ToolError):
+            await client.call_tool("add", {"a": -1})
+
+
+def test_unreadable_manifest_is_regenerated(tmp_path):
+    path = tmp_path / "tools.json"
+    path.write_text("{not json")
+
+    _, manifest = _build(str(path))
+
+    assert manifest.hits == 0
+    assert "add" in json.loads(path.read_text())["tools"]
+
+
+def test_manifest_key_is_stable():
+    from dolibarr_mcp.manifest import manifest_key
+
+    assert manifest_key() == manifest_key()
+    assert ToolManifest.for_directory("/tmp/x").path.endswith(f"tools-{manifest_key()}.json")
+
+
+def test_importing_the_server_does_not_write_the_cache(tmp_path):
+    src = os.path.join(os.path.dirname(__file__), "..", "src")
+    env = {
+        **os.environ,
+        "PYTHONPATH": os.pathsep.join(filter(None, [src, os.environ.get("PYTHONPATH")])),
+        "DOLIBARR_MANIFEST_CACHE": "true",
+        "DOLIBARR_MANIFEST_CACHE_DIR": str(tmp_path),
+        "DOLIBARR_TOOLSETS": "products",
+    }
+    code = "import os, sys, dolibarr_mcp.server as s; print(len(os.listdir(sys.argv[1]))); s.save_tool_manifest()"
+    result = subprocess.run([sys.executable, "-W", "ignore", "-c", code, str(tmp_path)],
+                            env=env, capture_output=True, text=True, check=True)
+    assert result.stdout.strip() == "0"
+    assert [p.name for p in tmp_path.iterdir()] == [os.path.basename(ToolManifest.for_directory(str(tmp_path)).path)]
@@ -0,0 +1,114 @@
+"""Tests for per-endpoint request metrics."""
+
+import pytest
+from unittest.mock import MagicMock
+
+from dolibarr_mcp.dolibarr_client import DolibarrClient, DolibarrAPIError
+from dolibarr_mcp.metrics import LatencyHistogram, RequestMetrics, RequestTrace, normalize_endpoint
+from dolibarr_mcp.transport import Transport, TransportResponse
+
+
+def test_normalize_endpoint_collapses_ids():
+    assert normalize_endpoint("invoices/42/lines") == "invoices/{id}/lines"
+    assert normalize_endpoint("/thirdparties/7?foo=1") == "thirdparties/{id}"
+    assert normalize_endpoint("status") == "status"
+
+
+def test_histogram_percentiles():
+    hist = LatencyHistogram()
+    for _ in range(90):
+        hist.observe(0.004)
+    for _ in range(10):
+        hist.observe(0.8)
+
+    assert hist.count == 100
+    assert hist.percentile(50) <= 0.005
+    assert 0.5 <= hist.percentile(99) <= 0.8
+    assert hist.summary()["max_ms"] == 800.0
+
+
+def test_metrics_snapshot_and_prometheus():
+    metrics = RequestMetrics()
+    trace = RequestTrace(bytes_in=120, bytes_out=30, connection_reused=True)
+    metrics.observe_request("get", "invoices/1", 200, 0.02, trace)
+    metrics.observe_request("GET", "invoices/2", 404, 0.01)
+    metrics.observe_request("POST", "invoices", 0, 1.5)
+    metrics.record_cache("capabilities", hit=True)
+
+    snap = metrics.snapshot()
+    assert snap["requests"] == 3
+    assert snap["errors"] == 2
+    by_key = {(e["method"], e["endpoint"]): e for e in snap["endpoints"]}
+    get_stats = by_key[("GET", "invoices/{id}")]
+    assert get_stats["requests"] == 2
+    assert get_stats["errors"] == {"404": 1}
+    assert get_stats["bytes_in"] == 120
+    assert by_key[("POST", "invoices")]["errors"] == {"connection": 1}
+    assert snap["connections"]["reused"] == 1
+    assert snap["cache"]["capabilities"] == {"hits": 1, "misses": 0}
+
+    text = metrics.to_prometheus()
+    assert 'dolibarr_client_requests_total{method="GET",endpoint="invoices/{id}"} 2' in text
+    assert 'dolibarr_client_request_duration_seconds_bucket{method="POST",endpoint="invoices",le="+Inf"} 1' in text
+    assert "dolibarr_client_queue_wait_seconds_count 1" in text
+
+    metrics.reset()
+    assert metrics.snapshot()["requests"] == 0
+
+
+class _Response:
+    def __init__(self, status, text):
+        self.status = status
+        self._text = text
+        self.reason = "Not Found"
+
+    async def text(self):
+        return self._text
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+
+@pytest.mark.asyncio
+async def test_client_records_requests():
+    client = DolibarrClient(MagicMock(dolibarr_url="https://erp.example/api/index.php", api_key="k"))
+    client.session = MagicMock()
+    client.session.request = MagicMock(side_effect=[
+        _Response(200, '{"id": 5}'),
+        _Response(404, '{"error": {"message": "Not found"}}'),
+    ])
+
+    assert await client.request("GET", "invoices/5") == {"id": 5}
+    with pytest.raises(DolibarrAPIError):
+        await client.request("GET", "invoices/6")
+
+    assert client.session.request.call_args.kwargs["trace_request_ctx"] is not None
+    endpoint = client.metrics.snapshot()["endpoints"][0]
+    assert endpoint["endpoint"] == "invoices/{id}"
+    assert endpoint["requests"] == 2
+    assert endpoint["errors"] == {"404": 1}
+
+
+@pytest.mark.asyncio
+async def test_transport_retries_reach_client_metrics():
+    class _RetryingTransport(Transport):
+        async def send(self, session, method, endpoint, url, kwargs):
+            self.metrics.record_retry(method, endpoint)
+            return TransportResponse(200, "OK", '{"id": 5}')
+
+    client = DolibarrClient(
+        MagicMock(dolibarr_url="https://erp.example/api/index.php", api_key="k"),
+        transport=_RetryingTransport(),
+    )
+    client.session = MagicMock()
+
+    await client.request("GET", "invoices/5")
+
+    assert client.transport.metrics is client.metrics
+    client.for_entity(2)
+    assert client.transport.metrics is client.metrics
+    assert client.metrics.snapshot()["endpoints"][0]["retries"] == 1
+    assert 'dolibarr_client_retries_total{method="GET",endpoint="invoices/{id}"} 1' in client.metrics.to_prometheus()
@@ -0,0 +1,138 @@
+"""Tests for Multicompany entity routing and fan-out."""
+
+import asyncio
+
+import pytest
+import pytest_asyncio
+from fastmcp import Client, FastMCP
+from unittest.mock import MagicMock, patch
+
+from dolibarr_mcp import middleware as middleware_module
+from dolibarr_mcp import state
+from dolibarr_mcp.budget import track_requests
+from dolibarr_mcp.config import Config
+from dolibarr_mcp.dolibarr_client import DolibarrClient
+from dolibarr_mcp.fake_server import FakeDolibarr, SeedVolumes, serve_fake_dolibarr
+from dolibarr_mcp.middleware import EntityMiddleware
+from dolibarr_mcp.multicompany import FanOutError, fan_out, parse_entities, use_entity
+from dolibarr_mcp.tools.customers import register_customer_tools
+
+SMALL = SeedVolumes(thirdparties=6, products=2, invoices=2, lines_per_invoice=1,
+                    orders=1, proposals=1, projects=1, contacts=1, users=1)
+
+
+@pytest_asyncio.fixture
+async def backend():
+    data = FakeDolibarr(SMALL, seed=4)
+    for row_id in (4, 5, 6):
+        data.tables["thirdparties"][row_id]["entity"] = "2"
+    async with serve_fake_dolibarr(data) as url:
+        async with DolibarrClient(Config(dolibarr_url=url, api_key="k")) as client:
+            yield data, client
+
+
+def test_parse_entities():
+    assert parse_entities("1, 2,2,3") == [1, 2, 3]
+    assert parse_entities([2, "1"]) == [2, 1]
+    assert parse_entities(None) == [] and parse_entities("") == []
+    with pytest.raises(ValueError):
+        parse_entities("main")
+    with pytest.raises(ValueError):
+        parse_entities("0")
+
+
+@pytest.mark.asyncio
+async def test_entity_clients_share_session_and_send_header(backend):
+    _, client = backend
+    second = client.for_entity(2)
+    assert client.for_entity(None) is client
+    assert client.for_entity(2) is second
+    assert second.session is client.session
+    assert second.metrics is client.metrics
+    assert second.capability_cache is not client.capability_cache
+
+    rows = await second.get_customers(limit=0)
+    assert {row["id"] for row in rows} == {4, 5, 6}
+    await second.close_session()
+    assert not client.session.closed
+
+
+@pytest.mark.asyncio
+async def test_fan_out_runs_entities_concurrently(backend):
+    _, client = backend
+    in_flight = 0
+    peak = 0
+
+    async def call(entity_client):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        return await entity_client.get_customers(limit=0)
+
+    with track_requests("search") as counter:
+        result = await fan_out(client, [1, 2], call)
+    assert peak == 2
+    assert counter.count == 2
+    assert sorted(row["id"] for row in result.rows) == [1, 2, 3, 4, 5, 6]
+    assert {row["entity"] for row in result.rows} == {"1", "2"}
+
+
+@pytest.mark.asyncio
+async def test_fan_out_dedupes_shared_objects_and_reports_failures(backend):
+    _, client = backend
+
+    async def shared(entity_client):
+        if entity_client.entity == 3:
+            raise RuntimeError("entity offline")
+        return [{"id": 9, "entity": "1"}]
+
+    with pytest.raises(FanOutError, match="entity 3: entity offline"):
+        await fan_out(client, [1, 2, 3], shared)
+    result = await fan_out(client, [1, 2, 3], shared, partial=True)
+    assert result.rows == [{"id": 9, "entity": "1"}]
+    assert list(result.errors) == [3]
+
+
+@pytest.mark.asyncio
+async def test_search_customers_across_entities(backend):
+    _, client = backend
+    tools = {}
+    mcp = MagicMock()
+    mcp.tool = lambda: (lambda f: tools.setdefault(f.__name__, f))
+    register_customer_tools(mcp)
+
+    state.set_client(client)
+    try:
+        found = await tools["search_customers"](query="Company", limit=20, entities=[1, 2])
+        with use_entity(2):
+            scoped = await tools["search_customers"](query="Company", limit=20, entities=None)
+        default = await tools["search_customers"](query="Company", limit=20)
+        with pytest.raises(ValueError):
+            await tools["search_customers"](query="Company", limit=20, entities=[0])
+    finally:
+        state.set_client(None)
+    assert sorted((c.entity, c.id) for c in found) == [(1, 1), (1, 2), (1, 3), (2, 4), (2, 5), (2, 6)]
+    assert [c.id for c in scoped] == [4, 5, 6]
+    assert [c.id for c in default] == [1, 2, 3, 4, 5, 6]  # no DOLAPIENTITY header
+
+
+@pytest.mark.asyncio
+async def test_entity_header_selects_client():
+    mcp = FastMCP("entity-test")
+    mcp.add_middleware(EntityMiddleware())
+
+    @mcp.tool()
+    async def which_entity() -> int:
+        return state.get_client().entity or 0
+
+    state.set_client(DolibarrClient(Config(dolibarr_url="https://erp.example", api_key="k")))
+    try:
+        async with Client(mcp) as client:
+            with patch.object(middleware_module, "get_http_headers", return_value={}):
+                assert (await client.call_tool("which_entity", {})).data == 0
+            with patch.object(middleware_module, "get_http_headers", return_value={"x-dolibarr-entity": "3"}):
+                assert (await client.call_tool("which_entity", {})).data == 3
+    finally:
+        state.set_client(None)
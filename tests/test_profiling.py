@@ -0,0 +1,115 @@
+"""Tests for on-demand tool profiling."""
+
+import os
+import pstats
+
+import pytest
+from click.testing import CliRunner
+from fastmcp import Client, FastMCP
+from unittest.mock import MagicMock, patch
+
+from dolibarr_mcp.cli import serve
+from dolibarr_mcp.middleware import ProfilingMiddleware
+from dolibarr_mcp.profiling import ProfilerBusy, ToolProfiler, get_profiler
+
+
+@pytest.fixture
+def profiler():
+    profiler = get_profiler()
+    yield profiler
+    if profiler.armed:
+        profiler.stop()
+
+
+def _busy_work(n: int) -> int:
+    return sum(i * i for i in range(n))
+
+
+@pytest.mark.asyncio
+async def test_profiles_next_n_calls_per_tool(profiler, tmp_path):
+    mcp = FastMCP("profiling-test")
+    mcp.add_middleware(ProfilingMiddleware())
+
+    @mcp.tool()
+    async def crunch(n: int) -> int:
+        return _busy_work(n)
+
+    profiler.start(str(tmp_path), calls=2)
+    async with Client(mcp) as client:
+        for _ in range(3):
+            await client.call_tool("crunch", {"n": 1000})
+
+    assert not profiler.armed  # disarmed after two calls
+    stats = pstats.Stats(str(tmp_path / "crunch.pstats"))
+    assert any(func[2] == "_busy_work" for func in stats.stats)
+
+
+def test_only_one_session_at_a_time(tmp_path):
+    profiler = ToolProfiler()
+    profiler.start(str(tmp_path))
+    with pytest.raises(ProfilerBusy):
+        profiler.start(str(tmp_path))
+    result = profiler.stop()
+    assert result == {"stopped": True, "calls": {}, "files": []}
+
+
+def test_time_limit_expires(tmp_path):
+    profiler = ToolProfiler()
+    profiler.start(str(tmp_path), seconds=0.001)
+    profiler.deadline = 0  # already expired
+    assert profiler.begin() is None
+    assert not profiler.armed
+
+
+def test_serve_profile_flag_arms_profiler(tmp_path, monkeypatch):
+    monkeypatch.delenv("DOLIBARR_PROFILE_DIR", raising=False)
+    monkeypatch.setattr(get_profiler(), "default_dir", None)  # restored after the test
+    runner = CliRunner()
+    armed = {}
+
+    def fake_run(**kwargs):
+        armed["during_run"] = get_profiler().status()
+
+    with patch("dolibarr_mcp.server.mcp") as mock_mcp:
+        mock_mcp.run = MagicMock(side_effect=fake_run)
+        result = runner.invoke(serve, ["--profile", "--profile-dir", str(tmp_path), "--profile-calls", "5"])
+
+    assert result.exit_code == 0, result.output
+    assert armed["during_run"]["armed"] is True
+    assert armed["during_run"]["remaining_calls"] == 5
+    assert armed["during_run"]["output_dir"] == str(tmp_path)
+    assert not get_profiler().armed
+    assert get_profiler().default_dir == str(tmp_path)
+    assert "DOLIBARR_PROFILE_DIR" not in os.environ
+
+
+def test_serve_profile_default_comes_from_config(tmp_path, monkeypatch):
+    # The alias is only honoured by Config, not by a plain DOLIBARR_PROFILE_DIR lookup.
+    monkeypatch.delenv("DOLIBARR_PROFILE_DIR", raising=False)
+    monkeypatch.setenv("PROFILE_DIR", str(tmp_path))
+    monkeypatch.setattr(get_profiler(), "default_dir", None)
+    armed = {}
+
+    def fake_run(**kwargs):
+        armed["during_run"] = get_profiler().status()
+
+    with patch("dolibarr_mcp.server.mcp") as mock_mcp:
+        mock_mcp.run = MagicMock(side_effect=fake_run)
+        result = CliRunner().invoke(serve, ["--profile", "--profile-calls", "1"])
+
+    assert result.exit_code == 0, result.output
+    assert armed["during_run"]["output_dir"] == str(tmp_path)
+    assert not get_profiler().armed
+
+@pytest.mark.asyncio
+async def test_start_profiling_tool_uses_serve_directory(tmp_path, monkeypatch, profiler):
+    from dolibarr_mcp.tools.admin import register_admin_tools
+
+    tools = {}
+    mcp = MagicMock()
+    mcp.tool = lambda: (lambda f: tools.setdefault(f.__name__, f))
+    register_admin_tools(mcp)
+    monkeypatch.setattr(profiler, "default_dir", str(tmp_path / "from-cli"))
+
+    status = await tools["start_profiling"](calls=1, seconds=None)
+    assert status["output_dir"] == str(tmp_path / "from-cli")
@@ -0,0 +1,120 @@
+"""Tests for per-tool Dolibarr request budgets."""
+
+import logging
+
+import pytest
+from fastmcp import Client, FastMCP
+from fastmcp.exceptions import ToolError
+from unittest.mock import MagicMock
+
+from dolibarr_mcp import state as state_module
+from dolibarr_mcp.budget import (
+    RequestBudgetExceeded,
+    TOOL_BUDGETS,
+    ToolBudget,
+    check_budget,
+    configure_scan_budgets,
+    scan_budgets,
+    set_budget_mode,
+    track_requests,
+)
+from dolibarr_mcp.config import Config
+from dolibarr_mcp.middleware import RequestBudgetMiddleware
+from dolibarr_mcp.models import InvoiceLine
+from dolibarr_mcp.tools import TOOLSETS, register_toolsets
+from dolibarr_mcp.tools.invoices import register_invoice_tools
+from dolibarr_mcp.tools.products import register_product_tools
+
+
+@pytest.fixture
+def tools(http_client):
+    registered = {}
+    mcp = MagicMock()
+    mcp.tool = lambda: (lambda f: registered.setdefault(f.__name__, f))
+    register_invoice_tools(mcp)
+    register_product_tools(mcp)
+    state_module.set_client(http_client)
+    yield registered
+    state_module.set_client(None)
+
+
+def test_budget_scales_with_items():
+    budget = ToolBudget(1, per_item=1, items="lines")
+    assert budget.limit({"lines": [1, 2, 3]}) == 4
+    assert budget.limit({}) == 1
+    assert TOOL_BUDGETS["resolve_product_ref"].limit({}) == 1
+
+
+def test_scan_budgets_follow_row_caps_and_page_sizes(monkeypatch):
+    monkeypatch.setattr("dolibarr_mcp.budget.TOOL_BUDGETS", dict(TOOL_BUDGETS))
+    budgets = scan_budgets(count_max_rows=5000, cursor_page_size=100)
+    assert budgets["count_orders"].limit({}) == 1 + 5 + 1
+    assert budgets["get_invoice_summary"].limit({}) == 3 + 3 * 6
+    assert budgets["open_cursor"].limit({"max_rows": 250}) == 3 + 1
+    assert budgets["open_cursor"].limit({}) == 1000 + 1
+
+    configure_scan_budgets(Config(dolibarr_url="https://erp.example", api_key="k",
+                                  count_max_rows=2000, cursor_scan_page_size=50))
+    from dolibarr_mcp import budget
+    assert budget.TOOL_BUDGETS["count_invoices"].limit({}) == 1 + 2 + 1
+    assert budget.TOOL_BUDGETS["open_cursor"].limit({"max_rows": 100}) == 2 + 1
+
+
+@pytest.mark.asyncio
+async def test_every_registered_tool_has_a_budget():
+    mcp = FastMCP("budgets")
+    register_toolsets(mcp, list(TOOLSETS))
+    names = {tool.name for tool in await mcp._list_tools()}
+    assert names and not names - set(TOOL_BUDGETS)
+
+
+@pytest.mark.asyncio
+async def test_resolve_product_ref_within_budget(tools, http_client, request_budget):
+    http_client.handler = lambda method, url, kwargs: [{"id": 3, "ref": "W-1", "label": "Widget"}]
+    with request_budget("resolve_product_ref") as counter:
+        await tools["resolve_product_ref"](ref="W-1")
+    assert counter.requests == ["GET products"]
+
+
+@pytest.mark.asyncio
+async def test_create_invoice_one_request_per_line(tools, http_client, request_budget):
+    http_client.handler = lambda method, url, kwargs: 42 if url.endswith("/invoices") else 1
+    lines = [InvoiceLine(desc=f"Item {i}", subprice=10, qty=1, tva_tx=20) for i in range(3)]
+    with request_budget("create_invoice", {"lines": lines}) as counter:
+        await tools["create_invoice"](customer_id=1, date="2025-01-01", lines=lines)
+    assert counter.count == 4
+
+
+def test_exceeding_budget_fails_or_warns(caplog):
+    with track_requests("resolve_product_ref") as counter:
+        counter.requests.extend(["GET products", "GET products/{id}"])
+
+    with pytest.raises(RequestBudgetExceeded, match="made 2 Dolibarr requests, budget is 1"):
+        check_budget("resolve_product_ref", {}, counter, mode="fail")
+
+    with caplog.at_level(logging.WARNING, logger="dolibarr_mcp.budget"):
+        assert check_budget("resolve_product_ref", {}, counter, mode="warn") == 1
+    assert "budget is 1" in caplog.text
+
+    assert check_budget("not_a_tool", {}, counter, mode="fail") is None
+
+
+@pytest.mark.asyncio
+async def test_middleware_fails_n_plus_one_tool(http_client):
+    mcp = FastMCP("budget-test")
+    mcp.add_middleware(RequestBudgetMiddleware())
+
+    @mcp.tool()
+    async def resolve_product_ref(ref: str) -> int:
+        # Deliberate per-item loop
+        for product_id in range(3):
+            await http_client.request("GET", f"products/{product_id}")
+        return 1
+
+    set_budget_mode("fail")
+    try:
+        async with Client(mcp) as client:
+            with pytest.raises(ToolError, match="budget is 1"):
+                await client.call_tool("resolve_product_ref", {"ref": "W-1"})
+    finally:
+        set_budget_mode("warn")
@@ -0,0 +1,67 @@
+"""Tests for the slow-call log."""
+
+import logging
+
+import pytest
+from fastmcp import Client, FastMCP
+
+from dolibarr_mcp.middleware import SlowToolLogMiddleware
+from dolibarr_mcp.slowlog import SlowLog, payload_sample, set_slow_log
+
+
+@pytest.fixture
+def slow_log():
+    log = SlowLog(request_threshold=0.0, tool_threshold=0.0, payload_bytes=20)
+    set_slow_log(log)
+    yield log
+    set_slow_log(None)
+
+
+def test_payload_sample_caps_size():
+    assert payload_sample({"a": 1}, 100) == '{"a":1}'
+    assert payload_sample("x" * 30, 10) == "x" * 10 + "…(+20 chars)"
+    assert payload_sample(None, 10) == ""
+
+
+def test_fast_requests_are_not_logged(caplog):
+    log = SlowLog(request_threshold=1.0)
+    with caplog.at_level(logging.WARNING, logger="dolibarr_mcp.slow"):
+        assert log.log_request("GET", "products", {}, 200, 0.2) is False
+    assert caplog.text == ""
+
+
+@pytest.mark.asyncio
+async def test_slow_request_logged_with_breakdown(http_client, slow_log, caplog):
+    http_client.handler = lambda method, url, kwargs: [{"id": i, "label": "p" * 50} for i in range(5)]
+
+    with caplog.at_level(logging.WARNING, logger="dolibarr_mcp.slow"):
+        await http_client.request("GET", "products", params={"limit": 5})
+
+    record = caplog.records[-1]
+    message = record.getMessage()
+    assert message.startswith("Slow Dolibarr request GET products:")
+    assert 'params={"limit":5}' in message
+    assert "queue_wait=" in message
+    assert "…(+" in message  # response sample is capped
+
+
+@pytest.mark.asyncio
+async def test_slow_tool_logged_with_request_time(http_client, slow_log, caplog):
+    mcp = FastMCP("slowlog-test")
+    mcp.add_middleware(SlowToolLogMiddleware())
+
+    @mcp.tool()
+    async def fetch_two(ref: str) -> int:
+        await http_client.request("GET", "products/1")
+        await http_client.request("GET", "products/2")
+        return 2
+
+    with caplog.at_level(logging.WARNING, logger="dolibarr_mcp.slow"):
+        async with Client(mcp) as client:
+            await client.call_tool("fetch_two", {"ref": "W-1"})
+
+    tool_lines = [r.getMessage() for r in caplog.records if r.getMessage().startswith("Slow tool call")]
+    assert len(tool_lines) == 1
+    assert "fetch_two" in tool_lines[0]
+    assert "(2 Dolibarr requests" in tool_lines[0]
+    assert 'arguments={"ref":"W-1"}' in tool_lines[0]
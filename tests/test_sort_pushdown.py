@@ -0,0 +1,95 @@
+"""Tests for sort pushdown and top-N document queries."""
+
+import pytest
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from dolibarr_mcp import state as state_module
+from dolibarr_mcp.dolibarr_client import DolibarrClient
+from dolibarr_mcp.models import OrderResult
+from dolibarr_mcp.tools.documents import register_document_tools
+
+
+def _order(i, total):
+    return {"id": i, "ref": f"CO{i}", "socid": 1, "date_commande": 0, "total_ht": total, "total_ttc": total, "statut": 1}
+
+
+@pytest.fixture
+def tools():
+    registered = {}
+    mcp = MagicMock()
+    mcp.tool = lambda: lambda f: registered.setdefault(f.__name__, f)
+    register_document_tools(mcp)
+    return registered
+
+
+@pytest.mark.asyncio
+async def test_client_passes_sort_parameters():
+    """Sort parameters reach Dolibarr unchanged."""
+    client = DolibarrClient(MagicMock())
+    with patch.object(client, "request", new_callable=AsyncMock) as mock_request:
+        mock_request.return_value = []
+        await client.get_products(limit=5, sortfield="t.price", sortorder="DESC")
+        await client.get_invoices(limit=5, sortfield="t.datef,t.rowid", sortorder="DESC,DESC")
+
+    product_params = mock_request.call_args_list[0].kwargs["params"]
+    invoice_params = mock_request.call_args_list[1].kwargs["params"]
+    assert product_params == {"limit": 5, "sortfield": "t.price", "sortorder": "DESC"}
+    assert invoice_params["sortfield"] == "t.datef,t.rowid"
+
+
+@pytest.mark.asyncio
+async def test_client_omits_unset_sort():
+    client = DolibarrClient(MagicMock())
+    with patch.object(client, "request", new_callable=AsyncMock) as mock_request:
+        mock_request.return_value = []
+        await client.get_orders(limit=10)
+
+    assert mock_request.call_args.kwargs["params"] == {"limit": 10}
+
+
+def test_list_filters_are_keyword_only():
+    client = DolibarrClient(MagicMock())
+    for method in (client.get_invoices, client.get_orders, client.get_proposals):
+        with pytest.raises(TypeError):
+            method(10, None, "t.ref", "1", 2)
+
+
+@pytest.mark.asyncio
+async def test_largest_open_orders(tools):
+    """Top-N requests exactly N rows sorted by amount in Dolibarr."""
+    mock_client = AsyncMock()
+    mock_client.get_orders.return_value = [_order(3, 900.0), _order(1, 500.0)]
+    state_module.set_client(mock_client)
+    try:
+        result = await tools["get_top_documents"](
+            document="orders", rank_by="largest", n=2, status="validated", customer_id=None
+        )
+    finally:
+        state_module.set_client(None)
+
+    kwargs = mock_client.get_orders.call_args.kwargs
+    assert kwargs["limit"] == 2
+    assert kwargs["sortfield"] == "t.total_ttc,t.rowid"
+    assert kwargs["sortorder"] == "DESC,DESC"
+    assert kwargs["sqlfilters"] == "(t.fk_statut:=:1)"
+    assert result.document == "orders"
+    assert [r.id for r in result.items] == [3, 1]
+    assert all(isinstance(r, OrderResult) for r in result.items)
+
+
+@pytest.mark.asyncio
+async def test_latest_invoices_use_native_status(tools):
+    mock_client = AsyncMock()
+    mock_client.get_invoices.return_value = []
+    state_module.set_client(mock_client)
+    try:
+        await tools["get_top_documents"](
+            document="invoices", rank_by="latest", n=10, status="unpaid", customer_id=42
+        )
+    finally:
+        state_module.set_client(None)
+
+    kwargs = mock_client.get_invoices.call_args.kwargs
+    assert kwargs["status"] == "unpaid"
+    assert kwargs["sortfield"] == "t.datef,t.rowid"
+    assert kwargs["sqlfilters"] == "(t.fk_soc:=:42)"
@@ -0,0 +1,158 @@
+"""Tests for per-tenant clients on a shared server."""
+
+import pytest
+import pytest_asyncio
+from fastmcp import Client, FastMCP
+from unittest.mock import patch
+
+from dolibarr_mcp import middleware as middleware_module
+from dolibarr_mcp import state
+from dolibarr_mcp.config import Config
+from dolibarr_mcp.dolibarr_client import DolibarrClient
+from dolibarr_mcp.fake_server import FakeDolibarr, SeedVolumes, serve_fake_dolibarr
+from dolibarr_mcp.middleware import TenantMiddleware
+from dolibarr_mcp.tenants import TenantError, TenantKey, TenantPool, current_tenant, set_tenant_pool
+from dolibarr_mcp.transport import Transport
+
+SMALL = SeedVolumes(thirdparties=3, products=3, invoices=1, lines_per_invoice=1,
+                    orders=1, proposals=1, projects=1, contacts=1, users=1)
+
+
+@pytest_asyncio.fixture
+async def backend_url():
+    async with serve_fake_dolibarr(FakeDolibarr(SMALL, seed=2)) as url:
+        yield url
+
+
+def _headers(key, url=None):
+    headers = {"x-dolibarr-api-key": key}
+    if url:
+        headers["x-dolibarr-url"] = url
+    return headers
+
+
+def test_resolve_checks_hosts():
+    pool = TenantPool(Config(dolibarr_url="https://erp.example/api/index.php", api_key="k"),
+                      allowed_hosts=["other.example"])
+    assert pool.resolve({}) is None
+    key = pool.resolve(_headers("tenant-key"))
+    assert key == TenantKey("https://erp.example/api/index.php", "tenant-key")
+    assert "tenant-key" not in repr(key)
+    assert pool.resolve(_headers("k2", "https://other.example")).url == "https://other.example/api/index.php"
+    with pytest.raises(TenantError, match="not allowed"):
+        pool.resolve(_headers("k3", "http://169.254.169.254/"))
+    with pytest.raises(TenantError):
+        pool.resolve(_headers("k4", "ftp://erp.example"))
+    assert pool.resolve(_headers("k5", "https://other.example:443")).api_key == "k5"
+    for url in ("http://other.example:8080", "http://other.example", "http://erp.example", "https://erp.example:8443"):
+        with pytest.raises(TenantError, match="not allowed"):
+            pool.resolve(_headers("k6", url))
+
+
+def test_allowed_hosts_accept_origins():
+    pool = TenantPool(Config(dolibarr_url="https://erp.example/api/index.php", api_key="k"),
+                      allowed_hosts=["http://erp3.local:8080"])
+    assert pool.resolve(_headers("k", "http://erp3.local:8080")).url == "http://erp3.local:8080/api/index.php"
+    with pytest.raises(TenantError, match="not allowed"):
+        pool.resolve(_headers("k", "https://erp3.local:8080"))
+
+
+@pytest.mark.asyncio
+async def test_tenants_use_configured_transport_and_capability_ttl(backend_url):
+    config = Config(dolibarr_url=backend_url, api_key="k", capabilities_ttl_seconds=5)
+    transport = Transport()
+    owner = DolibarrClient(config, transport=transport)
+    pool = TenantPool(config, allowed_hosts=["https://other.example"])
+    pool.adopt_transport(transport)
+    try:
+        async with pool.lease(TenantKey(backend_url, "a")) as a:
+            await a.client.get_products(limit=1)
+        async with pool.lease(TenantKey("https://other.example/api/index.php", "b")) as b:
+            pass
+        assert a.client.transport is transport and not a.client.owns_transport
+        assert transport.metrics is owner.metrics
+        assert a.client.capability_cache.ttl == 5
+        assert b.client.transport is None
+    finally:
+        await pool.close()
+
+
+@pytest.mark.asyncio
+async def test_tenants_share_connector_but_not_caches(backend_url):
+    pool = TenantPool(Config(dolibarr_url=backend_url, api_key="k"))
+    try:
+        async with pool.lease(TenantKey(backend_url, "a")) as a:
+            assert current_tenant() is a
+            await a.client.get_products(limit=1)
+        async with pool.lease(TenantKey(backend_url, "b")) as b:
+            await b.client.get_products(limit=1)
+        assert current_tenant() is None
+
+        assert a.client.session.connector is b.client.session.connector
+        assert a.client.session.headers["DOLAPIKEY"] == "a"
+        assert b.client.session.headers["DOLAPIKEY"] == "b"
+        assert a.client.metrics is not b.client.metrics
+        assert a.cursor_store is not b.cursor_store
+        assert a.client.capability_cache is not b.client.capability_cache
+        assert b.client.metrics.connections_reused >= 1  # keep-alive connection of tenant a
+    finally:
+        await pool.close()
+    assert a.client.session is None
+
+
+@pytest.mark.asyncio
+async def test_lru_eviction_spares_busy_tenants(backend_url):
+    pool = TenantPool(Config(dolibarr_url=backend_url, api_key="k"), max_clients=1)
+    try:
+        async with pool.lease(TenantKey(backend_url, "a")) as a:
+            await a.client.get_products(limit=1)
+            async with pool.lease(TenantKey(backend_url, "b")) as b:
+                await b.client.get_products(limit=1)
+                assert len(pool) == 2  # a is still in use
+            assert a.client.session is not None
+        async with pool.lease(TenantKey(backend_url, "c")):
+            pass
+        assert len(pool) == 1
+        assert pool.evicted == 2
+        assert a.client.session is None and b.client.session is None
+    finally:
+        await pool.close()
+
+
+@pytest.mark.asyncio
+async def test_idle_tenants_are_closed(backend_url):
+    pool = TenantPool(Config(dolibarr_url=backend_url, api_key="k"), idle_seconds=0)
+    try:
+        async with pool.lease(TenantKey(backend_url, "a")) as a:
+            await a.client.get_products(limit=1)
+        async with pool.lease(TenantKey(backend_url, "b")):
+            pass
+        assert a.client.session is None
+        assert pool.snapshot()["tenants"] == 1
+    finally:
+        await pool.close()
+
+
+@pytest.mark.asyncio
+async def test_middleware_routes_calls_by_header(backend_url):
+    mcp = FastMCP("tenant-test")
+    mcp.add_middleware(TenantMiddleware())
+
+    @mcp.tool()
+    async def whoami() -> str:
+        return state.get_client().api_key
+
+    default = DolibarrClient(Config(dolibarr_url=backend_url, api_key="server-key"))
+    pool = TenantPool(Config(dolibarr_url=backend_url, api_key="server-key"))
+    state.set_client(default)
+    set_tenant_pool(pool)
+    try:
+        async with Client(mcp) as client:
+            with patch.object(middleware_module, "get_http_headers", return_value={}):
+                assert (await client.call_tool("whoami", {})).data == "server-key"
+            with patch.object(middleware_module, "get_http_headers", return_value=_headers("tenant-key")):
+                assert (await client.call_tool("whoami", {})).data == "tenant-key"
+    finally:
+        set_tenant_pool(None)
+        state.set_client(None)
+        await pool.close()
@@ -0,0 +1,43 @@
+"""Tests for selectable toolsets (DOLIBARR_TOOLSETS)."""
+
+import os
+import subprocess
+import sys
+
+import pytest
+from fastmcp import FastMCP
+
+from dolibarr_mcp.tools import TOOLSETS, register_toolsets, resolve_toolsets
+
+
+def test_resolve_toolsets():
+    assert resolve_toolsets("all") == list(TOOLSETS)
+    assert resolve_toolsets("") == list(TOOLSETS)
+    assert resolve_toolsets(" Products, invoices ") == ["invoices", "products", "system"]
+    with pytest.raises(ValueError, match="Unknown toolset\\(s\\) invoice"):
+        resolve_toolsets("invoice")
+
+
+@pytest.mark.asyncio
+async def test_register_only_enabled_toolsets():
+    mcp = FastMCP("t")
+    register_toolsets(mcp, resolve_toolsets("products"))
+
+    names = {tool.name for tool in await mcp._list_tools()}
+    assert {"resolve_product_ref", "get_status", "get_server_metrics"} <= names
+    assert not names & {"create_invoice", "get_users", "start_profiling"}
+
+
+def test_server_imports_only_enabled_modules():
+    src = os.path.join(os.path.dirname(__file__), "..", "src")
+    env = {
+        **os.environ,
+        "PYTHONPATH": os.pathsep.join(filter(None, [src, os.environ.get("PYTHONPATH")])),
+        "DOLIBARR_TOOLSETS": "invoices",
+    }
+    code = (
+        "import sys, dolibarr_mcp.server as s; "
+        "print(s.TOOLSETS, sorted(m.rsplit('.', 1)[1] for m in sys.modules if m.startswith('dolibarr_mcp.tools.')))"
+    )
+    result = subprocess.run([sys.executable, "-W", "ignore", "-c", code], env=env, capture_output=True, text=True, check=True)
+    assert result.stdout.strip() == "['invoices', 'system'] ['invoices', 'system']"
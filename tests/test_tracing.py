@@ -0,0 +1,115 @@
+"""Tests for tool-call and request tracing."""
+
+import json
+
+import pytest
+from fastmcp import Client, FastMCP
+from unittest.mock import MagicMock
+
+from dolibarr_mcp.dolibarr_client import DolibarrClient
+from dolibarr_mcp.middleware import ToolTracingMiddleware
+from dolibarr_mcp.tracing import InMemoryExporter, JsonFileExporter, SpanExporter, Tracer, set_tracer
+
+
+class _Response:
+    def __init__(self, status, text):
+        self.status = status
+        self._text = text
+        self.reason = "OK"
+
+    async def text(self):
+        return self._text
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+
+@pytest.fixture
+def exporter():
+    exporter = InMemoryExporter()
+    set_tracer(Tracer([exporter]))
+    yield exporter
+    set_tracer(None)
+
+
+def test_nested_spans_share_trace(exporter):
+    tracer = Tracer([exporter])
+    with tracer.span("root", kind="server"):
+        with tracer.span("child", kind="client"):
+            pass
+        assert exporter.spans == []  # exported only when the root ends
+
+    child, root = exporter.spans
+    assert child.trace_id == root.trace_id
+    assert child.parent_id == root.span_id
+    assert root.attributes["dolibarr.request_count"] == 1
+
+
+def test_span_records_errors(exporter):
+    tracer = Tracer([exporter])
+    with pytest.raises(ValueError):
+        with tracer.span("boom"):
+            raise ValueError("bad input")
+    assert exporter.spans[0].error == "bad input"
+
+
+def test_disabled_tracer_is_noop():
+    tracer = Tracer()
+    with tracer.span("ignored") as span:
+        assert span is None
+
+
+def test_json_file_exporter_writes_otlp(tmp_path):
+    path = tmp_path / "traces" / "spans.jsonl"
+    exporter = JsonFileExporter(str(path))
+    tracer = Tracer([exporter])
+    with tracer.span("tool/get_invoices", kind="server", **{"mcp.tool.name": "get_invoices"}):
+        pass
+    exporter.flush()
+    with tracer.span("tool/get_orders", kind="server"):
+        pass
+    tracer.shutdown()
+
+    lines = path.read_text().splitlines()
+    assert len(lines) == 2
+    document = json.loads(lines[0])
+    span = document["resourceSpans"][0]["scopeSpans"][0]["spans"][0]
+    assert span["name"] == "tool/get_invoices"
+    assert span["kind"] == 2
+    assert {"key": "mcp.tool.name", "value": {"stringValue": "get_invoices"}} in span["attributes"]
+
+
+@pytest.mark.asyncio
+async def test_tool_call_links_client_requests(exporter):
+    client = DolibarrClient(MagicMock(dolibarr_url="https://erp.example/api/index.php", api_key="k"))
+    client.session = MagicMock()
+    client.session.request = MagicMock(side_effect=lambda *a, **kw: _Response(200, '{"id": 1}'))
+
+    mcp = FastMCP("tracing-test")
+    mcp.add_middleware(ToolTracingMiddleware())
+
+    @mcp.tool()
+    async def fan_out(count: int) -> int:
+        for i in range(count):
+            await client.request("GET", f"products/{i}")
+        return count
+
+    async with Client(mcp) as mcp_client:
+        await mcp_client.call_tool("fan_out", {"count": 3})
+
+    root = next(s for s in exporter.spans if s.parent_id is None)
+    assert root.name == "tool/fan_out"
+    assert root.attributes["dolibarr.request_count"] == 3
+    requests = [s for s in exporter.spans if s.kind == "client"]
+    assert {s.name for s in requests} == {"GET products/{id}"}
+    assert all(s.parent_id == root.span_id for s in requests)
+    decodes = [s for s in exporter.spans if s.name == "json.decode"]
+    assert {s.parent_id for s in decodes} == {s.span_id for s in requests}
+
+
+def test_span_exporter_is_abstract():
+    with pytest.raises(TypeError):
+        SpanExporter()
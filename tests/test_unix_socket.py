@@ -0,0 +1,50 @@
+"""Tests for reaching a co-located Dolibarr over a unix domain socket."""
+
+import socket
+
+import aiohttp
+import pytest
+
+from dolibarr_mcp.config import Config
+from dolibarr_mcp.dolibarr_client import DolibarrClient
+from dolibarr_mcp.fake_server import FakeDolibarr, SeedVolumes, serve_fake_dolibarr
+
+pytestmark = pytest.mark.skipif(not hasattr(socket, "AF_UNIX"), reason="unix sockets not available")
+
+SMALL = SeedVolumes(thirdparties=3, products=3, invoices=1, lines_per_invoice=1,
+                    orders=1, proposals=1, projects=1, contacts=1, users=1)
+
+
+def test_config_reads_socket_path(monkeypatch):
+    monkeypatch.setenv("DOLIBARR_UNIX_SOCKET", "/run/dolibarr/api.sock")
+    assert Config(dolibarr_url="http://erp.example", api_key="k").unix_socket == "/run/dolibarr/api.sock"
+
+
+def test_config_rejects_socket_with_balancing():
+    with pytest.raises(ValueError, match="cannot be combined with DOLIBARR_URLS"):
+        Config(dolibarr_url="http://erp.example", api_key="k", unix_socket="/run/dolibarr/api.sock",
+               dolibarr_urls="http://erp2.example")
+    with pytest.raises(ValueError, match="cannot be combined"):
+        Config(dolibarr_url="http://erp.example", api_key="k", unix_socket="/run/dolibarr/api.sock",
+               dolibarr_replica_urls="http://ro.example")
+
+
+def test_config_warns_about_tls_over_socket(capsys):
+    Config(dolibarr_url="https://erp.example", api_key="k", unix_socket="/run/dolibarr/api.sock")
+    assert "TLS over the socket" in capsys.readouterr().err
+
+
+@pytest.mark.asyncio
+async def test_client_keeps_logical_url_over_socket(tmp_path):
+    path = str(tmp_path / "dolibarr.sock")
+    async with serve_fake_dolibarr(FakeDolibarr(SMALL, seed=3), unix_socket=path):
+        # The host does not resolve: every request must go through the socket.
+        config = Config(dolibarr_url="http://dolibarr.invalid", api_key="k")
+        async with DolibarrClient(config, unix_socket=path) as client:
+            assert isinstance(client.session.connector, aiohttp.UnixConnector)
+            assert client.base_url == "http://dolibarr.invalid/api/index.php"
+            status = await client.get_status()
+            products = await client.get_products(limit=2)
+
+    assert status["success"]["dolibarr_version"]
+    assert len(products) == 2
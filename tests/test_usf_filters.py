@@ -2,6 +2,7 @@
 
 import pytest
 from dolibarr_mcp.tools.projects import _build_usf_like_filter, _build_usf_eq_filter, _sanitize_search
+from dolibarr_mcp.filters import DocumentFilter, compile_document_filter, proposal_status_code
 
 
 class TestUSFFilterBuilders:
@@ -147,3 +148,68 @@ class TestUSFErrorCases:
         assert correct == "(t.fk_soc:=:135)"
         assert "fk_soc" in correct
         assert "socid" not in correct
+
+
+class TestDocumentFilterCompilation:
+    """Typed document filters compile into a single USF expression."""
+
+    def test_empty_filter(self) -> None:
+        query = compile_document_filter("invoices", DocumentFilter())
+        assert query.sqlfilters is None
+        assert query.sortfield is None
+
+    def test_invoice_month_customer_amount(self) -> None:
+        """This month's invoices for customer 42 above 1000."""
+        query = compile_document_filter("invoices", DocumentFilter(
+            date_from="2025-03-01",
+            date_to="2025-03-31",
+            customer_id=42,
+            min_total_ttc=1000,
+        ))
+        assert query.sqlfilters == (
+            "(t.datef:>=:'2025-03-01') and (t.datef:<:'2025-04-01') "
+            "and (t.fk_soc:=:42) and (t.total_ttc:>=:1000.0)"
+        )
+
+    def test_document_specific_date_columns(self) -> None:
+        spec = DocumentFilter(date_from="2025-01-01")
+        assert "t.date_commande" in compile_document_filter("orders", spec).sqlfilters
+        assert "t.datep" in compile_document_filter("proposals", spec).sqlfilters
+
+    def test_ref_prefix_project_status(self) -> None:
+        query = compile_document_filter("orders", DocumentFilter(
+            ref_prefix="CO2501'; DROP",
+            project_id=7,
+            status=1,
+        ))
+        assert query.sqlfilters == (
+            "(t.ref:like:'CO2501 DROP%') and (t.fk_projet:=:7) and (t.fk_statut:=:1)"
+        )
+
+    def test_sort_pushdown(self) -> None:
+        query = compile_document_filter("invoices", DocumentFilter(sort_by="amount", sort_order="desc"))
+        assert (query.sortfield, query.sortorder) == ("t.total_ttc,t.rowid", "DESC,DESC")
+
+    def test_sort_by_ref_has_no_tiebreaker(self) -> None:
+        query = compile_document_filter("orders", DocumentFilter(sort_by="ref", sort_order="asc"))
+        assert (query.sortfield, query.sortorder) == ("t.ref", "ASC")
+
+    def test_rejects_malformed_date(self) -> None:
+        with pytest.raises(ValueError, match="YYYY-MM-DD"):
+            compile_document_filter("invoices", DocumentFilter(date_from="2025-01-01' or 1=1"))
+
+    def test_rejects_inverted_ranges(self) -> None:
+        with pytest.raises(ValueError, match="date_from"):
+            compile_document_filter("invoices", DocumentFilter(date_from="2025-02-01", date_to="2025-01-01"))
+        with pytest.raises(ValueError, match="min_total_ttc"):
+            compile_document_filter("invoices", DocumentFilter(min_total_ttc=10, max_total_ttc=5))
+
+    def test_unknown_document(self) -> None:
+        with pytest.raises(ValueError, match="not available"):
+            compile_document_filter("products", DocumentFilter())
+
+    def test_proposal_status_names(self) -> None:
+        assert proposal_status_code("signed") == 2
+        assert proposal_status_code("3") == 3
+        with pytest.raises(ValueError):
+            proposal_status_code("maybe")
@@ -0,0 +1,195 @@
+"""Tests for the background warm-up and readiness reporting."""
+
+import asyncio
+import json
+import time
+from unittest.mock import patch
+
+import httpx
+import pytest
+import pytest_asyncio
+
+from dolibarr_mcp import server as server_module
+from dolibarr_mcp import warmup as warmup_module
+from dolibarr_mcp.config import Config
+from dolibarr_mcp.dolibarr_client import DolibarrAPIError, DolibarrClient
+from dolibarr_mcp.fake_server import FakeDolibarr, SeedVolumes, serve_fake_dolibarr
+from dolibarr_mcp.warmup import WarmUp, get_warmup, register_warmup_hook
+
+SMALL = SeedVolumes(thirdparties=5, products=5, invoices=2, lines_per_invoice=1,
+                    orders=1, proposals=1, projects=1, contacts=1, users=1)
+
+
+@pytest_asyncio.fixture
+async def client():
+    async with serve_fake_dolibarr(FakeDolibarr(SMALL, seed=1)) as url:
+        client = DolibarrClient(Config(dolibarr_url=url, api_key="k"))
+        await client.start_session()
+        try:
+            yield client
+        finally:
+            await client.close_session()
+
+
+@pytest.mark.asyncio
+async def test_warmup_probes_opens_connections_and_runs_hooks(client, monkeypatch):
+    loaded = []
+
+    async def load_reference(c):
+        loaded.append(c)
+
+    async def broken(c):
+        raise RuntimeError("boom")
+
+    monkeypatch.setattr(warmup_module, "_hooks", [])
+    register_warmup_hook("reference", load_reference)
+    register_warmup_hook("broken", broken)
+
+    warmup = WarmUp(client, connections=3)
+    assert not warmup.readiness.ready
+    readiness = await warmup.run()
+
+    assert readiness.ready
+    assert readiness.dolibarr_version
+    assert readiness.connections >= 2
+    assert loaded == [client]
+    assert readiness.hooks == {"reference": "ok", "broken": "failed: boom"}
+    assert readiness.snapshot()["warmup_seconds"] is not None
+
+
+@pytest.mark.asyncio
+async def test_probe_retries_until_backend_answers():
+    class FlakyClient:
+        calls = 0
+
+        async def get_status(self):
+            self.calls += 1
+            if self.calls < 3:
+                raise DolibarrAPIError("Cannot connect to Dolibarr API")
+            return {"success": {"dolibarr_version": "20.0.0"}}
+
+    warmup = WarmUp(FlakyClient(), connections=0, retry_initial=0.001)
+    readiness = await warmup.run()
+    assert readiness.attempts == 3
+    assert readiness.dolibarr_version == "20.0.0"
+    assert readiness.last_error is None
+
+
+@pytest.mark.asyncio
+async def test_lifespan_does_not_wait_for_dolibarr(monkeypatch):
+    monkeypatch.setenv("DOLIBARR_URL", "http://dolibarr.invalid/api/index.php")
+    monkeypatch.setenv("DOLIBARR_API_KEY", "k")
+    monkeypatch.setenv("DOLIBARR_WATCHDOG_INTERVAL_SECONDS", "0")
+
+    async def hang(self):
+        await asyncio.sleep(30)
+
+    with patch.object(DolibarrClient, "get_status", hang):
+        started = time.perf_counter()
+        async with server_module.dolibarr_services(server_module.mcp):
+            assert time.perf_counter() - started < 1
+            warmup = get_warmup()
+            assert warmup.readiness.state == "starting"
+            response = await server_module.ready_endpoint(None)
+            assert response.status_code == 503
+            assert json.loads(response.body)["ready"] is False
+        assert get_warmup() is None
+        assert warmup._task is None
+
+
+@pytest.mark.asyncio
+async def test_http_app_serves_ready_without_a_session(client, monkeypatch):
+    url = client.base_url
+    monkeypatch.setenv("DOLIBARR_URL", url)
+    monkeypatch.setenv("DOLIBARR_API_KEY", "k")
+    monkeypatch.setenv("DOLIBARR_WATCHDOG_INTERVAL_SECONDS", "0")
+    monkeypatch.setenv("DOLIBARR_WARMUP_CONNECTIONS", "0")
+
+    app = server_module.mcp.http_app()
+    transport = httpx.ASGITransport(app=app)
+    async with app.router.lifespan_context(app):
+        await asyncio.wait_for(get_warmup()._task, timeout=5)
+        async with httpx.AsyncClient(transport=transport, base_url="http://mcp") as http:
+            ready = await http.get("/ready")
+            metrics = await http.get("/metrics")
+    assert get_warmup() is None
+
+    assert ready.status_code == 200
+    assert ready.json()["state"] == "ready"
+    assert "dolibarr_client_requests_total" in metrics.text
+
+
+@pytest.mark.asyncio
+async def test_ready_endpoint_reports_ready(client):
+    warmup = WarmUp(client, connections=0)
+    await warmup.run()
+    warmup_module.set_warmup(warmup)
+    try:
+        response = await server_module.ready_endpoint(None)
+    finally:
+        warmup_module.set_warmup(None)
+    assert response.status_code == 200
+    assert json.loads(response.body)["state"] == "ready"
+
+
+def _system_tools():
+    from unittest.mock import MagicMock
+
+    from dolibarr_mcp.tools.system import register_system_tools
+
+    tools = {}
+    mcp = MagicMock()
+    mcp.tool = lambda: (lambda f: tools.setdefault(f.__name__, f))
+    register_system_tools(mcp)
+    return tools
+
+
+@pytest.mark.asyncio
+async def test_get_status_reports_readiness_while_unreachable(client):
+    from dolibarr_mcp import state
+
+    warmup = WarmUp(client, connections=0)
+    warmup.readiness.state = "unavailable"
+    warmup.readiness.last_error = "Cannot connect to Dolibarr API"
+    tools = _system_tools()
+    state.set_client(client)
+    warmup_module.set_warmup(warmup)
+    try:
+        async def hang(self):
+            await asyncio.sleep(30)
+
+        with patch.object(DolibarrClient, "get_status", hang):
+            early = await asyncio.wait_for(tools["get_status"](), timeout=1)
+
+        warmup.readiness.dolibarr_version = "20.0.0"
+
+        async def fail(self):
+            raise DolibarrAPIError("Cannot connect to Dolibarr API: reset")
+
+        with patch.object(DolibarrClient, "get_status", fail):
+            failed = await tools["get_status"]()
+        live = await tools["get_status"]()
+    finally:
+        warmup_module.set_warmup(None)
+        state.set_client(None)
+
+    assert list(early) == ["readiness"]
+    assert early["readiness"]["state"] == "unavailable"
+    assert early["readiness"]["last_error"] == "Cannot connect to Dolibarr API"
+    assert failed["readiness"]["last_error"] == "Cannot connect to Dolibarr API: reset"
+    assert live["success"] and live["readiness"]["dolibarr_version"] == "20.0.0"
+
+
+@pytest.mark.asyncio
+async def test_connections_use_the_endpoint_that_answered(client):
+    client.capability_cache.status_endpoint = "users?limit=1"
+    requested = []
+    original = client.request
+
+    async def record(method, endpoint, **kwargs):
+        requested.append(endpoint)
+        return await original(method, endpoint, **kwargs)
+
+    with patch.object(client, "request", record):
+        await WarmUp(client, connections=2)._open_connections()
+    assert requested == ["users?limit=1", "users?limit=1"]
@@ -0,0 +1,87 @@
+"""Tests for the event-loop lag and memory watchdog."""
+
+import asyncio
+import logging
+import time
+import tracemalloc
+
+import pytest
+from unittest.mock import patch
+
+from dolibarr_mcp.watchdog import Watchdog, current_rss_bytes
+
+
+def test_rss_is_reported():
+    assert current_rss_bytes() > 0
+
+
+@pytest.mark.asyncio
+async def test_detects_blocked_loop(caplog):
+    watchdog = Watchdog(interval=0.01, lag_threshold=0.05)
+    with caplog.at_level(logging.WARNING, logger="dolibarr_mcp.watchdog"):
+        watchdog.start()
+        await asyncio.sleep(0.02)
+        time.sleep(0.12)  # block the loop
+        await asyncio.sleep(0.05)
+        await watchdog.stop()
+
+    assert watchdog.alerts["loop_lag"] >= 1
+    assert watchdog.lag.max >= 0.05
+    assert "Event loop blocked" in caplog.text
+    assert not watchdog.running
+
+
+def test_alerts_are_rate_limited(caplog):
+    watchdog = Watchdog(lag_threshold=0.1, alert_cooldown=60)
+    with caplog.at_level(logging.WARNING, logger="dolibarr_mcp.watchdog"):
+        for _ in range(3):
+            watchdog.record_lag(0.5)
+    assert watchdog.alerts["loop_lag"] == 3
+    assert caplog.text.count("Event loop blocked") == 1
+
+
+def test_rss_threshold_alert():
+    watchdog = Watchdog(rss_threshold_bytes=1)
+    watchdog.record_rss(10 * 1048576)
+    assert watchdog.alerts["rss"] == 1
+    snapshot = watchdog.snapshot()
+    assert snapshot["rss_mb"] == 10.0
+    assert 'dolibarr_mcp_watchdog_alerts_total{kind="rss"} 1' in watchdog.to_prometheus()
+
+
+def test_rss_alert_snapshots_only_outside_cooldown():
+    watchdog = Watchdog(rss_threshold_bytes=1, alert_cooldown=60)
+    with patch("dolibarr_mcp.watchdog.tracemalloc") as fake_tracemalloc:
+        fake_tracemalloc.is_tracing.return_value = True
+        fake_tracemalloc.take_snapshot.return_value.statistics.return_value = []
+        for _ in range(5):
+            watchdog.record_rss(10 * 1048576)
+    assert watchdog.alerts["rss"] == 5
+    assert fake_tracemalloc.take_snapshot.call_count == 1
+
+
+def test_prometheus_lag_histogram():
+    watchdog = Watchdog()
+    watchdog.record_lag(0.002)
+    text = watchdog.to_prometheus()
+    assert 'dolibarr_mcp_event_loop_lag_seconds_bucket{le="+Inf"} 1' in text
+    assert "dolibarr_mcp_event_loop_lag_seconds_count 1" in text
+
+
+def test_memory_diff_reports_growth():
+    was_tracing = tracemalloc.is_tracing()
+    watchdog = Watchdog()
+    try:
+        first = watchdog.memory_diff()
+        if not was_tracing:
+            assert first["baseline_taken"] is True
+        else:
+            watchdog.memory_diff()
+        hoard = [bytearray(1024) for _ in range(2000)]
+        result = watchdog.memory_diff(limit=5)
+        assert result["diff"]
+        assert any(__file__ in entry["location"] for entry in result["diff"])
+        del hoard
+    finally:
+        if not was_tracing:
+            tracemalloc.stop()